@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+'''
+Move generation for many boards at once.
+
+Each function takes a NumPy array of board states (as in Board.state, so at
+most ten rows fit in a uint64) and works on all of them with array
+operations over the board's jump table. Jumps are identified by their
+position in board.jump_table(number_of_rows); moves() turns those positions
+back into the tuples that Board.move takes.
+
+NumPy is only needed for this module.
+'''
+
+import board
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAX_ROWS = 10
+CHUNK_SIZE = 1 << 16
+
+_TABLES = {}
+
+
+def _tables(number_of_rows):
+    if numpy is None:
+        raise ImportError('batch needs NumPy')
+    if number_of_rows > MAX_ROWS:
+        raise ValueError('At most %d rows fit in a uint64' % MAX_ROWS)
+    try:
+        return _TABLES[number_of_rows]
+    except KeyError:
+        pass
+    jumps = board.jump_table(number_of_rows)
+    pegs = numpy.array([jump[0] for jump in jumps], dtype=numpy.uint64)
+    masks = numpy.array([jump[1] for jump in jumps], dtype=numpy.uint64)
+    _TABLES[number_of_rows] = pegs, masks
+    return pegs, masks
+
+
+def _chunks(states):
+    states = numpy.asarray(states, dtype=numpy.uint64)
+    for start in xrange(0, len(states), CHUNK_SIZE):
+        yield start, states[start:start + CHUNK_SIZE]
+
+
+def moves(number_of_rows):
+    '''
+    Returns the move tuple for each jump position, as a list.
+    '''
+    return [move for _, _, move in board.jump_table(number_of_rows)]
+
+
+def _legal(chunk, number_of_rows):
+    pegs, masks = _tables(number_of_rows)
+    return (chunk[:, None] & masks) == pegs
+
+
+def legal_moves(states, number_of_rows):
+    '''
+    Returns a boolean array with a row for each state and a column for each
+    jump, true where that jump can be made. The states are worked on
+    CHUNK_SIZE at a time, so only the result grows with their number.
+    '''
+    pegs, _ = _tables(number_of_rows)
+    states = numpy.asarray(states, dtype=numpy.uint64)
+    legal = numpy.empty((len(states), len(pegs)), dtype=bool)
+    for start, chunk in _chunks(states):
+        legal[start:start + len(chunk)] = _legal(chunk, number_of_rows)
+    return legal
+
+
+def move_counts(states, number_of_rows):
+    '''
+    Returns the number of moves that can be made from each state.
+    '''
+    states = numpy.asarray(states, dtype=numpy.uint64)
+    counts = numpy.empty(len(states), dtype=numpy.int64)
+    for start, chunk in _chunks(states):
+        counts[start:start + len(chunk)] = _legal(
+            chunk, number_of_rows).sum(axis=1)
+    return counts
+
+
+def game_over(states, number_of_rows):
+    '''
+    Returns true for each state from which no move can be made.
+    '''
+    return move_counts(states, number_of_rows) == 0
+
+
+def successors(states, number_of_rows):
+    '''
+    Makes every legal move from every state. Returns three arrays of equal
+    length: the position in 'states' of the state moved from, the position
+    in the jump table of the jump made, and the resulting state.
+    '''
+    _, masks = _tables(number_of_rows)
+    sources, jumps = [], []
+    for start, chunk in _chunks(states):
+        source, jump = numpy.nonzero(_legal(chunk, number_of_rows))
+        sources.append(source + start)
+        jumps.append(jump)
+    states = numpy.asarray(states, dtype=numpy.uint64)
+    if sources:
+        source = numpy.concatenate(sources)
+        jump = numpy.concatenate(jumps)
+    else:
+        source = jump = numpy.empty(0, dtype=numpy.int64)
+    return source, jump, states[source] ^ masks[jump]
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+'''
+Heuristic solvers for boards too large to search exhaustively.
+
+Neither solver is guaranteed to find a win. Each returns the position with
+the fewest pegs it came across, together with the move_list that reaches it
+(which can be replayed through Board.move) and some statistics.
+
+A heuristic is any function of (state, number_of_rows) that returns a score,
+lower being better. peg_count, isolated_pegs and positional are provided,
+and combine() adds weighted heuristics together.
+'''
+
+import heapq
+import sys
+from timeit import default_timer
+
+import board
+import symmetry
+
+_NEIGHBOURS = {}
+_WEIGHT_TABLES = {}
+
+
+def peg_count(state, _):
+    '''
+    Scores a state by the number of pegs left on it.
+    '''
+    return bin(state).count('1')
+
+
+def _neighbours(number_of_rows):
+    try:
+        return _NEIGHBOURS[number_of_rows]
+    except KeyError:
+        pass
+    masks = []
+    for row in xrange(number_of_rows):
+        for column in xrange(row + 1):
+            mask = 0
+            for r, c in board.JUMPS:
+                other_row, other_column = row + r // 2, column + c // 2
+                if (0 <= other_row < number_of_rows and
+                        0 <= other_column <= other_row):
+                    mask |= board.hole_bit(other_row, other_column)
+            masks.append(mask)
+    _NEIGHBOURS[number_of_rows] = masks
+    return masks
+
+
+def isolated_pegs(state, number_of_rows):
+    '''
+    Scores a state by the number of pegs with no peg in a neighbouring
+    hole. Such pegs cannot move or be jumped until another peg comes to
+    them.
+    '''
+    count = 0
+    index = 0
+    remaining = state
+    neighbours = _neighbours(number_of_rows)
+    while remaining:
+        if remaining & 1 and not state & neighbours[index]:
+            count += 1
+        remaining >>= 1
+        index += 1
+    return count
+
+
+def default_weights(number_of_rows):
+    '''
+    Returns a weight for each hole: the fewer jumps that can start or end
+    in a hole, the harder it is to clear a peg from it, so the higher its
+    weight. Corners weigh the most.
+    '''
+    lines = [0] * (number_of_rows * (number_of_rows + 1) // 2)
+    for _, _, move in board.jump_table(number_of_rows):
+        lines[board.hole_index(*move[:2])] += 1
+        lines[board.hole_index(*move[2:])] += 1
+    return [1.0 / count if count else 1.0 for count in lines]
+
+
+def positional(weights=None):
+    '''
+    Returns a heuristic that scores a state by the sum of the weights of
+    its pegs. 'weights' is a list with a weight for each hole, by hole
+    number, and defaults to default_weights().
+    '''
+    def score(state, number_of_rows):
+        ''' Adds up the weights of the pegs, a byte at a time '''
+        total = 0
+        for table in _weight_tables(number_of_rows, weights):
+            total += table[state & 0xff]
+            state >>= 8
+        return total
+    return score
+
+
+def _weight_tables(number_of_rows, weights):
+    key = number_of_rows, weights and tuple(weights)
+    try:
+        return _WEIGHT_TABLES[key]
+    except KeyError:
+        pass
+    if weights is None:
+        weights = default_weights(number_of_rows)
+    tables = []
+    for offset in xrange(0, len(weights), 8):
+        chunk = weights[offset:offset + 8]
+        tables.append([sum(weight for bit, weight in enumerate(chunk)
+                           if byte >> bit & 1) for byte in xrange(256)])
+    _WEIGHT_TABLES[key] = tables
+    return tables
+
+
+def combine(*weighted):
+    '''
+    Returns a heuristic that adds up (weight, heuristic) pairs.
+    '''
+    def score(state, number_of_rows):
+        ''' The weighted sum of the heuristics '''
+        return sum(weight * heuristic(state, number_of_rows)
+                   for weight, heuristic in weighted)
+    return score
+
+
+DEFAULT_HEURISTIC = combine((1.0, isolated_pegs), (1.0, positional()))
+
+
+class SearchResult(object):
+    '''
+    What a heuristic search found: the best 'state' reached, the number of
+    'pegs' left on it, the 'move_list' that reaches it from the board the
+    search began with, and the numbers of 'nodes' expanded and states
+    'stored', and the 'seconds' taken.
+    '''
+
+    def __init__(self, state, pegs, move_list, nodes, stored, seconds):
+        self.state = state
+        self.pegs = pegs
+        self.move_list = move_list
+        self.nodes = nodes
+        self.stored = stored
+        self.seconds = seconds
+
+    def __str__(self):
+        return '%d pegs left after %d nodes, %d states, %.3f s' % (
+            self.pegs, self.nodes, self.stored, self.seconds)
+
+
+def _path(parents, node):
+    moves = []
+    while parents[node] is not None:
+        node, move = parents[node]
+        moves.append(move)
+    moves.reverse()
+    return moves
+
+
+def beam_search(game_board, width=1000, heuristic=DEFAULT_HEURISTIC,
+                max_states=1000000):
+    '''
+    Searches forward from the position on 'game_board' one move at a time,
+    keeping only the 'width' best positions (by 'heuristic') after each
+    move. Positions that are rotations or reflections of one already kept
+    are dropped. Only the positions kept are remembered; the search stops
+    early if there are more than 'max_states' of them. Raises ValueError if
+    the board is not triangular.
+    '''
+    started = default_timer()
+    number_of_rows = board.triangle_rows(game_board)
+    jumps = game_board.jumps
+    parents = {game_board.state: None}
+    layer = [game_board.state]
+    best = game_board.state
+    nodes = 0
+    while layer and len(parents) < max_states:
+        seen = set()
+        candidates = []
+        for state in layer:
+            nodes += 1
+            for pegs, mask, move in jumps:
+                if state & mask == pegs:
+                    child = state ^ mask
+                    key = symmetry.canonical(child, number_of_rows)
+                    if key not in seen:
+                        seen.add(key)
+                        candidates.append((heuristic(child, number_of_rows),
+                                           child, state, move))
+        candidates.sort()
+        layer = []
+        for _, child, state, move in candidates[:width]:
+            parents[child] = state, move
+            layer.append(child)
+        if layer:
+            best = layer[0]
+    return SearchResult(best, peg_count(best, number_of_rows),
+                        list(game_board.move_list) + _path(parents, best),
+                        nodes, len(parents), default_timer() - started)
+
+
+def best_first_search(game_board, heuristic=DEFAULT_HEURISTIC,
+                      max_states=1000000):
+    '''
+    Always expands the position with the fewest pegs (breaking ties by
+    'heuristic') of all those found so far, until one peg is left, nothing
+    is left to expand or 'max_states' positions have been found. Raises
+    ValueError if the board is not triangular.
+    '''
+    started = default_timer()
+    number_of_rows = board.triangle_rows(game_board)
+    jumps = game_board.jumps
+    parents = {game_board.state: None}
+    seen = set([symmetry.canonical(game_board.state, number_of_rows)])
+    queue = [(peg_count(game_board.state, number_of_rows), 0,
+              game_board.state)]
+    best = game_board.state
+    nodes = 0
+    while queue and len(parents) < max_states:
+        pegs_left, _, state = heapq.heappop(queue)
+        nodes += 1
+        if pegs_left < peg_count(best, number_of_rows):
+            best = state
+            if pegs_left == 1:
+                break
+        for pegs, mask, move in jumps:
+            if state & mask == pegs:
+                child = state ^ mask
+                key = symmetry.canonical(child, number_of_rows)
+                if key not in seen:
+                    seen.add(key)
+                    parents[child] = state, move
+                    heapq.heappush(queue, (pegs_left - 1,
+                                           heuristic(child, number_of_rows),
+                                           child))
+    return SearchResult(best, peg_count(best, number_of_rows),
+                        list(game_board.move_list) + _path(parents, best),
+                        nodes, len(parents), default_timer() - started)
+
+
+def main(number_of_rows=8, width=1000):
+    '''
+    Runs a beam search from the top hole of a board of 'number_of_rows'
+    rows and prints what it found.
+    '''
+    test = board.Board(int(number_of_rows))
+    test.reset()
+    test.remove_peg(0, 0)
+    result = beam_search(test, width=int(width))
+    print result.move_list
+    print result
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
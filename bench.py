@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+'''
+Benchmarks for the Board class.
+
+Run it to time move generation, move/undo round trips, game_over, __str__
+and whole auto_play_move searches for several board sizes:
+
+    % ./bench.py --save baseline.json
+    % ./bench.py --compare baseline.json
+
+Results are written as JSON: a 'results' object maps each benchmark name
+(e.g. "get_valid_moves/5" or "auto_play_move/5/2,1") to the best time per
+call in seconds, or null if the benchmark ran out of time.
+'''
+
+import argparse
+import json
+import platform
+import random
+import signal
+import sys
+from timeit import default_timer
+
+import board
+import stats
+
+FORMAT_VERSION = 1
+
+
+def sample_states(number_of_rows, seed=0):
+    '''
+    Returns the states passed through by a seeded random game from each
+    opening hole: a fixed sample of positions from every stage of a game.
+    '''
+    chooser = random.Random(seed)
+    test = board.Board(number_of_rows)
+    states = []
+    for row in xrange(number_of_rows):
+        for column in xrange(row + 1):
+            test.reset()
+            test.remove_peg(row, column)
+            moves = test.get_valid_moves()
+            while moves:
+                states.append(test.state)
+                test.move(*chooser.choice(moves))
+                moves = test.get_valid_moves()
+            states.append(test.state)
+    return states
+
+
+def best_time(function, repeat):
+    '''
+    Calls 'function' 'repeat' times and returns the fastest time taken.
+    '''
+    times = []
+    for _ in xrange(repeat):
+        start = default_timer()
+        function()
+        times.append(default_timer() - start)
+    return min(times)
+
+
+def _per_state(number_of_rows, action):
+    boards = []
+    for state in sample_states(number_of_rows):
+        test = board.Board(number_of_rows)
+        test.state = state
+        boards.append(test)
+
+    def run():
+        ''' Applies 'action' to each sample position '''
+        for test in boards:
+            action(test)
+    return run, len(boards)
+
+
+def _move_undo(test):
+    for move in test.get_valid_moves():
+        test.move(*move)
+        test.undo()
+
+
+ACTIONS = (
+    ('get_valid_moves', lambda test: test.get_valid_moves()),
+    ('move_undo', _move_undo),
+    ('game_over', lambda test: test.game_over()),
+    ('__str__', str),
+)
+
+
+def _on_alarm(*_):
+    raise stats.TimeoutException
+
+
+def time_solve(number_of_rows, row, column, timeout):
+    '''
+    Times auto_play_move after removing the peg at (row, column). Returns
+    None if the search takes longer than 'timeout' seconds.
+    '''
+    test = board.Board(number_of_rows)
+    test.reset()
+    test.remove_peg(row, column)
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        start = default_timer()
+        test.auto_play_move()
+        return default_timer() - start
+    except stats.TimeoutException:
+        return None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _best_solve(number_of_rows, row, column, repeat, timeout):
+    times = []
+    for _ in xrange(repeat):
+        seconds = time_solve(number_of_rows, row, column, timeout)
+        if seconds is None:
+            return None
+        times.append(seconds)
+    return min(times)
+
+
+def run(sizes=(4, 5, 6, 7), repeat=5, timeout=5.0, log=None):
+    '''
+    Runs every benchmark for each of 'sizes' and returns the results as a
+    dictionary ready to be saved as JSON.
+    '''
+    results = {}
+    for number_of_rows in sizes:
+        for name, action in ACTIONS:
+            function, calls = _per_state(number_of_rows, action)
+            key = '%s/%d' % (name, number_of_rows)
+            results[key] = best_time(function, repeat) / calls
+            if log:
+                log(key, results[key])
+        for row in xrange(number_of_rows):
+            for column in xrange(row + 1):
+                key = 'auto_play_move/%d/%d,%d' % (number_of_rows, row,
+                                                   column)
+                results[key] = _best_solve(number_of_rows, row, column,
+                                           repeat, timeout)
+                if log:
+                    log(key, results[key])
+    return {
+        'version': FORMAT_VERSION,
+        'python': platform.python_implementation() + ' ' +
+                  platform.python_version(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    '''
+    Compares two sets of results. Returns a sorted list of (name, baseline
+    seconds, current seconds, regressed) tuples for the benchmarks in both.
+    A benchmark has regressed if it became more than 'threshold' slower or
+    if it ran out of time when it did not before.
+    '''
+    old, new = baseline['results'], current['results']
+    report = []
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name], new[name]
+        if after is None:
+            regressed = before is not None
+        else:
+            regressed = before is not None and after > before * (1 + threshold)
+        report.append((name, before, after, regressed))
+    return report
+
+
+def _format(seconds):
+    if seconds is None:
+        return 'timeout'
+    return '%.3g us' % (seconds * 1e6)
+
+
+def main(argv=None):
+    '''
+    Runs the benchmarks, optionally saving the results or comparing them
+    with a saved baseline. Exits with status 1 if anything regressed.
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[4, 5, 6, 7],
+                        help='board sizes to benchmark')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per benchmark; the fastest counts')
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help='seconds allowed for each auto_play_move')
+    parser.add_argument('--save', help='write the results to this file')
+    parser.add_argument('--compare', help='compare with results in this file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown that counts as a regression')
+    args = parser.parse_args(argv)
+
+    def log(name, seconds):
+        ''' Reports progress as each benchmark finishes '''
+        print '%-32s %s' % (name, _format(seconds))
+        sys.stdout.flush()
+    current = run(args.rows, args.repeat, args.timeout,
+                  log=None if args.compare else log)
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump(current, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as source:
+            baseline = json.load(source)
+        regressions = 0
+        for name, before, after, regressed in compare(
+                baseline, current, args.threshold):
+            print '%-32s %12s %12s %s' % (name, _format(before),
+                                          _format(after),
+                                          regressed and 'REGRESSION' or '')
+            regressions += regressed
+        return regressions and 1 or 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+'''
+Solves boards by searching from both ends at once.
+
+Every winning game ends with one peg, and a jump made backwards (an
+"unjump": a peg jumps over an empty hole, leaving a peg in it) is as cheap
+to generate as one made forwards. solve() first works backward from every
+state with a single peg in an allowed hole, one layer of states per peg,
+until it has found as many states as it may keep. Those layers hold every
+state with that few pegs from which the game can be won, so the forward
+search (Board.iter_solutions) that follows settles a position at those peg
+counts with one lookup: the two searches meet as soon as the forward one
+reaches the deepest layer, and it never searches on to the end.
+
+    % ./bidirectional.py 7 --start 2 0 --target 1 0 --compare
+'''
+
+import argparse
+from timeit import default_timer
+
+import board
+import pruning
+import stats
+import transposition
+
+MAX_STATES = 200000
+
+
+def unjump_table(jumps):
+    '''
+    Returns, for each hole, the masks of the jumps that end in it, so that
+    the unjumps from a state with few pegs can be found from its pegs alone.
+    '''
+    table = {}
+    for pegs, mask, _ in jumps:
+        table.setdefault(mask ^ pegs, []).append(mask)
+    return dict((bit, tuple(masks)) for bit, masks in table.iteritems())
+
+
+def unjumps(layer, table):
+    '''
+    Returns the states one unjump back from those in 'layer', given the
+    unjump_table of the board.
+    '''
+    result = set()
+    add = result.add
+    for state in layer:
+        remaining = state
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            for mask in table.get(bit, ()):
+                if state & mask == bit:
+                    add(state ^ mask)
+    return result
+
+
+class Perimeter(object):
+    '''
+    The layers of states, by peg count, from which the game on 'game_board'
+    can be won, found by working backward from the single-peg finishes
+    until there are about 'max_states' of them. Pass one to
+    Board.iter_solutions (or auto_play_move) as 'prune': positions with no
+    more pegs than the deepest layer are then settled by looking them up,
+    and others are passed on to 'prune', if one is given. Raises
+    ValueError if 'prune' is for another layout.
+    '''
+
+    def __init__(self, game_board, target=None, max_states=MAX_STATES,
+                 prune=None):
+        started = default_timer()
+        layout = game_board.layout
+        if prune is not None and prune.layout.name != layout.name:
+            raise ValueError('The pruner is for the %s board, not %s' %
+                             (prune.layout.name, layout.name))
+        self.layout = layout
+        if target is None:
+            layer = set(1 << index for index in xrange(layout.size))
+        else:
+            layer = set([layout.bit(*target)])
+        self.prune = prune
+        self.layers = {1: layer}
+        self.states = len(layer)
+        peg_count = 1
+        limit = game_board.peg_count()
+        table = unjump_table(game_board.jumps)
+        while layer and peg_count < limit and self.states < max_states:
+            layer = unjumps(layer, table)
+            peg_count += 1
+            self.layers[peg_count] = layer
+            self.states += len(layer)
+        self.deepest = peg_count
+        self.seconds = default_timer() - started
+
+    def start(self, state, target=None):
+        '''
+        Called once when a search begins; passed on to 'prune'.
+        '''
+        if self.prune is not None:
+            self.prune.start(state, target)
+
+    def cannot_win(self, state):
+        '''
+        Returns True if the game cannot be won from 'state'.
+        '''
+        layer = self.layers.get(bin(state).count('1'))
+        if layer is not None:
+            return state not in layer
+        return self.prune is not None and self.prune.cannot_win(state)
+
+    def __str__(self):
+        return '%d states down to %d pegs in %.3f s' % (
+            self.states, self.deepest, self.seconds)
+
+
+def solve(game_board, target=None, stats=None, prune=None,
+          max_states=MAX_STATES):
+    '''
+    Searches for a move_list that wins the game from the position on
+    'game_board' and returns it, leaving the board in the winning position,
+    just as Board.auto_play_move does. Returns None if the game cannot be
+    won.
+
+    If a (row, column) 'target' is given, the last peg must be left in that
+    hole. The backward search keeps about 'max_states' states (see
+    Perimeter). 'stats' and 'prune' are passed on to the forward search.
+    '''
+    perimeter = Perimeter(game_board, target, max_states, prune)
+    return game_board.auto_play_move(
+        table=transposition.TranspositionTable(), stats=stats, target=target,
+        prune=perimeter)
+
+
+def compare(number_of_rows, start, target=None, timeout=None,
+            max_states=MAX_STATES):
+    '''
+    Searches for a win from the board with the peg at 'start' removed,
+    once with Board.auto_play_move and once with solve(), both with a
+    transposition table and pruning. Returns a list of (seconds, stats,
+    solution) triples; the solution is None if there is none or the search
+    ran out of time.
+    '''
+    def check_time(_):
+        ''' Abandons the search once it has had its time '''
+        if timeout and default_timer() - started > timeout:
+            raise stats.TimeoutException
+    results = []
+    for bidirectional in False, True:
+        test = board.Board(number_of_rows)
+        test.reset()
+        test.remove_peg(*start)
+        search = stats.SolverStats(progress=check_time, interval=1000)
+        started = default_timer()
+        try:
+            if bidirectional:
+                solution = solve(test, target, search,
+                                 pruning.Pruner(number_of_rows), max_states)
+            else:
+                solution = test.auto_play_move(
+                    table=transposition.TranspositionTable(), stats=search,
+                    target=target, prune=pruning.Pruner(number_of_rows))
+        except stats.TimeoutException:
+            solution = None
+        results.append((default_timer() - started, search, solution))
+    return results
+
+
+def main(argv=None):
+    '''
+    Solves an opening of a board from both ends and prints the moves and
+    how long it took, optionally also timing the forward search alone.
+    '''
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('rows', type=int, help='board size')
+    parser.add_argument('--start', type=int, nargs=2, default=(0, 0),
+                        metavar=('ROW', 'COLUMN'),
+                        help='hole the first peg is removed from')
+    parser.add_argument('--target', type=int, nargs=2,
+                        metavar=('ROW', 'COLUMN'),
+                        help='hole the last peg must be left in')
+    parser.add_argument('--max-states', type=int, default=MAX_STATES,
+                        help='most states to keep from the backward search')
+    parser.add_argument('--compare', action='store_true',
+                        help='also time the forward search alone')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='give up on a search after this many seconds')
+    args = parser.parse_args(argv)
+    target = args.target and tuple(args.target)
+    if args.compare:
+        for name, (seconds, search, solution) in zip(
+                ('forward', 'bidirectional'),
+                compare(args.rows, tuple(args.start), target, args.timeout,
+                        args.max_states)):
+            print '%s: %s, %d nodes, %.3f s' % (
+                name, solution and 'wins' or 'no win found', search.nodes,
+                seconds)
+        return
+    test = board.Board(args.rows)
+    test.reset()
+    test.remove_peg(*args.start)
+    started = default_timer()
+    perimeter = Perimeter(test, target, args.max_states,
+                          pruning.Pruner(args.rows))
+    print test.auto_play_move(table=transposition.TranspositionTable(),
+                              target=target, prune=perimeter)
+    print perimeter
+    print '%.3f s' % (default_timer() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,39 +3,215 @@
 Contains the Board class
 '''
 
+import argparse
+import cProfile
+import pstats
+import sys
+from timeit import default_timer
+
+import checkpoint
+import stats
+import topology
+import transposition
+
+JUMPS = topology.TRIANGLE_JUMPS
+ZOBRIST_SEED = topology.ZOBRIST_SEED
+
+
+class Pegs(object):
+    '''
+    A list-like view of the pegs on a Board. The pegs themselves live in
+    the board's bitmask; this view reads and writes through to it.
+    '''
+
+    def __init__(self, board):
+        self.board = board
+
+    def __contains__(self, position):
+        row, column = position
+        return self.board.has_peg(row, column)
+
+    def __len__(self):
+        return bin(self.board.state).count('1')
+
+    def __iter__(self):
+        state = self.board.state
+        holes = self.board.layout.holes
+        index = 0
+        while state:
+            if state & 1:
+                yield holes[index]
+            state >>= 1
+            index += 1
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, position):
+        '''
+        Places a peg in the hole at 'position'.
+        '''
+        row, column = position
+        if not self.board.is_within_bounds(row, column):
+            raise ValueError('%d, %d is not a hole' % (row, column))
+        self.board.state |= self.board.layout.bit(row, column)
+
+    def remove(self, position):
+        '''
+        Takes the peg out of the hole at 'position'.
+        '''
+        if position not in self:
+            raise ValueError('There is no peg at %d, %d' % position)
+        self.board.state &= ~self.board.layout.bit(*position)
+
 
 class Board(object):
     '''
     This is the back-end to peg-jump. It is a board containing pegs and a
     list of moves.
+
+    The holes, and the jumps between them, come from 'layout', a
+    topology.Topology; by default the triangle of 'number_of_rows' rows.
+    The pegs are held in 'state', an integer with one bit per hole, in the
+    layout's hole order (for the triangle, see hole_index). 'pegs' is a
+    list-like view of the same information.
+
+    The board also keeps the set of jumps that can be made. Setting 'state'
+    rebuilds it from scratch, but move and undo only recheck the jumps that
+    share a hole with the one made. If 'validate' is True, every move and
+    undo also checks the set against a full rescan (see check_moves).
+
+    'zobrist' is a 64-bit hash of the pegs, kept up to date with one
+    exclusive-or per move (see zobrist_tables). If 'symmetric_hash' is True
+    the board also keeps the hash of each of its images, so that
+    'symmetric_zobrist' is the same for every rotation and reflection.
     '''
 
-    def __init__(self, number_of_rows=5):
+    def __init__(self, number_of_rows=5, validate=False, symmetric_hash=False,
+                 layout=None):
         '''
-        Sets up the instance with an empty board of 'number_of_rows' rows
+        Sets up the instance with an empty board of 'number_of_rows' rows,
+        or of 'layout' if one is given
         '''
-        self.rows = number_of_rows
+        self.layout = layout or topology.triangle(number_of_rows)
+        self.rows = self.layout.rows
+        self.jumps = self.layout.jumps
+        self.jump_indices = self.layout.jump_indices
+        self.neighbours = self.layout.neighbours
+        self.hole_keys, self.jump_keys = self.layout.zobrist_tables()
+        self.validate = validate
+        self.symmetric_hash = symmetric_hash
         self.__clear_lists()
 
+    def _get_state(self):
+        return self._state
+
+    def _set_state(self, state):
+        self._state = state
+        self._valid = self._scan()
+        images = [zobrist_hash(state, keys) for keys in
+                  (self.hole_keys if self.symmetric_hash else
+                   self.hole_keys[:1])]
+        self._zobrist = images[0]
+        self._images = images if self.symmetric_hash else None
+
+    state = property(_get_state, _set_state,
+                     doc='The populated holes, as a bitmask.')
+
+    @property
+    def zobrist(self):
+        '''
+        The Zobrist hash of the pegs.
+        '''
+        return self._zobrist
+
+    @property
+    def symmetric_zobrist(self):
+        '''
+        The smallest Zobrist hash of the pegs' images, which is the same
+        for every rotation and reflection of the board. It is only kept up
+        to date move by move if the board has 'symmetric_hash' set;
+        otherwise it is worked out from scratch.
+        '''
+        if self._images is not None:
+            return min(self._images)
+        return min(zobrist_hash(self._state, keys) for keys in self.hole_keys)
+
+    def _get_pegs(self):
+        return Pegs(self)
+
+    def _set_pegs(self, positions):
+        state = 0
+        for row, column in positions:
+            if not self.is_within_bounds(row, column):
+                raise ValueError('%d, %d is not a hole' % (row, column))
+            state |= self.layout.bit(row, column)
+        self.state = state
+
+    pegs = property(_get_pegs, _set_pegs,
+                    doc='The populated holes, as (row, column) tuples.')
+
+    def _scan(self):
+        state = self._state
+        return set(index for index, (pegs, mask, _) in enumerate(self.jumps)
+                   if state & mask == pegs)
+
+    def _jump(self, index):
+        '''
+        Makes (or unmakes) the jump with this index in the jump table,
+        rechecking only the jumps that share a hole with it.
+        '''
+        jumps = self.jumps
+        valid = self._valid
+        state = self._state ^ jumps[index][1]
+        self._state = state
+        self._zobrist ^= self.jump_keys[index][0]
+        if self._images is not None:
+            self._images = [image ^ key for image, key in
+                            zip(self._images, self.jump_keys[index])]
+        for neighbour in self.neighbours[index]:
+            pegs, mask, _ = jumps[neighbour]
+            if state & mask == pegs:
+                valid.add(neighbour)
+            else:
+                valid.discard(neighbour)
+        if self.validate:
+            self.check_moves()
+
+    def check_moves(self):
+        '''
+        Raises an Exception if the set of jumps that can be made is not what
+        a full rescan of the board finds.
+        '''
+        if self._valid != self._scan():
+            raise Exception('Valid moves %r should be %r' % (
+                sorted(self._valid), sorted(self._scan())))
+
     def reset(self):
         '''
         Makes the board new again. All moves are cleared and all pegs
         returned to their homes.
         '''
         self.__clear_lists()
-        self.pegs = [(r, c) for r in xrange(self.rows) for c in xrange(r + 1)]
+        self.state = (1 << self.size()) - 1
 
     def size(self):
         '''
         Returns the number of holes in the board.
         '''
-        return (self.rows * (self.rows + 1)) / 2
+        return self.layout.size
 
     def peg_count(self):
         '''
         Returns the number of populated holes in the board.
         '''
-        return len(self.pegs)
+        return bin(self._state).count('1')
 
     def is_full(self):
         '''
@@ -50,8 +226,14 @@ class Board(object):
         the very beginning of a game.
         '''
         if self.peg_count() == self.size():
-            if (row, column) in self.pegs:
-                self.pegs.remove((row, column))
+            if self.has_peg(row, column):
+                index = self.layout.index[(row, column)]
+                self._state &= ~(1 << index)
+                self._valid = self._scan()
+                self._zobrist ^= self.hole_keys[0][index]
+                if self._images is not None:
+                    self._images = [image ^ keys[index] for image, keys in
+                                    zip(self._images, self.hole_keys)]
                 self.move_list.append((row, column))
             else:
                 raise Exception('There is no peg at %d, %d' % (row, column))
@@ -62,20 +244,27 @@ class Board(object):
         '''
         Validation for a target location.
         '''
-        return 0 <= row < self.rows and 0 <= column <= row
+        return (row, column) in self.layout.index
+
+    def has_peg(self, row, column):
+        '''
+        Returns True if and only if there is a peg at the specified location.
+        '''
+        return (self.is_within_bounds(row, column) and
+                bool(self._state & self.layout.bit(row, column)))
 
     def is_vacant(self, row, column):
         '''
         Validation for a target location.
         '''
         return (self.is_within_bounds(row, column) and
-                (row, column) not in self.pegs)
+                not self._state & self.layout.bit(row, column))
 
     def has_middle_peg(self, *args):
         '''
         Validation for a target location.
         '''
-        return middle_peg(*args) in self.pegs
+        return self.has_peg(*middle_peg(*args))
 
     def is_valid_move(self, source_row, source_column,
                       target_row, target_column):
@@ -85,98 +274,464 @@ class Board(object):
             -       The target location is empty
             -       There is exactly one peg betwixt
         '''
-        return ((source_row, source_column) in self.pegs
-                and self.is_vacant(target_row, target_column)
-                and is_correct_distance(source_row, source_column,
-                                        target_row, target_column)
-                and self.has_middle_peg(source_row, source_column,
-                                        target_row, target_column)
-                )
+        return self.jump_indices.get((source_row, source_column,
+                                      target_row, target_column)) in self._valid
 
     def move(self, source_row, source_column, target_row, target_column):
         ''' Makes a move on the board only if it is valid '''
-        if self.is_valid_move(source_row, source_column,
-                              target_row, target_column):
-            self.pegs.append((target_row, target_column))
-            self.pegs.remove((source_row, source_column))
-            self.pegs.remove(middle_peg(source_row, source_column,
-                                        target_row, target_column))
-            self.move_list.append((source_row, source_column,
-                                   target_row, target_column))
+        move = source_row, source_column, target_row, target_column
+        index = self.jump_indices.get(move)
+        if index in self._valid:
+            self._jump(index)
+            self.move_list.append(move)
 
     def undo(self):
         ''' Undoes the last move '''
-        last = self.move_list.pop()
-        source_row, source_column, target_row, target_column = last
-        self.pegs.remove((target_row, target_column))
-        self.pegs.append((source_row, source_column))
-        self.pegs.append(middle_peg(*last))
+        self._jump(self.jump_indices[self.move_list.pop()])
 
     def get_valid_moves(self):
         ''' Returns a list of all moves that can be made '''
-        valid_moves = []
-        for row, column in self.pegs:
-            for r in (-2, 0, 2):
-                for c in (-2, 0, 2):
-                    target = row, column, row + r, column + c
-                    if self.is_valid_move(*target):
-                        valid_moves.append(target)
-        return valid_moves
+        jumps = self.jumps
+        return [jumps[index][2] for index in sorted(self._valid)]
 
     def game_over(self):
         '''
-        The game is over when no more moves can be executed.
+        The game is over when no more moves can be executed. A full board
+        has not started yet, so it is not over.
         '''
-        return not self.is_full() and not self.get_valid_moves()
+        return not self._valid and bool(self.move_list or not self.is_full())
 
     def won(self):
         ''' The object of the game is to get down to one peg. '''
-        return self.peg_count() == 1
+        state = self._state
+        return bool(state) and not state & (state - 1)
+
+    def copy(self):
+        '''
+        Returns a new Board with the same pegs and move_list as this one.
+        '''
+        other = Board(self.rows, self.validate, self.symmetric_hash,
+                      self.layout)
+        other.state = self._state
+        other.move_list = list(self.move_list)
+        return other
 
-    def auto_play_move(self, print_board=False):
-        ''' A recursive function that will search for a move_list that wins the
-        game. '''
-        for valid_move in self.get_valid_moves():
-            self.move(*valid_move)
+    def hint(self, seconds=0.05, tablebase=None):
+        '''
+        Searches a copy of the board for at most 'seconds' and returns a
+        (move, proven) pair: the first move of the line found that leaves
+        the fewest pegs, and True if and only if that line wins the game.
+        The move is None if there are no moves to make.
+
+        If a tablebase.Tablebase that covers the position is given, the
+        move is looked up in it instead: it is the best there is, and proven
+        if the game can still be won.
+
+        On a full board the move is the (row, column) of the peg to remove
+        first. The distinct openings (see topology.Topology.distinct_holes)
+        are tried in turn, each with an equal share of the time left, until
+        one is found to win or the time is up; that one, or else the one
+        whose line left the fewest pegs, is suggested.
+        '''
+        deadline = default_timer() + seconds
+        test = self.copy()
+        if not self.is_full():
+            move, proven, _ = test._hint(deadline, tablebase)
+            return move, proven
+        holes = self.layout.distinct_holes()
+        full = self._state
+        best, fewest = holes[0], self.peg_count()
+        for tried, hole in enumerate(holes):
+            now = default_timer()
+            if tried and now >= deadline:
+                break
+            test.state = full & ~self.layout.bit(*hole)
+            test.move_list = [hole]
+            _, proven, pegs = test._hint(
+                now + (deadline - now) / (len(holes) - tried), tablebase)
+            if proven:
+                return hole, True
+            if pegs < fewest:
+                best, fewest = hole, pegs
+        return best, False
+
+    def _hint(self, deadline, tablebase):
+        '''
+        Does the work of hint for a game under way, searching this board
+        (which hint has copied) until 'deadline', and returns the fewest
+        pegs found as well.
+        '''
+        if tablebase is not None and tablebase.covers(self):
+            move = tablebase.best_move(self)
+            pegs = tablebase.fewest_pegs(self)
+            return move, move is not None and pegs == 1, pegs
+        first = len(self.move_list)
+        best = {'move': None, 'pegs': self.peg_count()}
+
+        def check(_):
+            ''' Remembers the best line so far and stops at the deadline '''
+            if first < len(self.move_list) and self.peg_count() < best['pegs']:
+                best['move'] = self.move_list[first]
+                best['pegs'] = self.peg_count()
+            if default_timer() > deadline:
+                raise stats.TimeoutException
+        search = stats.SolverStats(progress=check, interval=1)
+        try:
+            for move_list in self.iter_solutions(
+                    table=transposition.TranspositionTable(), stats=search):
+                return move_list[first], True, 1
+        except stats.TimeoutException:
+            pass
+        return best['move'], False, best['pegs']
+
+    def canonical_state(self):
+        '''
+        Returns the state shared by this board and all its rotations and
+        reflections (see topology.Topology.canonical).
+        '''
+        return self.layout.canonical(self._state)
+
+    def iter_solutions(self, print_board=False, table=None, stats=None,
+                       target=None, prune=None, checkpoint=None):
+        '''
+        Searches for move_lists that win the game, yielding a copy of each
+        one as soon as it is found. The board is left in the winning
+        position while the caller has it; asking for the next solution
+        carries on the search from there. Once every solution has been found
+        the board is back where it started.
+
+        The search keeps its own stack of (jumps, next jump, solved) frames
+        rather than recursing, so it is not limited by Python's recursion
+        limit. If a transposition.TranspositionTable is given as 'table',
+        states that are found not to win are recorded there (by canonical
+        state, so rotations and reflections count as the same position) and
+        never searched again. If a stats.SolverStats is given as 'stats', it
+        is told about every node expanded and every undo.
+
+        If a (row, column) 'target' is given, only games that leave the last
+        peg in that hole count as wins. The table then holds plain states,
+        as a reflection of a position may not be able to reach the target,
+        unless every rotation and reflection leaves the target where it is
+        (see topology.Topology.fixes).
+
+        If a pruning.Pruner is given as 'prune', positions that it shows
+        cannot be won are not searched. A ValueError is raised if the
+        pruner's 'layout' is not the board's.
+
+        If 'print_board' is True the board is printed after every move. It
+        may instead be a BoardPrinter, to buffer and throttle the output.
+
+        If a checkpoint.Checkpoint is given as 'checkpoint', the search is
+        saved to it from time to time, and carries on from where it was
+        saved if the board is in the position the saved search started
+        from.
+        '''
+        if print_board is True:
+            print_board = BoardPrinter()
+        if stats is not None:
+            stats.start()
+        if prune is not None:
+            if prune.layout.name != self.layout.name:
+                raise ValueError('The pruner is for the %s board, not %s' %
+                                 (prune.layout.name, self.layout.name))
+            prune.start(self._state, target)
+        jumps = self.jumps
+        start = self._state
+        if target is None:
+            goal = None
+            key = self.canonical_state
+        else:
+            goal = self.layout.bit(*target)
+            if self.layout.fixes(*target):
+                key = self.canonical_state
+            else:
+                key = self._get_state
+        try:
+            stack = None
+            if checkpoint is not None:
+                stack = checkpoint.resume(self, start, target, table, stats)
+            if stack is None:
+                if prune is not None and prune.cannot_win(self._state):
+                    stack = [[[], 0, False]]
+                else:
+                    stack = [[sorted(self._valid), 0, False]]
+                if stats is not None:
+                    stats.expanded(0, self.peg_count(), len(stack[0][0]))
+            while stack:
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint.save(self, stack, start, target, table, stats)
+                frame = stack[-1]
+                moves, index, solved = frame
+                if index == len(moves):
+                    stack.pop()
+                    if table is not None and not solved:
+                        table.add(key())
+                    if stack:
+                        self._jump(stack[-1][0][stack[-1][1] - 1])
+                        self.move_list.pop()
+                        stack[-1][2] = stack[-1][2] or solved
+                        if stats is not None:
+                            stats.undone()
+                    continue
+                frame[1] = index + 1
+                jump = moves[index]
+                self._jump(jump)
+                self.move_list.append(jumps[jump][2])
+                if print_board:
+                    print_board.show(self, jumps[jump][2])
+                if self.won() if goal is None else self._state == goal:
+                    frame[2] = True
+                    if print_board:
+                        print_board.flush()
+                    yield list(self.move_list)
+                elif (self._valid and
+                      (prune is None or not prune.cannot_win(self._state)) and
+                      (table is None or key() not in table)):
+                    if stats is not None:
+                        stats.expanded(len(stack), self.peg_count(),
+                                       len(self._valid))
+                    stack.append([sorted(self._valid), 0, False])
+                    continue
+                elif stats is not None:
+                    stats.expanded(len(stack), self.peg_count(),
+                                   len(self._valid))
+                self._jump(jump)
+                self.move_list.pop()
+                if stats is not None:
+                    stats.undone()
+            if checkpoint is not None:
+                checkpoint.remove()
+        finally:
+            if stats is not None:
+                stats.finish()
             if print_board:
-                print self, valid_move
-            if not self.game_over():
-                self.auto_play_move(print_board)
-            if self.won():
-                return self.move_list
-            self.undo()
+                print_board.flush()
+
+    def auto_play_move(self, print_board=False, table=None, stats=None,
+                       target=None, prune=None, checkpoint=None):
+        '''
+        Searches for a move_list that wins the game and returns it, leaving
+        the board in the winning position. Returns None if the game cannot
+        be won. See iter_solutions.
+        '''
+        for _ in self.iter_solutions(print_board, table, stats, target,
+                                     prune, checkpoint):
+            if checkpoint is not None:
+                checkpoint.remove()
+            return self.move_list
 
     def __str__(self):
         ''' Returns an ASCII-art representation of the board '''
-        spaces = self.rows + 1
-        retstring = '\n'
-        retstring += spaces * ' ' + '/\\\n'
-
-        for row in xrange(self.rows):
-            spaces -= 1
-            retstring += spaces * ' ' + '/'
-            for column in xrange(row + 1):
-                if self.is_vacant(row, column):
-                    retstring += ' . '
-                else:
-                    retstring += ' x '
-            retstring += '\\\n'
-        retstring += '+' + (self.rows * 3 + 2) * '-' + '+\n'
-        return retstring
+        return render_layout(self._state, self.layout)
 
     def __clear_lists(self):
-        self.pegs = []
+        self.state = 0
         self.move_list = []
 
 
+class BoardPrinter(object):
+    '''
+    Prints boards for iter_solutions, which takes one as 'print_board'.
+    Each board is written with the move that led to it, as
+    "print board, move" would, but through a buffer of 'buffer_size'
+    characters. If 'every' is given only every so many boards are printed,
+    and if 'fps' is given no more than that many a second.
+    '''
+
+    def __init__(self, output=None, fps=None, every=None, buffer_size=65536):
+        self.output = output or sys.stdout
+        self.interval = fps and 1.0 / fps
+        self.every = every
+        self.buffer_size = buffer_size
+        self.parts = []
+        self.size = 0
+        self.shown = 0
+        self.printed = 0
+        self.last = None
+
+    def show(self, board, move):
+        '''
+        Called with the board after each move; prints it if it is time to.
+        '''
+        self.shown += 1
+        if self.every and self.shown % self.every:
+            return
+        if self.interval:
+            now = default_timer()
+            if self.last is not None and now - self.last < self.interval:
+                return
+            self.last = now
+        text = '%s %s\n' % (board, move)
+        self.parts.append(text)
+        self.size += len(text)
+        self.printed += 1
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes out everything buffered.
+        '''
+        if self.parts:
+            self.output.write(''.join(self.parts))
+            self.parts = []
+            self.size = 0
+        self.output.flush()
+
+
+RENDER_CACHE_SIZE = 100000
+_RENDER_CACHE = {}
+_MARKS = tuple(tuple(' x ' if byte >> bit & 1 else ' . ' for bit in xrange(8))
+               for byte in xrange(256))
+
+
+def board_template(number_of_rows):
+    '''
+    Returns the ASCII art for a board of 'number_of_rows' rows as a format
+    string with a %s for each hole, in hole order.
+    '''
+    return topology.triangle(number_of_rows).template
+
+
+def render(state, number_of_rows):
+    '''
+    Returns the ASCII art for 'state' on a board of 'number_of_rows' rows
+    (see render_layout).
+    '''
+    return render_layout(state, topology.triangle(number_of_rows))
+
+
+def render_layout(state, layout):
+    '''
+    Returns the ASCII art for 'state' (see Board.__str__). Renderings are
+    cached by state and layout; the cache is emptied when it reaches
+    RENDER_CACHE_SIZE entries.
+    '''
+    key = state, layout
+    try:
+        return _RENDER_CACHE[key]
+    except KeyError:
+        pass
+    size = layout.size
+    marks = ()
+    remaining = state
+    for _ in xrange(0, size, 8):
+        marks += _MARKS[remaining & 0xff]
+        remaining >>= 8
+    if len(_RENDER_CACHE) >= RENDER_CACHE_SIZE:
+        _RENDER_CACHE.clear()
+    text = layout.template % marks[:size]
+    _RENDER_CACHE[key] = text
+    return text
+
+
+def hole_index(row, column):
+    '''
+    Returns the bit number of the hole at the specified location. Holes are
+    numbered row by row from the top of the triangle.
+    '''
+    return row * (row + 1) // 2 + column
+
+
+def hole_position(index):
+    '''
+    The inverse of hole_index: returns the (row, column) of a bit number.
+    '''
+    row = 0
+    while index > row:
+        row += 1
+        index -= row
+    return row, index
+
+
+def hole_bit(row, column):
+    '''
+    Returns the mask with only the hole at the specified location set.
+    '''
+    return 1 << hole_index(row, column)
+
+
+def jump_mask(source_row, source_column, target_row, target_column):
+    '''
+    Returns the mask of the three holes touched by a jump. Exclusive-or-ing
+    it with a board's state makes (or unmakes) that jump.
+    '''
+    return (hole_bit(source_row, source_column) |
+            hole_bit(*middle_peg(source_row, source_column,
+                                 target_row, target_column)) |
+            hole_bit(target_row, target_column))
+
+
+def jump_table(number_of_rows):
+    '''
+    Returns every jump that fits on a board of 'number_of_rows' rows as a
+    tuple of (pegs, mask, move) triples, where 'mask' covers the source,
+    middle and target holes, 'pegs' covers only the source and middle holes
+    and 'move' is the tuple that Board.move takes. A jump can be made when
+    state & mask == pegs.
+
+    The table is built once per size (see topology.triangle) and shared by
+    every Board.
+    '''
+    return topology.triangle(number_of_rows).jumps
+
+
+def jump_links(number_of_rows):
+    '''
+    Returns two indices into jump_table(number_of_rows): a dictionary from
+    each move to its position in the table, and, for each jump, the
+    positions of every jump that shares a hole with it (itself included).
+    Like the table, these are built once per size and shared.
+    '''
+    layout = topology.triangle(number_of_rows)
+    return layout.jump_indices, layout.neighbours
+
+
+def triangle_rows(game_board):
+    '''
+    Returns the number of rows of 'game_board', for code that only knows the
+    triangular board. Raises ValueError if the board has another layout.
+    '''
+    layout = game_board.layout
+    if layout.name != topology.triangle(layout.rows).name:
+        raise ValueError('Only triangular boards are supported, not %s' %
+                         layout.name)
+    return layout.rows
+
+
+def zobrist_tables(number_of_rows, seed=ZOBRIST_SEED):
+    '''
+    Returns two tables of 64-bit Zobrist keys for a board of
+    'number_of_rows' rows. The first gives, for each of the six symmetries
+    (in symmetry.symmetries order, so the identity first), the key of each
+    hole: the random key of the hole it is mapped to. The second gives, for
+    each jump in jump_table(number_of_rows), the six exclusive-ors of the
+    keys of the three holes it touches. See topology.Topology.zobrist_tables.
+    '''
+    return topology.triangle(number_of_rows).zobrist_tables(seed)
+
+
+def zobrist_hash(state, keys):
+    '''
+    Returns the exclusive-or of the 'keys' of the holes populated in
+    'state'.
+    '''
+    result = 0
+    index = 0
+    while state:
+        if state & 1:
+            result ^= keys[index]
+        state >>= 1
+        index += 1
+    return result
+
+
 def is_correct_distance(source_row, source_column, target_row, target_column):
     '''
     Validation for a target location.
     '''
-    valid_jumps = ((+2, 0), (+2, +2), (0, -2), (0, +2), (-2, -2), (-2, 0))
-
     distance = target_row - source_row, target_column - source_column
-    return distance in valid_jumps
+    return distance in JUMPS
 
 
 def middle_peg(source_row, source_column, target_row, target_column):
@@ -186,16 +741,106 @@ def middle_peg(source_row, source_column, target_row, target_column):
     return (source_row + target_row) / 2, (source_column + target_column) / 2
 
 
-def main(print_board=True):
+def main(print_board=True, processes=None, stats=None, profile=None,
+         layout='triangle', checkpoint=None):
     '''
-    This function demonstrates a sample winning game.
+    This function demonstrates a sample winning game, printing the board
+    as it goes if 'print_board' is True or a BoardPrinter. 'layout' may be
+    'english' to play on the 33-hole cross from its centre instead of the
+    triangle; the last peg must then finish in the centre. If 'processes'
+    is given, the triangle is solved across that many processes instead
+    (see parallel.solve); that cannot be combined with another 'layout',
+    'stats' or 'checkpoint', and raises ValueError if it is. If a
+    stats.SolverStats is given as 'stats' it is
+    printed at the end. If a checkpoint.Checkpoint is given the search is
+    saved to it as it goes, and resumed from it if it was saved before.
+    'profile' may be 'cpu' to print a cProfile report or 'memory' to print
+    the largest allocations traced by tracemalloc.
     '''
-    board = Board()
-    board.reset()
-    board.remove_peg(row=0, column=0)
-    board.auto_play_move(print_board)
+    if processes and (layout != 'triangle' or stats is not None or
+                      checkpoint is not None):
+        raise ValueError('processes can only solve the triangle, without '
+                         'stats or a checkpoint')
+    if profile == 'cpu':
+        profiler = cProfile.Profile()
+        profiler.runcall(main, print_board, processes, stats, None, layout,
+                         checkpoint)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+        return
+    if profile == 'memory':
+        try:
+            import tracemalloc
+        except ImportError:
+            print 'tracemalloc is not available in this Python'
+            return
+        tracemalloc.start()
+        main(print_board, processes, stats, None, layout, checkpoint)
+        for line in tracemalloc.take_snapshot().statistics('lineno')[:20]:
+            print line
+        return
+    if processes:
+        import parallel
+        print parallel.solve(processes=processes)
+        return
+    if layout != 'english':
+        board = Board()
+        board.reset()
+        board.remove_peg(row=0, column=0)
+        board.auto_play_move(print_board, stats=stats, checkpoint=checkpoint)
+    else:
+        board = Board(layout=topology.english())
+        board.reset()
+        board.remove_peg(row=3, column=3)
+        board.auto_play_move(print_board, transposition.TranspositionTable(),
+                             stats=stats, target=(3, 3),
+                             checkpoint=checkpoint)
     print board.move_list
+    if stats is not None:
+        print stats
+
+
+def _progress(stats):
+    print >> sys.stderr, '%d nodes, %.1f s' % (stats.nodes, stats.elapsed())
 
 
 if __name__ == '__main__':
-    main()
+    PARSER = argparse.ArgumentParser(description=main.__doc__)
+    PARSER.add_argument('--quiet', action='store_true',
+                        help='do not print the board after each move')
+    PARSER.add_argument('--fps', type=float,
+                        help='print the board at most this often a second')
+    PARSER.add_argument('--every', type=int, metavar='N',
+                        help='print the board after every Nth move only')
+    PARSER.add_argument('--layout', default='triangle',
+                        choices=('triangle', 'english'),
+                        help='board to play on')
+    PARSER.add_argument('--processes', type=int,
+                        help='solve in parallel across this many processes')
+    PARSER.add_argument('--stats', action='store_true',
+                        help='print search statistics at the end')
+    PARSER.add_argument('--progress', type=int, metavar='NODES',
+                        help='report progress every NODES nodes')
+    PARSER.add_argument('--checkpoint', metavar='PATH',
+                        help='save the search to PATH as it goes, and '
+                        'resume from PATH if it is there')
+    PARSER.add_argument('--checkpoint-seconds', type=float, default=60.0,
+                        help='seconds between checkpoints')
+    PARSER.add_argument('--profile', choices=('cpu', 'memory'),
+                        help='print a CPU or memory profile at the end')
+    ARGS = PARSER.parse_args()
+    if ARGS.processes:
+        for OPTION, GIVEN in (('--layout english', ARGS.layout != 'triangle'),
+                              ('--stats', ARGS.stats),
+                              ('--progress', ARGS.progress),
+                              ('--checkpoint', ARGS.checkpoint)):
+            if GIVEN:
+                PARSER.error('%s cannot be used with --processes' % OPTION)
+    STATS = None
+    if ARGS.stats or ARGS.progress:
+        STATS = stats.SolverStats(progress=ARGS.progress and _progress,
+                                  interval=ARGS.progress or 100000)
+    PRINTER = not ARGS.quiet and BoardPrinter(fps=ARGS.fps, every=ARGS.every)
+    CHECKPOINT = ARGS.checkpoint and checkpoint.Checkpoint(
+        ARGS.checkpoint, ARGS.checkpoint_seconds)
+    main(print_board=PRINTER, processes=ARGS.processes, stats=STATS,
+         profile=ARGS.profile, layout=ARGS.layout, checkpoint=CHECKPOINT)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+'''
+Contains the Checkpoint class.
+
+A checkpoint file holds everything Board.iter_solutions needs to carry on
+a search where it left off: the pegs and move list, the search stack, the
+transposition table's states and the stats counters. Files are pickles,
+written under a temporary name and renamed into place, so a crash while
+saving leaves the last checkpoint as it was.
+'''
+
+import cPickle
+import os
+from timeit import default_timer
+
+VERSION = 1
+STATS_FIELDS = ('nodes', 'moves', 'undos', 'max_depth', 'seconds')
+
+
+class Checkpoint(object):
+    '''
+    Pass one to Board.iter_solutions (or auto_play_move) as 'checkpoint' to
+    save the search to 'path' every 'seconds' seconds. If 'path' already
+    holds a checkpoint of the same search (the same layout, starting
+    position and target), the search resumes from it instead of starting
+    again, and finds the same solutions in the same order as a search that
+    was never stopped. The file is removed once the search is over.
+
+    The clock is only read every 'check_every' nodes. A save never takes
+    more than 'overhead' of the search's time: after a save that took s
+    seconds, the next waits at least s / overhead seconds. If 'save_table'
+    is False the transposition table is not saved, which makes saves
+    quicker; a resumed search then finds the same solutions but has to
+    rediscover the positions that cannot be won.
+
+    'saves' counts the checkpoints written and 'save_seconds' the time
+    spent writing them. 'resumed' is True if the search resumed from a
+    file.
+    '''
+
+    def __init__(self, path, seconds=60.0, check_every=10000, overhead=0.05,
+                 save_table=True):
+        self.path = path
+        self.seconds = seconds
+        self.check_every = check_every
+        self.overhead = overhead
+        self.save_table = save_table
+        self.saves = 0
+        self.save_seconds = 0.0
+        self.resumed = False
+        self.count = 0
+        self.wait = seconds
+        self.last = default_timer()
+
+    def due(self):
+        '''
+        Called by the search at every node; returns True if it is time to
+        save.
+        '''
+        self.count += 1
+        if self.count < self.check_every:
+            return False
+        self.count = 0
+        return default_timer() - self.last >= self.wait
+
+    def save(self, game_board, stack, start, target=None, table=None,
+             stats=None):
+        '''
+        Writes a checkpoint of a search from 'start' (a state) that has got
+        as far as 'game_board' and 'stack'.
+        '''
+        started = default_timer()
+        data = {
+            'version': VERSION,
+            'layout': game_board.layout.name,
+            'start': start,
+            'target': target and tuple(target),
+            'state': game_board.state,
+            'move_list': game_board.move_list,
+            'stack': stack,
+            'table': None,
+            'stats': None,
+        }
+        if table is not None and self.save_table:
+            data['table'] = (table.entries.keys(), table.hits, table.misses,
+                             table.evictions)
+        if stats is not None:
+            data['stats'] = dict((field, getattr(stats, field))
+                                 for field in STATS_FIELDS)
+            data['stats']['elapsed'] = stats.elapsed()
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as output:
+            cPickle.dump(data, output, cPickle.HIGHEST_PROTOCOL)
+            output.flush()
+            os.fsync(output.fileno())
+        os.rename(temporary, self.path)
+        self.last = default_timer()
+        took = self.last - started
+        self.saves += 1
+        self.save_seconds += took
+        self.wait = max(self.seconds, took / self.overhead)
+
+    def load(self):
+        '''
+        Returns the saved checkpoint as a dictionary, or None if there is
+        none.
+        '''
+        try:
+            source = open(self.path, 'rb')
+        except IOError:
+            return None
+        with source:
+            data = cPickle.load(source)
+        if data.get('version') != VERSION:
+            raise Exception('%s is not a checkpoint' % self.path)
+        return data
+
+    def resume(self, game_board, start, target=None, table=None, stats=None):
+        '''
+        Puts 'game_board', 'table' and 'stats' back as they were saved and
+        returns the saved stack, or returns None if there is no checkpoint.
+        Raises ValueError if the checkpoint is of another search.
+        '''
+        data = self.load()
+        if data is None:
+            return None
+        if (data['layout'] != game_board.layout.name or
+                data['start'] != start or
+                data['target'] != (target and tuple(target))):
+            raise ValueError('%s is a checkpoint of another search' %
+                             self.path)
+        game_board.state = data['state']
+        game_board.move_list = data['move_list']
+        if table is not None and data['table'] is not None:
+            states, table.hits, table.misses, table.evictions = data['table']
+            table.entries.clear()
+            for state in states:
+                table.entries[state] = True
+        if stats is not None and data['stats'] is not None:
+            for field in STATS_FIELDS:
+                setattr(stats, field, data['stats'][field])
+            stats.started = default_timer() - data['stats']['elapsed']
+        self.resumed = True
+        self.last = default_timer()
+        return data['stack']
+
+    def remove(self):
+        '''
+        Deletes the checkpoint, if there is one.
+        '''
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __str__(self):
+        return '%d checkpoints saved in %.3f s%s' % (
+            self.saves, self.save_seconds,
+            ', resumed' if self.resumed else '')
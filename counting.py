@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+'''
+Contains the SolutionCounter class
+'''
+
+import sys
+
+import board
+import symmetry
+
+
+class SolutionCounter(object):
+    '''
+    Counts the distinct move sequences that win the game, without playing
+    each of them out. The number of ways to win from a state is the sum of
+    the number of ways to win from each state one move away; these are
+    remembered by canonical state, so every position (and all of its
+    rotations and reflections) is only counted once.
+    '''
+
+    def __init__(self, number_of_rows=5):
+        self.rows = number_of_rows
+        self.jumps = board.jump_table(number_of_rows)
+        self.counts = {}
+
+    def states(self):
+        '''
+        Returns the number of distinct (canonical) states counted so far.
+        '''
+        return len(self.counts)
+
+    def count(self, state):
+        '''
+        Returns the number of move sequences that win the game from 'state'.
+        '''
+        if state and not state & (state - 1):
+            return 1
+        key = symmetry.canonical(state, self.rows)
+        try:
+            return self.counts[key]
+        except KeyError:
+            pass
+        total = 0
+        for pegs, mask, _ in self.jumps:
+            if state & mask == pegs:
+                total += self.count(state ^ mask)
+        self.counts[key] = total
+        return total
+
+    def count_board(self, game_board):
+        '''
+        Returns the number of ways to win from the position on a Board.
+        '''
+        return self.count(game_board.state)
+
+    def count_openings(self):
+        '''
+        Returns a list of ((row, column), count) pairs giving the number of
+        ways to win after removing each peg in turn from a full board.
+        '''
+        test = board.Board(self.rows)
+        result = []
+        for row in xrange(self.rows):
+            for column in xrange(row + 1):
+                test.reset()
+                test.remove_peg(row, column)
+                result.append(((row, column), self.count_board(test)))
+        return result
+
+
+def main(number_of_rows=5):
+    '''
+    Prints the number of ways to win from each opening hole.
+    '''
+    counter = SolutionCounter(number_of_rows)
+    for (row, column), count in counter.count_openings():
+        print '%d, %d: %d' % (row, column, count)
+    print '%d states' % counter.states()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -19,6 +19,7 @@
 """
 
 from board import Board
+from tablebase import Tablebase
 import sys
 
 
@@ -32,19 +33,27 @@ class QuitException(Exception):
     pass
 
 
+class HintException(Exception):
+    '''Help wanted'''
+    pass
+
+
 class Game(object):
     '''
     This is the main game class. It provides an interactive CLI to the
     peg-jump game.
     '''
 
-    def __init__(self, stdin=sys.stdin, stdout=sys.stdout):
+    def __init__(self, stdin=sys.stdin, stdout=sys.stdout, hint_seconds=0.05,
+                 tablebase=None):
         self.stdout = stdout
         self.stdin = stdin
         self.board = Board(5)
         self.board.reset()
         self.width = 80
         self.i = 0
+        self.hint_seconds = hint_seconds
+        self.tablebase = tablebase
 
     def welcome(self):
         '''
@@ -57,12 +66,15 @@ class Game(object):
     def get_valid_peg_position(self):
         '''
         Gets a valid peg position. Raises an InputException if it
-        doesn't understand or a QuitException if 'quit' is entered.
+        doesn't understand, a QuitException if 'quit' is entered or a
+        HintException if 'hint' is entered.
         '''
 
         line = self.stdin.readline()
         if 'quit' in line:
             raise QuitException
+        if 'hint' in line:
+            raise HintException
         try:
             (row_str, column_str) = line.split(',')
             row, column = int(row_str), int(column_str)
@@ -80,9 +92,16 @@ class Game(object):
         Wrapper for get_valid_peg_position, but knows about populated and
         unpopulated positions.
         '''
+        print >> self.stdout, prompt,
+        return self.read_peg_position(populated)
+
+    def read_peg_position(self, populated):
+        '''
+        The part of get_peg_position after the prompt: reads a position and
+        checks that it is (or is not) populated.
+        '''
         amount = populated and 'no' or 'a'
         try:
-            print >> self.stdout, prompt,
             row, column = self.get_valid_peg_position()
             if self.board.is_vacant(row, column) == populated:
                 raise Exception('Sorry, there is %s peg at "%d, %d".' %
@@ -93,6 +112,8 @@ class Game(object):
             print >> self.stdout, ex
 
     DEFAULT_PROMPT = 'Please select a peg to move (row, column): '
+    REMOVE_PROMPT = 'Please select a peg to remove(row, column): '
+    TARGET_PROMPT = 'Please select a hole to move to (row, column): '
 
     def get_populated_peg_position(self, default_prompt=DEFAULT_PROMPT):
         '''
@@ -104,9 +125,8 @@ class Game(object):
         '''
         Wrapper for get_peg_position. Sets appropriate prompt.
         '''
-        return self.get_peg_position(
-            populated=False,
-            prompt='Please select a hole to move to (row, column): ')
+        return self.get_peg_position(populated=False,
+                                     prompt=self.TARGET_PROMPT)
 
     def make_move(self):
         '''
@@ -123,16 +143,34 @@ class Game(object):
             except QuitException:
                 print >> self.stdout, 'Goodbye.'
                 return
+            except HintException:
+                self.show_hint()
             except TypeError:
                 print >> self.stdout, 'Please try again...'
             print >> self.stdout, self.board
 
+    def show_hint(self):
+        '''
+        Suggests a move (or, before the game starts, a peg to remove),
+        looked up in the tablebase if there is one that covers the position,
+        or else found by searching for no longer than hint_seconds.
+        '''
+        move, proven = self.board.hint(self.hint_seconds, self.tablebase)
+        if move is None:
+            print >> self.stdout, 'Sorry, I have no hint for you.'
+        elif len(move) == 2:
+            print >> self.stdout, 'Try removing the peg at %d, %d%s.' % (
+                move + (proven and ' (this wins)' or '',))
+        else:
+            print >> self.stdout, 'Try moving %d, %d to %d, %d%s.' % (
+                move + (proven and ' (this wins)' or '',))
+
     def do_first_move(self):
         '''
         Code specific to clearing the first hole.
         '''
         row, column = self.get_populated_peg_position(
-            default_prompt='Please select a peg to remove(row, column): ')
+            default_prompt=self.REMOVE_PROMPT)
         self.board.remove_peg(row, column)
 
     def do_main_move(self):
@@ -155,7 +193,12 @@ class Game(object):
         '''
         while not self.is_over():
             self.make_move()
+        self.show_result()
 
+    def show_result(self):
+        '''
+        Reports how the game ended.
+        '''
         print >> self.stdout, 'Game over.'
         if self.board.won() is not True:
             print >> self.stdout, 'You have lost.'
@@ -163,14 +206,15 @@ class Game(object):
             print >> self.stdout, 'You have won!'
 
 
-def main():
+def main(tablebase_path=None):
     '''
     Play the game,
     (Play the game),
+    with hints from the tablebase file at 'tablebase_path', if given.
     '''
-    game = Game()
+    game = Game(tablebase=tablebase_path and Tablebase(tablebase_path))
     game.welcome()
     game.play()
 
 if __name__ == '__main__':
-    main()
+    main(*sys.argv[1:])
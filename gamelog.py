@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+'''
+Contains the GameLog class and the writer for its files.
+
+A game log holds any number of games, each the move_list of a Board. After
+a header, each game is a record of three bytes (the number of rows, the
+number of the hole the first peg was removed from and the number of jumps)
+followed by the jumps, packed least significant bit first. Each jump is its
+position in board.jump_table, in as few bits as that table needs: six for a
+five-row board, so a whole game fits in fewer than a dozen bytes.
+
+    % ./gamelog.py games.log --generate 1000000
+    % ./gamelog.py games.log
+'''
+
+import argparse
+import mmap
+import random
+import struct
+from timeit import default_timer
+
+import board
+
+MAGIC = 'PEGLG'
+VERSION = 1
+HEADER = struct.Struct('<5sBxx')
+HEADER_SIZE = HEADER.size
+RECORD = struct.Struct('<BBB')
+NO_HOLE = 0xff
+
+_CODECS = {}
+
+
+def _codec(number_of_rows):
+    '''
+    Returns the jump table for a size, a dictionary from moves to their
+    positions in it, and the number of bits a position takes.
+    '''
+    try:
+        return _CODECS[number_of_rows]
+    except KeyError:
+        pass
+    jumps = board.jump_table(number_of_rows)
+    indices, _ = board.jump_links(number_of_rows)
+    width = max(1, (len(jumps) - 1).bit_length())
+    _CODECS[number_of_rows] = jumps, indices, width
+    return _CODECS[number_of_rows]
+
+
+def encode(move_list, number_of_rows=5):
+    '''
+    Returns the record for a game on a board of 'number_of_rows' rows, given
+    its move_list: the (row, column) of the peg removed first, then the
+    moves made. Raises ValueError for a move that is not a jump on such a
+    board; moves that could not be made in the game are kept, so that they
+    can be found later.
+    '''
+    _, indices, width = _codec(number_of_rows)
+    if not move_list:
+        return RECORD.pack(number_of_rows, NO_HOLE, 0)
+    row, column = move_list[0]
+    if not 0 <= column <= row < number_of_rows:
+        raise ValueError('%d, %d is not a hole' % (row, column))
+    bits = 0
+    shift = 0
+    for move in move_list[1:]:
+        try:
+            bits |= indices[tuple(move)] << shift
+        except KeyError:
+            raise ValueError('%r is not a jump' % (move,))
+        shift += width
+    size = (shift + 7) // 8
+    packed = size and ('%0*x' % (size * 2, bits)).decode('hex')[::-1] or ''
+    return RECORD.pack(number_of_rows, board.hole_index(row, column),
+                       len(move_list) - 1) + packed
+
+
+def _jumps(data, offset, size, count, width):
+    '''
+    Unpacks 'count' jump positions of 'width' bits from 'size' bytes.
+    '''
+    bits = int(data[offset:offset + size][::-1].encode('hex') or '0', 16)
+    mask = (1 << width) - 1
+    result = []
+    for _ in xrange(count):
+        result.append(bits & mask)
+        bits >>= width
+    return result
+
+
+def decode(data, offset=HEADER_SIZE):
+    '''
+    Reads the record at 'offset' in 'data'. Returns the number of rows, the
+    move_list and the offset of the next record.
+    '''
+    number_of_rows, hole, count = RECORD.unpack_from(data, offset)
+    jumps, _, width = _codec(number_of_rows)
+    offset += RECORD.size
+    size = (count * width + 7) // 8
+    if hole == NO_HOLE:
+        return number_of_rows, [], offset + size
+    move_list = [board.hole_position(hole)]
+    for index in _jumps(data, offset, size, count, width):
+        if index >= len(jumps):
+            raise ValueError('%d is not a jump' % index)
+        move_list.append(jumps[index][2])
+    return number_of_rows, move_list, offset + size
+
+
+class GameLogWriter(object):
+    '''
+    Writes games to a new game log at 'path'. Use it as a context manager,
+    or call close() when done.
+    '''
+
+    def __init__(self, path):
+        self.output = open(path, 'wb')
+        self.output.write(HEADER.pack(MAGIC, VERSION))
+        self.games = 0
+
+    def write(self, move_list, number_of_rows=5):
+        '''
+        Appends a game, given its move_list (see encode).
+        '''
+        self.output.write(encode(move_list, number_of_rows))
+        self.games += 1
+
+    def write_board(self, game_board):
+        '''
+        Appends the game played on a Board. Raises ValueError if the board
+        is not triangular, as records only describe triangles.
+        '''
+        self.write(game_board.move_list, board.triangle_rows(game_board))
+
+    def close(self):
+        '''
+        Finishes the file.
+        '''
+        self.output.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class Replay(object):
+    '''
+    What replaying a logged game found: the 'offset' of its record, the
+    number of 'rows', the 'pegs' left, whether it was 'won' and whether it
+    was 'over' (no moves left to make). 'illegal' is the position among the
+    game's jumps of the first one that could not be made, where the replay
+    stopped, or None if every jump was legal; -1 means the first peg was
+    not removed from a hole.
+    '''
+
+    def __init__(self, offset, rows, pegs, won, over, illegal):
+        self.offset = offset
+        self.rows = rows
+        self.pegs = pegs
+        self.won = won
+        self.over = over
+        self.illegal = illegal
+
+
+class GameLog(object):
+    '''
+    A read-only, memory-mapped game log. Iterating over it yields each
+    game's (rows, move_list); replay() checks every game without making
+    move_lists or Boards.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as source:
+            self.data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER_SIZE:
+            self.close()
+            raise Exception('%s is not a game log' % path)
+        magic, version = HEADER.unpack(self.data[:HEADER_SIZE])
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise Exception('%s is not a game log' % path)
+
+    def close(self):
+        '''
+        Unmaps the file.
+        '''
+        self.data.close()
+
+    def _records(self):
+        data = self.data
+        end = len(data)
+        offset = HEADER_SIZE
+        while offset < end:
+            if offset + RECORD.size > end:
+                raise Exception('%s is truncated at %d' % (self.path, offset))
+            number_of_rows, hole, count = RECORD.unpack_from(data, offset)
+            start = offset + RECORD.size
+            size = (count * _codec(number_of_rows)[2] + 7) // 8
+            if start + size > end:
+                raise Exception('%s is truncated at %d' % (self.path, offset))
+            yield offset, number_of_rows, hole, count, start, size
+            offset = start + size
+
+    def __iter__(self):
+        for offset, _, _, _, _, _ in self._records():
+            number_of_rows, move_list, _ = decode(self.data, offset)
+            yield number_of_rows, move_list
+
+    def replay(self):
+        '''
+        Replays every game on a bitmask, yielding a Replay for each.
+        '''
+        data = self.data
+        for (offset, number_of_rows, hole, count, start,
+             size) in self._records():
+            jumps, _, width = _codec(number_of_rows)
+            holes = number_of_rows * (number_of_rows + 1) // 2
+            state = (1 << holes) - 1
+            illegal = None
+            if hole == NO_HOLE and count == 0:
+                pass
+            elif hole >= holes:
+                illegal = -1
+            else:
+                state &= ~(1 << hole)
+                for position, index in enumerate(
+                        _jumps(data, start, size, count, width)):
+                    if index >= len(jumps):
+                        illegal = position
+                        break
+                    pegs, mask, _ = jumps[index]
+                    if state & mask != pegs:
+                        illegal = position
+                        break
+                    state ^= mask
+            pegs = bin(state).count('1')
+            over = hole != NO_HOLE and not any(state & mask == pegs_needed
+                                               for pegs_needed, mask, _
+                                               in jumps)
+            yield Replay(offset, number_of_rows, pegs, pegs == 1, over,
+                         illegal)
+
+    def validate(self):
+        '''
+        Replays every game and returns a summary dictionary: the numbers of
+        'games', games 'won', 'lost' (over with more than one peg left),
+        'unfinished' and 'illegal' (which are not counted as any of the
+        others), the offsets of the first few illegal games, and 'pegs', a
+        dictionary from the pegs left to the number of games that left them.
+        '''
+        summary = {'games': 0, 'won': 0, 'lost': 0, 'unfinished': 0,
+                   'illegal': 0, 'illegal_offsets': [], 'pegs': {}}
+        pegs_left = summary['pegs']
+        for replay in self.replay():
+            summary['games'] += 1
+            if replay.illegal is not None:
+                summary['illegal'] += 1
+                if len(summary['illegal_offsets']) < 10:
+                    summary['illegal_offsets'].append(replay.offset)
+                continue
+            pegs_left[replay.pegs] = pegs_left.get(replay.pegs, 0) + 1
+            if replay.won:
+                summary['won'] += 1
+            elif replay.over:
+                summary['lost'] += 1
+            else:
+                summary['unfinished'] += 1
+        return summary
+
+
+def random_games(count, number_of_rows=5, seed=0):
+    '''
+    Yields the move_lists of 'count' games played with random moves, from
+    random openings, until no moves are left.
+    '''
+    chooser = random.Random(seed)
+    test = board.Board(number_of_rows)
+    holes = [board.hole_position(index) for index in xrange(test.size())]
+    for _ in xrange(count):
+        test.reset()
+        test.remove_peg(*chooser.choice(holes))
+        moves = test.get_valid_moves()
+        while moves:
+            test.move(*chooser.choice(moves))
+            moves = test.get_valid_moves()
+        yield list(test.move_list)
+
+
+def main(argv=None):
+    '''
+    Validates a game log, after first filling it with random games if asked.
+    '''
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('path', help='game log file')
+    parser.add_argument('--generate', type=int, metavar='GAMES',
+                        help='first write this many random games')
+    parser.add_argument('--rows', type=int, default=5,
+                        help='board size for generated games')
+    args = parser.parse_args(argv)
+    if args.generate:
+        with GameLogWriter(args.path) as writer:
+            for move_list in random_games(args.generate, args.rows):
+                writer.write(move_list, args.rows)
+    log = GameLog(args.path)
+    started = default_timer()
+    summary = log.validate()
+    seconds = default_timer() - started
+    log.close()
+    print '%d games in %.2f s (%.0f games/minute)' % (
+        summary['games'], seconds, summary['games'] * 60 / (seconds or 1))
+    print '%d won, %d lost, %d unfinished, %d illegal' % (
+        summary['won'], summary['lost'], summary['unfinished'],
+        summary['illegal'])
+    for offset in summary['illegal_offsets']:
+        print 'illegal game at offset %d' % offset
+    for pegs, games in sorted(summary['pegs'].items()):
+        print '%3d pegs left: %d games' % (pegs, games)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+'''
+Enumerates every reachable state of a board, one peg count at a time, on
+disk.
+
+Every jump removes one peg, so the states reachable from the openings fall
+into layers by peg count, and each layer can be worked out from the one
+before it alone. enumerate_layers() reads the previous layer from its
+file and keeps only new states in memory, and only up to a limit: past
+it, they are sorted and written out as a run, and the runs are merged,
+dropping duplicates, into the layer's file. States are canonical (see
+symmetry.canonical), so rotations and reflections are counted once.
+
+A layer file is a header followed by blocks of states in ascending order.
+Each block is its number of states and its size, then the differences
+between successive states (the first against zero) as 64-bit integers,
+compressed with zlib. Runs are written in the same format.
+
+    % ./layers.py 7 /var/tmp/seven --max-states 2000000
+'''
+
+import argparse
+import heapq
+import os
+import struct
+import zlib
+from itertools import groupby
+from timeit import default_timer
+
+import topology
+
+MAGIC = 'PEGLY'
+VERSION = 1
+HEADER = struct.Struct('<5sBBB')
+BLOCK = struct.Struct('<II')
+BLOCK_STATES = 65536
+MAX_STATES = 2000000
+FAN_IN = 64
+
+
+class LayerWriter(object):
+    '''
+    Writes states, which must be given in ascending order, to a new layer
+    file at 'path'. Use it as a context manager, or call close() when done.
+    'states' counts the states written.
+    '''
+
+    def __init__(self, path, number_of_rows, peg_count):
+        self.output = open(path, 'wb')
+        self.output.write(HEADER.pack(MAGIC, VERSION, number_of_rows,
+                                      peg_count))
+        self.block = []
+        self.states = 0
+
+    def write(self, state):
+        '''
+        Appends a state.
+        '''
+        self.block.append(state)
+        if len(self.block) >= BLOCK_STATES:
+            self._flush()
+
+    def write_all(self, states):
+        '''
+        Appends every state in 'states'.
+        '''
+        for state in states:
+            self.write(state)
+
+    def _flush(self):
+        block = self.block
+        if not block:
+            return
+        deltas = [block[0]]
+        deltas.extend(state - previous
+                      for previous, state in zip(block, block[1:]))
+        data = zlib.compress(struct.pack('<%dQ' % len(deltas), *deltas), 1)
+        self.output.write(BLOCK.pack(len(block), len(data)))
+        self.output.write(data)
+        self.states += len(block)
+        self.block = []
+
+    def close(self):
+        '''
+        Finishes the file.
+        '''
+        self._flush()
+        self.output.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def read_header(path):
+    '''
+    Returns the number of rows and the peg count of a layer file.
+    '''
+    with open(path, 'rb') as source:
+        data = source.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise Exception('%s is not a layer file' % path)
+    magic, version, number_of_rows, peg_count = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise Exception('%s is not a layer file' % path)
+    return number_of_rows, peg_count
+
+
+def read_states(path):
+    '''
+    Yields the states in a layer file, in ascending order.
+    '''
+    read_header(path)
+    with open(path, 'rb') as source:
+        source.seek(HEADER.size)
+        while True:
+            data = source.read(BLOCK.size)
+            if not data:
+                return
+            if len(data) < BLOCK.size:
+                raise Exception('%s is truncated' % path)
+            count, size = BLOCK.unpack(data)
+            data = source.read(size)
+            if len(data) < size:
+                raise Exception('%s is truncated' % path)
+            state = 0
+            for delta in struct.unpack('<%dQ' % count,
+                                       zlib.decompress(data)):
+                state += delta
+                yield state
+
+
+def merge(paths, path, number_of_rows, peg_count):
+    '''
+    Merges the sorted files at 'paths' into a new file at 'path', keeping
+    one of each state. Returns the number of states written.
+    '''
+    with LayerWriter(path, number_of_rows, peg_count) as writer:
+        for state, _ in groupby(heapq.merge(*[read_states(run)
+                                              for run in paths])):
+            writer.write(state)
+    return writer.states
+
+
+class Successors(object):
+    '''
+    Finds the states one jump on from a state of a layout. A jump needs its
+    target hole empty and its other two holes full, so for a state with
+    few empty holes the jumps are looked up by target, and for one with few
+    pegs by source.
+    '''
+
+    def __init__(self, layout):
+        self.size = layout.size
+        self.by_target = [[] for _ in xrange(layout.size)]
+        self.by_source = [[] for _ in xrange(layout.size)]
+        for pegs, mask, move in layout.jumps:
+            target = mask ^ pegs
+            self.by_target[target.bit_length() - 1].append((pegs, mask))
+            self.by_source[layout.index[move[:2]]].append((pegs, mask))
+
+    def __call__(self, state):
+        '''
+        Returns the states one jump on from 'state'.
+        '''
+        result = []
+        pegs_left = bin(state).count('1')
+        if pegs_left * 2 > self.size:
+            holes, table = ~state & ((1 << self.size) - 1), self.by_target
+        else:
+            holes, table = state, self.by_source
+        while holes:
+            bit = holes & -holes
+            holes ^= bit
+            for pegs, mask in table[bit.bit_length() - 1]:
+                if state & mask == pegs:
+                    result.append(state ^ mask)
+        return result
+
+
+class LayerReport(object):
+    '''
+    What enumerating one layer found: its 'peg_count', the number of
+    distinct canonical 'states', the number of 'runs' spilled to disk
+    (zero if the layer fitted in memory), the size of its file in 'bytes'
+    and the 'seconds' it took.
+    '''
+
+    def __init__(self, peg_count, states, runs, size, seconds):
+        self.peg_count = peg_count
+        self.states = states
+        self.runs = runs
+        self.bytes = size
+        self.seconds = seconds
+
+    def __str__(self):
+        return '%3d pegs: %d states, %d runs, %d bytes, %.2f s' % (
+            self.peg_count, self.states, self.runs, self.bytes, self.seconds)
+
+
+def layer_path(directory, peg_count):
+    '''
+    Returns the path of the file for the layer with 'peg_count' pegs.
+    '''
+    return os.path.join(directory, 'layer-%03d.bin' % peg_count)
+
+
+def _spill(states, directory, number_of_rows, peg_count, runs):
+    path = os.path.join(directory, 'run-%03d-%06d.tmp' % (peg_count,
+                                                         len(runs)))
+    with LayerWriter(path, number_of_rows, peg_count) as writer:
+        writer.write_all(states)
+    runs.append(path)
+
+
+def _merge_runs(runs, path, number_of_rows, peg_count, fan_in):
+    '''
+    Merges 'runs' into the layer file at 'path', at most 'fan_in' at a
+    time, deleting them as it goes. Returns the number of states.
+    '''
+    runs = list(runs)
+    generation = 0
+    while len(runs) > fan_in:
+        merged = []
+        for first in xrange(0, len(runs), fan_in):
+            group = runs[first:first + fan_in]
+            output = '%s.%d.%d.tmp' % (path, generation, len(merged))
+            merge(group, output, number_of_rows, peg_count)
+            for run in group:
+                os.remove(run)
+            merged.append(output)
+        runs = merged
+        generation += 1
+    states = merge(runs, path, number_of_rows, peg_count)
+    for run in runs:
+        os.remove(run)
+    return states
+
+
+def enumerate_layers(number_of_rows, directory, max_states=MAX_STATES,
+                     report=None, fan_in=FAN_IN):
+    '''
+    Writes the file of every layer of canonical states reachable from the
+    openings of a board of 'number_of_rows' rows into 'directory', from
+    the openings down to the last peg count that can be reached. New
+    states are gathered as they are found and only made canonical when
+    'max_states' of them are held, or the layer is done, so that each is
+    made canonical once per run however many ways it is reached. Calls
+    'report', if given, with the LayerReport of each layer as it is
+    finished, and returns the list of them.
+    '''
+    layout = topology.triangle(number_of_rows)
+    successors = Successors(layout)
+    canonical = layout.canonical
+    full = (1 << layout.size) - 1
+    peg_count = layout.size - 1
+    started = default_timer()
+    path = layer_path(directory, peg_count)
+    with LayerWriter(path, number_of_rows, peg_count) as writer:
+        writer.write_all(sorted(set(layout.canonical(full ^ (1 << index))
+                                    for index in xrange(layout.size))))
+    reports = [LayerReport(peg_count, writer.states, 0,
+                           os.path.getsize(path), default_timer() - started)]
+    if report:
+        report(reports[-1])
+    while peg_count > 1:
+        started = default_timer()
+        previous = path
+        peg_count -= 1
+        path = layer_path(directory, peg_count)
+        states = set()
+        runs = []
+        for state in read_states(previous):
+            states.update(successors(state))
+            if len(states) >= max_states:
+                _spill(sorted(set(map(canonical, states))), directory,
+                       number_of_rows, peg_count, runs)
+                states = set()
+        states = sorted(set(map(canonical, states)))
+        if runs:
+            if states:
+                _spill(states, directory, number_of_rows, peg_count, runs)
+            count = _merge_runs(runs, path, number_of_rows, peg_count, fan_in)
+        else:
+            with LayerWriter(path, number_of_rows, peg_count) as writer:
+                writer.write_all(states)
+            count = writer.states
+        states = None
+        reports.append(LayerReport(peg_count, count, len(runs),
+                                   os.path.getsize(path),
+                                   default_timer() - started))
+        if report:
+            report(reports[-1])
+        if not count:
+            break
+    return reports
+
+
+def _print_report(layer):
+    print layer
+
+
+def main(argv=None):
+    '''
+    Enumerates the reachable states of a board layer by layer, printing
+    the number in each layer as it is finished.
+    '''
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('rows', type=int, help='board size')
+    parser.add_argument('directory', help='where to write the layer files')
+    parser.add_argument('--max-states', type=int, default=MAX_STATES,
+                        help='most new states to hold in memory at once')
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.directory):
+        os.makedirs(args.directory)
+    started = default_timer()
+    reports = enumerate_layers(args.rows, args.directory, args.max_states,
+                               _print_report)
+    print '%d states in %.2f s' % (sum(layer.states for layer in reports),
+                                   default_timer() - started)
+
+
+if __name__ == '__main__':
+    main()
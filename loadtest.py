@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+'''
+Load-tests server.py by playing many games against it at once:
+
+    % ./server.py &
+    % ./loadtest.py --players 1000
+
+Every simulated player connects at the start and plays the same winning
+game, sending a move each time it is prompted; with --hints, it asks for a
+hint before choosing each peg. The report gives the number
+of games won, refused and broken off, and how long the server took to
+answer each move. Each player needs a file descriptor, so raise 'ulimit -n'
+for large runs.
+'''
+
+import argparse
+import asynchat
+import asyncore
+import socket
+from timeit import default_timer
+
+WINNING_GAME = (
+    '0, 0',
+    '2, 0', '0, 0',
+    '2, 2', '2, 0',
+    '3, 0', '1, 0',
+    '4, 1', '2, 1',
+    '4, 4', '2, 2',
+    '4, 3', '4, 1',
+    '4, 0', '4, 2',
+    '0, 0', '2, 0',
+    '1, 1', '3, 3',
+    '4, 2', '2, 2',
+    '3, 3', '1, 1',
+    '2, 0', '2, 2',
+    '1, 1', '3, 3',
+)
+
+HINTED_GAME = tuple(line for number, move in enumerate(WINNING_GAME)
+                    for line in (('hint', move) if number % 2 or not number
+                                 else (move,)))
+
+PROMPT_END = '(row, column): '
+
+
+class Player(asynchat.async_chat):
+    '''
+    A simulated player: sends the next of 'lines' whenever it is prompted,
+    timing each answer, and appends a PlayerResult to 'results' when the
+    connection closes.
+    '''
+
+    def __init__(self, address, lines, results, sockets):
+        asynchat.async_chat.__init__(self, map=sockets)
+        self.lines = list(lines)
+        self.results = results
+        self.received = ''
+        self.latencies = []
+        self.sent = None
+        self.done = False
+        self.started = default_timer()
+        self.set_terminator(None)
+        self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.connect(address)
+
+    def collect_incoming_data(self, data):
+        self.received += data
+        if not self.received.endswith(PROMPT_END):
+            return
+        now = default_timer()
+        if self.sent is not None:
+            self.latencies.append(now - self.sent)
+        self.received = ''
+        if self.lines:
+            self.push(self.lines.pop(0) + '\n')
+            self.sent = now
+        else:
+            self.handle_close()
+
+    def found_terminator(self):
+        pass
+
+    def handle_connect(self):
+        pass
+
+    def handle_close(self):
+        if self.done:
+            return
+        self.done = True
+        self.results.append(PlayerResult(
+            'You have won!' in self.received,
+            'server is full' in self.received,
+            self.latencies, default_timer() - self.started))
+        self.close()
+
+    def handle_error(self):
+        self.handle_close()
+
+
+class PlayerResult(object):
+    '''
+    How a simulated player's game went: whether it was 'won' or 'refused',
+    the seconds taken to answer each move and the 'seconds' connected.
+    '''
+
+    def __init__(self, won, refused, latencies, seconds):
+        self.won = won
+        self.refused = refused
+        self.latencies = latencies
+        self.seconds = seconds
+
+
+def run(address, players=100, lines=WINNING_GAME):
+    '''
+    Connects 'players' simulated players to the server at 'address' at
+    once, runs until every game is over and returns their PlayerResults.
+    '''
+    sockets = {}
+    results = []
+    for _ in xrange(players):
+        Player(address, lines, results, sockets)
+    asyncore.loop(timeout=1.0, use_poll=True, map=sockets)
+    return results
+
+
+def report(results, seconds):
+    '''
+    Summarises a run's results as text.
+    '''
+    latencies = sorted(latency for result in results
+                       for latency in result.latencies)
+    won = sum(1 for result in results if result.won)
+    refused = sum(1 for result in results if result.refused)
+    lines = ['%d players: %d won, %d refused, %d broken off in %.2f s' % (
+        len(results), won, refused, len(results) - won - refused, seconds)]
+    if latencies:
+        lines.append('%d moves, %.0f moves/s; latency median %.2f ms, '
+                     '99%% %.2f ms, max %.2f ms' % (
+                         len(latencies), len(latencies) / seconds,
+                         latencies[len(latencies) // 2] * 1e3,
+                         latencies[len(latencies) * 99 // 100] * 1e3,
+                         latencies[-1] * 1e3))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    '''
+    Parses the command line, runs the load test and prints the report.
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='localhost',
+                        help='address of the server')
+    parser.add_argument('--port', type=int, default=7070,
+                        help='port of the server')
+    parser.add_argument('--players', type=int, default=100,
+                        help='number of players to simulate')
+    parser.add_argument('--hints', action='store_true',
+                        help='ask for a hint before choosing each peg')
+    args = parser.parse_args(argv)
+    started = default_timer()
+    results = run((args.host, args.port), args.players,
+                  HINTED_GAME if args.hints else WINNING_GAME)
+    print report(results, default_timer() - started)
+
+
+if __name__ == '__main__':
+    main()
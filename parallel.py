@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+'''
+Solves boards across a pool of processes.
+
+The search is split into work units: one for each way of playing the first
+few moves after removing each distinct opening hole (see
+symmetry.distinct_holes). Units are handed out one at a time, so a process
+that finishes early takes the next unit rather than sitting idle.
+'''
+
+from multiprocessing import Pool
+
+import board
+import counting
+import symmetry
+import transposition
+
+_TABLES = {}
+_COUNTERS = {}
+
+
+def work_units(number_of_rows=5, holes=None, depth=2):
+    '''
+    Returns the move_lists that start each unit of work: a peg removed from
+    one of 'holes' (by default, every distinct hole) followed by up to
+    'depth' moves. A unit is cut short if the game ends before then.
+    '''
+    if holes is None:
+        holes = symmetry.distinct_holes(number_of_rows)
+    test = board.Board(number_of_rows)
+    units = []
+    for row, column in holes:
+        test.reset()
+        test.remove_peg(row, column)
+        units.extend(_prefixes(test, depth))
+    return units
+
+
+def _prefixes(test, depth):
+    moves = test.get_valid_moves()
+    if depth == 0 or not moves:
+        yield list(test.move_list)
+        return
+    for move in moves:
+        test.move(*move)
+        for prefix in _prefixes(test, depth - 1):
+            yield prefix
+        test.undo()
+
+
+def _replay(number_of_rows, move_list):
+    test = board.Board(number_of_rows)
+    test.reset()
+    test.remove_peg(*move_list[0])
+    for move in move_list[1:]:
+        test.move(*move)
+    return test
+
+
+def solve_unit(unit):
+    '''
+    Searches one (number_of_rows, move_list) unit of work. Returns a winning
+    move_list, or None. Each process keeps one transposition table per board
+    size for all the units it is given.
+    '''
+    number_of_rows, move_list = unit
+    test = _replay(number_of_rows, move_list)
+    if test.won():
+        return test.move_list
+    table = _TABLES.setdefault(number_of_rows,
+                               transposition.TranspositionTable())
+    return test.auto_play_move(table=table)
+
+
+def count_unit(unit):
+    '''
+    Counts the ways to win from one (number_of_rows, move_list) unit of
+    work. Returns the opening hole and the count.
+    '''
+    number_of_rows, move_list = unit
+    counter = _COUNTERS.setdefault(number_of_rows,
+                                   counting.SolutionCounter(number_of_rows))
+    test = _replay(number_of_rows, move_list)
+    return move_list[0], counter.count_board(test)
+
+
+def solve(number_of_rows=5, holes=None, processes=None, depth=2):
+    '''
+    Returns the first winning move_list found by any process, or None if
+    none of the openings can be won. The remaining processes are stopped as
+    soon as a solution is found.
+    '''
+    units = [(number_of_rows, prefix)
+             for prefix in work_units(number_of_rows, holes, depth)]
+    pool = Pool(processes)
+    try:
+        for move_list in pool.imap_unordered(solve_unit, units):
+            if move_list is not None:
+                return move_list
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def count(number_of_rows=5, holes=None, processes=None, depth=2):
+    '''
+    Returns a dictionary giving the number of ways to win after removing
+    each of 'holes' (by default, every distinct hole).
+    '''
+    units = [(number_of_rows, prefix)
+             for prefix in work_units(number_of_rows, holes, depth)]
+    counts = dict((prefix[0], 0) for _, prefix in units)
+    pool = Pool(processes)
+    try:
+        for hole, ways in pool.imap_unordered(count_unit, units):
+            counts[hole] += ways
+    finally:
+        pool.terminate()
+        pool.join()
+    return counts
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+'''
+Contains the Position class
+'''
+
+import board
+import symmetry
+
+
+class Position(object):
+    '''
+    An immutable board position: the populated holes as a bitmask, 'state'
+    (see Board.state), and the number of rows. Positions are small, can be
+    used as dictionary keys and pickle cheaply, so they suit caches and
+    process pools better than whole Boards.
+
+    Making a move returns a new Position; the move list is not kept.
+    '''
+
+    __slots__ = ('state', 'rows')
+
+    def __init__(self, state, number_of_rows=5):
+        object.__setattr__(self, 'state', state)
+        object.__setattr__(self, 'rows', number_of_rows)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Position is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Position is immutable')
+
+    def __reduce__(self):
+        return Position, (self.state, self.rows)
+
+    @classmethod
+    def from_board(cls, game_board):
+        '''
+        Returns the Position of the pegs on 'game_board'. Raises ValueError
+        if the board is not triangular, as Positions only describe
+        triangles.
+        '''
+        return cls(game_board.state, board.triangle_rows(game_board))
+
+    def to_board(self, validate=False):
+        '''
+        Returns a new Board with these pegs and an empty move list.
+        '''
+        game_board = board.Board(self.rows, validate)
+        game_board.state = self.state
+        return game_board
+
+    def peg_count(self):
+        '''
+        Returns the number of pegs in the position.
+        '''
+        return bin(self.state).count('1')
+
+    def moves(self):
+        '''
+        Returns the moves that can be made, as tuples that Board.move and
+        apply take, in jump table order.
+        '''
+        state = self.state
+        return [move for pegs, mask, move in board.jump_table(self.rows)
+                if state & mask == pegs]
+
+    def apply(self, move):
+        '''
+        Returns the Position after making 'move', a (source_row,
+        source_column, target_row, target_column) tuple. Raises ValueError
+        if the move cannot be made.
+        '''
+        indices, _ = board.jump_links(self.rows)
+        try:
+            pegs, mask, _ = board.jump_table(self.rows)[indices[tuple(move)]]
+        except KeyError:
+            raise ValueError('%r is not a jump' % (move,))
+        if self.state & mask != pegs:
+            raise ValueError('%r cannot be made' % (move,))
+        return Position(self.state ^ mask, self.rows)
+
+    def canonical(self):
+        '''
+        Returns the Position shared by this one and all its rotations and
+        reflections (see symmetry.canonical).
+        '''
+        return Position(symmetry.canonical(self.state, self.rows), self.rows)
+
+    def __eq__(self, other):
+        return (isinstance(other, Position) and
+                self.state == other.state and self.rows == other.rows)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.state, self.rows))
+
+    def __repr__(self):
+        return 'Position(%#x, %d)' % (self.state, self.rows)
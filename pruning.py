@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+'''
+Cuts off searches from positions that provably cannot be won.
+
+Two invariants of the triangular board are used:
+
+Colour the holes with three colours, (row + column) % 3. Any three holes in
+a line have different colours, so every jump takes one peg off each of two
+colours and puts one on the third: the parity of every colour's peg count
+flips together. Comparing those parities with the single peg left at the
+end tells which colour (and so which holes) the game can finish on.
+
+A pagoda function gives each hole a weight such that no jump can raise the
+total weight of the pegs: for every jump, the weights of the hole jumped
+from and the hole jumped over add up to at least the weight of the hole
+landed in. So once the pegs weigh less than every hole the game may finish
+in, it cannot be won.
+
+The simplest pagodas are closed sets of holes, weighing one inside and
+nothing outside: every jump that lands in the set starts in it or jumps
+over a peg in it. Once such a set is empty of pegs it stays empty, so the
+game cannot finish in it. The sets are built by closure from each single
+hole. The four sets of holes whose row and column have the same parities
+(the usual resource counts) are among them.
+
+Weighted pagodas catch positions that closed sets miss. Those here are the
+heaviest pagodas that stay below a cap: Fibonacci numbers that fall off
+with distance from a hole, F(k - d), optionally with one colour held at
+zero. The heaviest pagoda below any cap is well defined, since the larger
+of two pagodas, hole by hole, is itself a pagoda; it is found by lowering
+the weight of each landing hole to that of the two holes jumping into it
+until no jump breaks the rule.
+'''
+
+import argparse
+
+import board
+import stats
+import topology
+import transposition
+
+_CLASSES = {}
+_CLOSED_SETS = {}
+_PAGODAS = {}
+FIBONACCI = [0, 1]
+while len(FIBONACCI) < 64:
+    FIBONACCI.append(FIBONACCI[-1] + FIBONACCI[-2])
+
+
+def colour_classes(number_of_rows):
+    '''
+    Returns the three masks of holes of each colour, (row + column) % 3.
+    '''
+    try:
+        return _CLASSES[number_of_rows]
+    except KeyError:
+        pass
+    masks = [0, 0, 0]
+    for row in xrange(number_of_rows):
+        for column in xrange(row + 1):
+            masks[(row + column) % 3] |= board.hole_bit(row, column)
+    _CLASSES[number_of_rows] = tuple(masks)
+    return _CLASSES[number_of_rows]
+
+
+def finishes(state, number_of_rows):
+    '''
+    Returns the mask of holes that the last peg could be left in, starting
+    from 'state', as far as the colour parities tell.
+    '''
+    classes = colour_classes(number_of_rows)
+    parities = [bin(state & mask).count('1') & 1 for mask in classes]
+    result = 0
+    for colour, mask in enumerate(classes):
+        alone = [int(other == colour) for other in xrange(3)]
+        if parities == alone or parities == [1 - bit for bit in alone]:
+            result |= mask
+    return result
+
+
+def _closure(jumps, seed, grow):
+    holes = set([seed])
+    changed = True
+    while changed:
+        changed = False
+        for source, middle, target in jumps:
+            if target in holes and source not in holes and middle not in holes:
+                holes.add(source if grow == 'source' else middle)
+                changed = True
+    return holes
+
+
+def jump_holes(number_of_rows):
+    '''
+    Returns the (source, middle, target) hole numbers of every jump.
+    '''
+    return [(board.hole_index(*move[:2]),
+             board.hole_index(*board.middle_peg(*move)),
+             board.hole_index(*move[2:]))
+            for _, _, move in board.jump_table(number_of_rows)]
+
+
+def closed_sets(number_of_rows):
+    '''
+    Returns masks of sets of holes that a peg can only enter by jumping
+    from, or over, a peg already in the set. Each is the closure of a single
+    hole, growing the set by adding the source (or the middle) of any jump
+    that would otherwise break the rule. Sets covering the whole board are
+    left out, as they never become empty.
+    '''
+    try:
+        return _CLOSED_SETS[number_of_rows]
+    except KeyError:
+        pass
+    jumps = jump_holes(number_of_rows)
+    size = number_of_rows * (number_of_rows + 1) // 2
+    masks = set()
+    for seed in xrange(size):
+        for grow in ('source', 'middle'):
+            holes = _closure(jumps, seed, grow)
+            if len(holes) < size:
+                masks.add(sum(1 << hole for hole in holes))
+    _CLOSED_SETS[number_of_rows] = tuple(sorted(masks))
+    return _CLOSED_SETS[number_of_rows]
+
+
+def distance(first, second):
+    '''
+    Returns the number of steps between two (row, column) holes, moving
+    along the lines of the board.
+    '''
+    rows = first[0] - second[0]
+    columns = first[1] - second[1]
+    if rows * columns >= 0:
+        return max(abs(rows), abs(columns))
+    return abs(rows) + abs(columns)
+
+
+def is_pagoda(weights, jumps):
+    '''
+    Returns True if no jump among 'jumps' (see jump_holes) can raise the
+    total of 'weights' (one per hole) over the pegs.
+    '''
+    return all(weights[source] + weights[middle] >= weights[target]
+               for source, middle, target in jumps)
+
+
+def heaviest_pagoda(cap, jumps):
+    '''
+    Returns the heaviest pagoda whose weights are no more than those of
+    'cap', hole by hole.
+    '''
+    weights = list(cap)
+    changed = True
+    while changed:
+        changed = False
+        for source, middle, target in jumps:
+            if weights[source] + weights[middle] < weights[target]:
+                weights[target] = weights[source] + weights[middle]
+                changed = True
+    return tuple(weights)
+
+
+def pagodas(number_of_rows):
+    '''
+    Returns the weighted pagodas of the board, each a tuple of weights by
+    hole number: the heaviest below Fibonacci numbers falling off with
+    distance from each hole, over every distance at which they reach zero,
+    with all holes counted or one colour held at zero. Those that are only
+    closed sets, weighing the same in every hole that weighs anything, are
+    left out.
+    '''
+    try:
+        return _PAGODAS[number_of_rows]
+    except KeyError:
+        pass
+    jumps = jump_holes(number_of_rows)
+    holes = [(row, column) for row in xrange(number_of_rows)
+             for column in xrange(row + 1)]
+    result = set()
+    for centre in holes:
+        for reach in xrange(2, 2 * number_of_rows + 1):
+            for colour in (None, 0, 1, 2):
+                cap = [0 if (row + column) % 3 == colour else
+                       FIBONACCI[max(reach - distance((row, column), centre),
+                                     0)]
+                       for row, column in holes]
+                weights = heaviest_pagoda(cap, jumps)
+                if len(set(weights) - set([0])) > 1:
+                    result.add(weights)
+    _PAGODAS[number_of_rows] = tuple(sorted(result))
+    return _PAGODAS[number_of_rows]
+
+
+def weight_tables(weights):
+    '''
+    Returns lookup tables, one per byte of a state, giving the total of
+    'weights' over the pegs in that byte.
+    '''
+    tables = []
+    for offset in xrange(0, len(weights), 8):
+        chunk = weights[offset:offset + 8]
+        tables.append([sum(weight for bit, weight in enumerate(chunk)
+                           if byte >> bit & 1)
+                       for byte in xrange(256)])
+    return tables
+
+
+def _undominated(pagodas):
+    '''
+    Drops the (weights, need) pairs that cut off no position another does
+    not: those whose weights, over their need, are nowhere lighter than
+    another's.
+    '''
+    result = []
+    for index, (weights, need) in enumerate(pagodas):
+        for other, (heavier, other_need) in enumerate(pagodas):
+            scaled = [(light * need, heavy * other_need)
+                      for light, heavy in zip(heavier, weights)]
+            if (other != index and all(light <= heavy
+                                       for light, heavy in scaled) and
+                    (other < index or any(light < heavy
+                                          for light, heavy in scaled))):
+                break
+        else:
+            result.append((weights, need))
+    return result
+
+
+class Pruner(object):
+    '''
+    Pass one to Board.iter_solutions (or auto_play_move) as 'prune' to skip
+    positions from which the game cannot be won. It only works out the
+    invariants of the triangle of 'number_of_rows' rows, its 'layout', and
+    a search on any other board refuses it. 'checked' and 'pruned' count
+    the positions looked at and cut off, and 'weighed' those of them cut
+    off by a weighted pagoda. If 'weighted' is False only the colours and
+    closed sets are used.
+    '''
+
+    def __init__(self, number_of_rows, weighted=True):
+        self.number_of_rows = number_of_rows
+        self.layout = topology.triangle(number_of_rows)
+        self.weighted = weighted
+        self.goals = 0
+        self.sets = ()
+        self.weights = ()
+        self.checked = 0
+        self.pruned = 0
+        self.weighed = 0
+
+    def start(self, state, target=None):
+        '''
+        Called once when a search begins from 'state', looking to leave the
+        last peg in 'target' or, if that is None, anywhere.
+        '''
+        self.goals = finishes(state, self.number_of_rows)
+        if target is not None:
+            self.goals &= board.hole_bit(*target)
+        self.sets = tuple(mask for mask in closed_sets(self.number_of_rows)
+                          if mask & self.goals)
+        self.weights = []
+        if not self.weighted or not self.goals:
+            return
+        goals = [hole for hole in xrange(self.goals.bit_length())
+                 if self.goals >> hole & 1]
+        useful = []
+        for weights in pagodas(self.number_of_rows):
+            # A pagoda can only cut off more than its closed set of
+            # weighted holes if every goal outweighs its lightest hole.
+            need = min(weights[hole] for hole in goals)
+            if need > min(weight for weight in weights if weight):
+                useful.append((weights, need))
+        self.weights = [(weight_tables(weights), need)
+                        for weights, need in _undominated(useful)]
+
+    def cannot_win(self, state):
+        '''
+        Returns True if the game cannot be won from 'state', which must have
+        been reached from the state given to start().
+        '''
+        self.checked += 1
+        goals = self.goals
+        for mask in self.sets:
+            if not state & mask:
+                goals &= ~mask
+        if not goals:
+            self.pruned += 1
+            return True
+        for tables, need in self.weights:
+            total = 0
+            remaining = state
+            for table in tables:
+                total += table[remaining & 0xff]
+                remaining >>= 8
+            if total < need:
+                self.pruned += 1
+                self.weighed += 1
+                return True
+        return False
+
+    def __str__(self):
+        return '%d positions pruned of %d checked, %d by weight' % (
+            self.pruned, self.checked, self.weighed)
+
+
+def compare(number_of_rows, start, target=None, timeout=None):
+    '''
+    Searches for a win from the board with the peg at 'start' removed, once
+    without pruning and once with it. Returns a list of (stats, pruner,
+    solution) triples; the pruner is None for the first search and the
+    solution is None if there is none or the search ran out of time.
+    '''
+    def check_time(search):
+        ''' Abandons the search once it has had its time '''
+        if timeout and search.elapsed() > timeout:
+            raise stats.TimeoutException
+    results = []
+    for pruner in (None, Pruner(number_of_rows)):
+        test = board.Board(number_of_rows)
+        test.reset()
+        test.remove_peg(*start)
+        search = stats.SolverStats(progress=check_time, interval=1000)
+        try:
+            solution = test.auto_play_move(
+                table=transposition.TranspositionTable(), stats=search,
+                target=target, prune=pruner)
+        except stats.TimeoutException:
+            solution = None
+        results.append((search, pruner, solution))
+    return results
+
+
+def main(argv=None):
+    '''
+    Reports how many positions pruning saves when solving each opening of a
+    board, optionally for a given finishing hole.
+    '''
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('rows', type=int, help='board size')
+    parser.add_argument('--target', type=int, nargs=2,
+                        metavar=('ROW', 'COLUMN'),
+                        help='hole the last peg must be left in')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='give up on a search after this many seconds')
+    args = parser.parse_args(argv)
+    for row in xrange(args.rows):
+        for column in xrange(row + 1):
+            (plain, _, _), (pruned, pruner, solution) = compare(
+                args.rows, (row, column), args.target, args.timeout)
+            print '%d,%d: %s, %d nodes %.3f s -> %d nodes %.3f s (%s)' % (
+                row, column, 'wins' if solution else 'no win found',
+                plain.nodes, plain.elapsed(), pruned.nodes, pruned.elapsed(),
+                pruner)
+
+
+if __name__ == '__main__':
+    main()
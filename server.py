@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+'''
+Serves peg-jump to many players at once over TCP:
+
+    % ./server.py --port 7070
+    % telnet localhost 7070
+
+Each connection gets a Game of its own, with the same prompts and commands
+as the command line. Everything runs in one asyncore event loop, so no
+player waits on another's input. Connections that send nothing for a while
+are closed, and once the server is full new connections are turned away.
+
+A hint search would hold up every other player for as long as it runs, so
+the server looks hints up in a shared tablebase instead (see tablebase.py):
+
+    % ./tablebase.py 5 five.tb
+    % ./server.py --tablebase five.tb
+
+Positions the tablebase does not cover, or every position if there is no
+tablebase, get at most --hint-seconds of search: none by default, which
+still suggests a peg to remove at the start but otherwise has no hint.
+'''
+
+import argparse
+import asynchat
+import asyncore
+import socket
+from timeit import default_timer
+
+import game
+import tablebase
+
+IDLE_SECONDS = 300
+MAX_SESSIONS = 10000
+MAX_LINE = 1024
+
+
+class LineInput(object):
+    '''
+    Stands in for a Game's stdin, holding the one line it is to read next.
+    '''
+
+    def __init__(self):
+        self.line = ''
+
+    def readline(self):
+        ''' Returns the line, leaving nothing to read after it '''
+        line, self.line = self.line, ''
+        return line
+
+
+class Output(object):
+    '''
+    Stands in for a Game's stdout, collecting what it writes.
+    '''
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        ''' Keeps 'text' to be sent later '''
+        self.parts.append(text)
+
+    def take(self):
+        ''' Returns everything written since the last call '''
+        text = ''.join(self.parts)
+        self.parts = []
+        return text
+
+
+class Session(object):
+    '''
+    Plays one Game a line at a time instead of reading from a file. start()
+    returns the welcome and the first prompt; feed() takes a line from the
+    player and returns the response, ending with the next prompt.
+    'finished' is True once the game is over or the player has quit.
+    Hints come from 'tablebase', if given, or else from a search of at most
+    'hint_seconds'.
+    '''
+
+    def __init__(self, hint_seconds=0.05, tablebase=None):
+        self.input = LineInput()
+        self.output = Output()
+        self.game = game.Game(stdin=self.input, stdout=self.output,
+                              hint_seconds=hint_seconds, tablebase=tablebase)
+        self.source = None
+        self.finished = False
+
+    def start(self):
+        '''
+        Welcomes the player and asks for the first peg to remove.
+        '''
+        self.game.welcome()
+        self._prompt()
+        return self.output.take()
+
+    def feed(self, line):
+        '''
+        Handles one line from the player, as Game.make_move would.
+        '''
+        game_board = self.game.board
+        stdout = self.output
+        self.input.line = line
+        try:
+            if game_board.size() == game_board.peg_count():
+                position = self.game.read_peg_position(True)
+                if position:
+                    game_board.remove_peg(*position)
+            elif self.source is None:
+                self.source = position = self.game.read_peg_position(True)
+                if position:
+                    self._prompt()
+                    return stdout.take()
+            else:
+                source, self.source = self.source, None
+                position = self.game.read_peg_position(False)
+                if position:
+                    game_board.move(*(source + position))
+            if not position:
+                print >> stdout, 'Please try again...'
+        except game.QuitException:
+            print >> stdout, 'Goodbye.'
+            self.finished = True
+            return stdout.take()
+        except game.HintException:
+            self.source = None
+            self.game.show_hint()
+        except Exception, ex:
+            # Game raises a plain Exception for a peg or hole in the wrong
+            # place. The command line stops there, but a server should
+            # not drop a player for a slip.
+            self.source = None
+            print >> stdout, ex
+        print >> stdout, game_board
+        self._prompt()
+        return stdout.take()
+
+    def _prompt(self):
+        game_board = self.game.board
+        if self.game.is_over():
+            self.game.show_result()
+            self.finished = True
+        elif game_board.size() == game_board.peg_count():
+            print >> self.output, self.game.REMOVE_PROMPT,
+        elif self.source is None:
+            print >> self.output, self.game.DEFAULT_PROMPT,
+        else:
+            print >> self.output, self.game.TARGET_PROMPT,
+
+
+class Channel(asynchat.async_chat):
+    '''
+    Connects a Session to a player's socket.
+    '''
+
+    def __init__(self, sock, server):
+        asynchat.async_chat.__init__(self, sock, map=server.sockets)
+        self.server = server
+        self.session = Session(server.hint_seconds, server.tablebase)
+        self.incoming = []
+        self.incoming_size = 0
+        self.last_active = default_timer()
+        self.set_terminator('\n')
+        self.push(self.session.start())
+
+    def collect_incoming_data(self, data):
+        self.incoming_size += len(data)
+        if self.incoming_size <= MAX_LINE:
+            self.incoming.append(data)
+
+    def found_terminator(self):
+        if self.incoming_size > MAX_LINE:
+            self.incoming = []
+        line = ''.join(self.incoming) + '\n'
+        self.incoming = []
+        self.incoming_size = 0
+        self.last_active = default_timer()
+        if self.session.finished:
+            return
+        self.push(self.session.feed(line))
+        if self.session.finished:
+            self.close_when_done()
+
+    def time_out(self):
+        '''
+        Says goodbye, if the socket will take it, and closes the connection.
+        '''
+        try:
+            self.socket.send('\nTimed out. Goodbye.\n')
+        except socket.error:
+            pass
+        self.close()
+
+    def close(self):
+        self.server.sessions.discard(self)
+        asynchat.async_chat.close(self)
+
+
+class GameServer(asyncore.dispatcher):
+    '''
+    Listens on (host, port) and plays a Session with each connection, at
+    most 'max_sessions' at a time. Sessions idle for 'idle_seconds' are
+    closed. 'served', 'refused' and 'expired' count the connections
+    accepted, turned away and timed out. Pass port 0 to listen on any free
+    port; 'address' is where the server is listening.
+
+    Every session looks its hints up in the shared 'tablebase', if one is
+    given. A hint the tablebase cannot give is searched for, for no more
+    than 'hint_seconds', in the event loop, holding up every other session
+    while it runs; by default there is no search.
+    '''
+
+    def __init__(self, host='localhost', port=7070, max_sessions=MAX_SESSIONS,
+                 idle_seconds=IDLE_SECONDS, hint_seconds=0.0,
+                 tablebase=None):
+        self.sockets = {}
+        asyncore.dispatcher.__init__(self, map=self.sockets)
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.hint_seconds = hint_seconds
+        self.tablebase = tablebase
+        self.sessions = set()
+        self.served = self.refused = self.expired = 0
+        self.running = False
+        self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.set_reuse_addr()
+        self.bind((host, port))
+        self.listen(socket.SOMAXCONN)
+        self.address = self.socket.getsockname()
+
+    def handle_accept(self):
+        pair = self.accept()
+        if pair is None:
+            return
+        sock, _ = pair
+        if len(self.sessions) >= self.max_sessions:
+            self.refused += 1
+            try:
+                sock.send('Sorry, the server is full. Please try later.\n')
+            except socket.error:
+                pass
+            sock.close()
+            return
+        self.served += 1
+        self.sessions.add(Channel(sock, self))
+
+    def expire_idle(self):
+        '''
+        Closes every session that has been idle for too long.
+        '''
+        now = default_timer()
+        for channel in list(self.sessions):
+            if now - channel.last_active > self.idle_seconds:
+                self.expired += 1
+                channel.time_out()
+
+    def serve(self, poll_seconds=0.5):
+        '''
+        Runs the event loop until stop() is called, then closes every
+        connection.
+        '''
+        self.running = True
+        check_seconds = min(1.0, self.idle_seconds / 4.0)
+        checked = default_timer()
+        try:
+            while self.running:
+                asyncore.loop(timeout=min(poll_seconds, check_seconds),
+                              use_poll=True, map=self.sockets, count=1)
+                if default_timer() - checked >= check_seconds:
+                    self.expire_idle()
+                    checked = default_timer()
+        finally:
+            asyncore.close_all(self.sockets)
+
+    def stop(self):
+        '''
+        Asks serve() to return; it may be called from another thread.
+        '''
+        self.running = False
+
+    def __str__(self):
+        return '%d sessions, %d served, %d refused, %d timed out' % (
+            len(self.sessions), self.served, self.refused, self.expired)
+
+
+def main(argv=None):
+    '''
+    Parses the command line and serves games until interrupted.
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='localhost',
+                        help='address to listen on')
+    parser.add_argument('--port', type=int, default=7070,
+                        help='port to listen on')
+    parser.add_argument('--max-sessions', type=int, default=MAX_SESSIONS,
+                        help='most games to host at once')
+    parser.add_argument('--idle', type=float, default=IDLE_SECONDS,
+                        help='close sessions idle for this many seconds')
+    parser.add_argument('--tablebase',
+                        help='tablebase file to look hints up in')
+    parser.add_argument('--hint-seconds', type=float, default=0.0,
+                        help='longest to search for a hint the tablebase '
+                        'cannot give; every other player waits meanwhile')
+    args = parser.parse_args(argv)
+    server = GameServer(args.host, args.port, args.max_sessions, args.idle,
+                        args.hint_seconds,
+                        args.tablebase and tablebase.Tablebase(args.tablebase))
+    print 'Serving peg-jump on %s:%d' % server.address
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    print server
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+'''
+Contains the SolverStats class
+'''
+
+from timeit import default_timer
+
+
+class TimeoutException(Exception):
+    '''A search ran for longer than it was allowed'''
+    pass
+
+
+class SolverStats(object):
+    '''
+    Records what a search is doing. Pass one to Board.iter_solutions (or
+    auto_play_move) as 'stats'; without one, the search does no bookkeeping.
+
+    Counts nodes expanded, moves generated, undos and the deepest stack
+    reached, and the wall time spent at each peg count. If 'progress' is
+    given it is called with this object every 'interval' nodes; it may
+    raise TimeoutException to abandon the search.
+    '''
+
+    def __init__(self, progress=None, interval=100000):
+        self.progress = progress
+        self.interval = interval
+        self.nodes = 0
+        self.moves = 0
+        self.undos = 0
+        self.max_depth = 0
+        self.seconds = {}
+        self.started = None
+        self.finished = None
+        self.last = None
+        self.current = None
+
+    def start(self):
+        '''
+        Called once when the search begins.
+        '''
+        self.started = self.last = default_timer()
+        self.finished = None
+
+    def expanded(self, depth, peg_count, moves):
+        '''
+        Called each time the search generates the 'moves' from a position
+        with 'peg_count' pegs, 'depth' moves below where it started.
+        '''
+        now = default_timer()
+        if self.current is not None:
+            self.seconds[self.current] = (self.seconds.get(self.current, 0) +
+                                          now - self.last)
+        self.last = now
+        self.current = peg_count
+        self.nodes += 1
+        self.moves += moves
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.progress and not self.nodes % self.interval:
+            self.progress(self)
+
+    def undone(self):
+        '''
+        Called each time the search takes back a move.
+        '''
+        self.undos += 1
+
+    def finish(self):
+        '''
+        Called when the search stops, whether or not it found a solution.
+        '''
+        self.finished = default_timer()
+        if self.current is not None:
+            self.seconds[self.current] = (self.seconds.get(self.current, 0) +
+                                          self.finished - self.last)
+            self.current = None
+
+    def elapsed(self):
+        '''
+        Returns the wall time since the search began, in seconds.
+        '''
+        if self.started is None:
+            return 0.0
+        return (self.finished or default_timer()) - self.started
+
+    def branching_factor(self):
+        '''
+        Returns the average number of moves generated per node expanded.
+        '''
+        return self.nodes and float(self.moves) / self.nodes
+
+    def __str__(self):
+        lines = ['%d nodes, %d moves, %d undos, max depth %d' % (
+                     self.nodes, self.moves, self.undos, self.max_depth),
+                 'branching factor %.2f, %.3f s' % (
+                     self.branching_factor(), self.elapsed())]
+        for peg_count in sorted(self.seconds, reverse=True):
+            lines.append('%3d pegs: %.3f s' % (peg_count,
+                                               self.seconds[peg_count]))
+        return '\n'.join(lines)
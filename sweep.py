@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+'''
+Solves every distinct opening for a range of board sizes, writing one line
+of JSON per result as soon as it is known:
+
+    % ./sweep.py 4 7 > results.jsonl
+
+Each line gives the rows, the start hole, the finish hole (or null for
+"anywhere"), whether the game can be won, the first solution found, the
+number of nodes searched, the time taken and whether the search ran out of
+time. Openings are solved concurrently across a pool of processes, so lines
+arrive in the order the searches finish.
+
+A sweep that was interrupted can carry on where it left off:
+
+    % ./sweep.py 4 7 --resume results.jsonl >> results.jsonl
+'''
+
+import argparse
+import json
+import sys
+from multiprocessing import Pool
+
+import board
+import stats
+import symmetry
+import transposition
+
+
+def jobs(first_rows, last_rows, finishes=False):
+    '''
+    Returns a (rows, start, finish) tuple for each search in the sweep: every
+    distinct start hole for each board size, and, if 'finishes' is True,
+    every finish hole for each of those.
+    '''
+    result = []
+    for number_of_rows in xrange(first_rows, last_rows + 1):
+        holes = [(row, column) for row in xrange(number_of_rows)
+                 for column in xrange(row + 1)]
+        for start in symmetry.distinct_holes(number_of_rows):
+            if finishes:
+                result.extend((number_of_rows, start, finish)
+                              for finish in holes)
+            else:
+                result.append((number_of_rows, start, None))
+    return result
+
+
+def _key(number_of_rows, start, finish):
+    return number_of_rows, tuple(start), finish and tuple(finish)
+
+
+def finished_jobs(lines):
+    '''
+    Returns the set of job keys already present in lines of earlier output.
+    Searches that ran out of time are left out, so that they are tried
+    again.
+    '''
+    done = set()
+    for line in lines:
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        if not result.get('timed_out'):
+            done.add(_key(result['rows'], result['start'],
+                          result['finish']))
+    return done
+
+
+def solve_job(job):
+    '''
+    Runs one (rows, start, finish, timeout) search and returns its result
+    as a dictionary.
+    '''
+    number_of_rows, start, finish, timeout = job
+    test = board.Board(number_of_rows)
+    test.reset()
+    test.remove_peg(*start)
+
+    def check_time(search):
+        ''' Abandons the search once it has had its time '''
+        if timeout and search.elapsed() > timeout:
+            raise stats.TimeoutException
+    search = stats.SolverStats(progress=check_time, interval=1000)
+    timed_out = False
+    try:
+        solution = test.auto_play_move(table=transposition.TranspositionTable(),
+                                       stats=search, target=finish)
+    except stats.TimeoutException:
+        solution = None
+        timed_out = True
+    return {
+        'rows': number_of_rows,
+        'start': start,
+        'finish': finish,
+        'solvable': None if timed_out else solution is not None,
+        'solution': solution and list(solution),
+        'nodes': search.nodes,
+        'seconds': round(search.elapsed(), 6),
+        'timed_out': timed_out,
+    }
+
+
+def sweep(todo, processes=None, timeout=None, output=sys.stdout):
+    '''
+    Solves each (rows, start, finish) job in 'todo' across a pool of
+    processes, writing each result to 'output' as a line of JSON as soon as
+    it is known.
+    '''
+    pool = Pool(processes)
+    try:
+        for result in pool.imap_unordered(
+                solve_job, [job + (timeout,) for job in todo]):
+            output.write(json.dumps(result, sort_keys=True) + '\n')
+            output.flush()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(argv=None):
+    '''
+    Parses the command line and runs the sweep.
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('first_rows', type=int, help='smallest board size')
+    parser.add_argument('last_rows', type=int, nargs='?',
+                        help='largest board size (default: first_rows)')
+    parser.add_argument('--finishes', action='store_true',
+                        help='also solve for every finish hole')
+    parser.add_argument('--processes', type=int,
+                        help='number of processes (default: one per CPU)')
+    parser.add_argument('--timeout', type=float,
+                        help='give up on a search after this many seconds')
+    parser.add_argument('--resume', metavar='FILE',
+                        help='skip the searches already in this output')
+    args = parser.parse_args(argv)
+    todo = jobs(args.first_rows, args.last_rows or args.first_rows,
+                args.finishes)
+    if args.resume:
+        with open(args.resume) as previous:
+            done = finished_jobs(previous)
+        todo = [job for job in todo if _key(*job) not in done]
+    sweep(todo, args.processes, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+'''
+Symmetries of the triangular board.
+
+A hole at (row, column) on a board of n rows is at distance row - column
+from the left edge, column from the right edge and n - 1 - row from the
+bottom edge. The six ways of permuting those three distances are the board's
+three rotations and three reflections.
+'''
+
+from itertools import permutations
+
+_PERMUTATIONS = {}
+_BYTE_TABLES = {}
+
+
+def _holes(number_of_rows):
+    return [(row, column)
+            for row in xrange(number_of_rows) for column in xrange(row + 1)]
+
+
+def symmetries(number_of_rows):
+    '''
+    Returns the six symmetries of a board of 'number_of_rows' rows. Each is a
+    tuple giving, for every hole number, the hole number it is mapped to. The
+    identity comes first.
+    '''
+    try:
+        return _PERMUTATIONS[number_of_rows]
+    except KeyError:
+        pass
+    holes = _holes(number_of_rows)
+    index = dict((hole, i) for i, hole in enumerate(holes))
+    result = []
+    for order in permutations(xrange(3)):
+        mapping = []
+        for row, column in holes:
+            edges = (row - column, column, number_of_rows - 1 - row)
+            _, right, bottom = [edges[i] for i in order]
+            mapping.append(index[(number_of_rows - 1 - bottom, right)])
+        result.append(tuple(mapping))
+    _PERMUTATIONS[number_of_rows] = tuple(result)
+    return _PERMUTATIONS[number_of_rows]
+
+
+def _byte_tables(number_of_rows):
+    try:
+        return _BYTE_TABLES[number_of_rows]
+    except KeyError:
+        pass
+    _BYTE_TABLES[number_of_rows] = byte_tables(symmetries(number_of_rows))
+    return _BYTE_TABLES[number_of_rows]
+
+
+def byte_tables(mappings):
+    '''
+    For each of 'mappings' (tuples giving the image of each hole number, as
+    symmetries returns), a list of lookup tables (one per byte of a state)
+    that map the bits of that byte to their images. Any layout of holes can
+    use these with lookup_images.
+    '''
+    result = []
+    for mapping in mappings:
+        tables = []
+        for offset in xrange(0, len(mapping), 8):
+            bits = [1 << image for image in mapping[offset:offset + 8]]
+            table = [0] * 256
+            for byte in xrange(256):
+                for bit, image in enumerate(bits):
+                    if byte >> bit & 1:
+                        table[byte] |= image
+            tables.append(table)
+        result.append(tables)
+    return result
+
+
+def transform(state, mapping):
+    '''
+    Applies one symmetry (as returned by symmetries) to a state.
+    '''
+    result = 0
+    for index, image in enumerate(mapping):
+        if state >> index & 1:
+            result |= 1 << image
+    return result
+
+
+def images(state, number_of_rows):
+    '''
+    Returns the six images of 'state' under the board's symmetries, in the
+    same order as symmetries().
+    '''
+    return lookup_images(state, _byte_tables(number_of_rows))
+
+
+def lookup_images(state, symmetry_tables):
+    '''
+    Returns the images of 'state' under each symmetry, given the symmetries'
+    byte_tables.
+    '''
+    result = []
+    for tables in symmetry_tables:
+        image = 0
+        remaining = state
+        for table in tables:
+            image |= table[remaining & 0xff]
+            remaining >>= 8
+        result.append(image)
+    return result
+
+
+def canonical(state, number_of_rows):
+    '''
+    Returns the canonical representative of 'state': the smallest of its
+    images. Two states are the same up to rotation and reflection if and
+    only if they have the same canonical representative.
+    '''
+    return min(images(state, number_of_rows))
+
+
+def distinct_holes(number_of_rows):
+    '''
+    Returns one hole from each set of holes that the symmetries map onto
+    each other, as (row, column) tuples in hole order. Removing any of the
+    other holes first gives a game that is a rotation or reflection of one
+    of these.
+    '''
+    holes = _holes(number_of_rows)
+    seen = set()
+    result = []
+    for index, hole in enumerate(holes):
+        if index not in seen:
+            result.append(hole)
+            seen.update(mapping[index]
+                        for mapping in symmetries(number_of_rows))
+    return result
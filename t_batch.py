@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+'''
+Test cases for the batch module
+'''
+
+import batch
+import bench
+import board
+import unittest
+
+
+@unittest.skipIf(batch.numpy is None, 'NumPy is not installed')
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.states = bench.sample_states(6)
+        self.boards = []
+        for state in self.states:
+            test = board.Board(6)
+            test.state = state
+            self.boards.append(test)
+
+    def test_legal_moves_agree_with_board(self):
+        legal = batch.legal_moves(self.states, 6)
+        moves = batch.moves(6)
+        for row, test in zip(legal, self.boards):
+            self.assertListEqual([moves[jump] for jump in row.nonzero()[0]],
+                                 test.get_valid_moves())
+
+    def test_legal_moves_in_chunks(self):
+        whole = batch.legal_moves(self.states, 6)
+        chunk_size = batch.CHUNK_SIZE
+        batch.CHUNK_SIZE = 7
+        try:
+            chunked = batch.legal_moves(self.states, 6)
+        finally:
+            batch.CHUNK_SIZE = chunk_size
+        self.assertEquals(chunked.shape,
+                          (len(self.states), len(board.jump_table(6))))
+        self.assertTrue((chunked == whole).all())
+        self.assertEquals(batch.legal_moves([], 6).shape,
+                          (0, len(board.jump_table(6))))
+
+    def test_move_counts_agree_with_board(self):
+        self.assertListEqual(list(batch.move_counts(self.states, 6)),
+                             [len(test.get_valid_moves())
+                              for test in self.boards])
+
+    def test_game_over(self):
+        self.assertListEqual(list(batch.game_over([0b11, 0b110], 3)),
+                             [False, True])
+
+    def test_successors_agree_with_board(self):
+        sources, jumps, states = batch.successors(self.states, 6)
+        moves = batch.moves(6)
+        for source, jump, state in zip(sources, jumps, states):
+            test = self.boards[source]
+            test.move(*moves[jump])
+            self.assertEquals(long(state), test.state)
+            test.undo()
+
+    def test_successors_of_nothing(self):
+        sources, jumps, states = batch.successors([], 5)
+        self.assertEquals((len(sources), len(jumps), len(states)), (0, 0, 0))
+
+    def test_large_boards_are_rejected(self):
+        self.assertRaises(ValueError, batch.move_counts, [0], 11)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+'''
+Test cases for the beam module
+'''
+
+import beam
+import board
+import topology
+import unittest
+
+
+class TestHeuristics(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+
+    def test_peg_count(self):
+        self.board.pegs = [(0, 0), (4, 4)]
+        self.assertEquals(beam.peg_count(self.board.state, 5), 2)
+
+    def test_isolated_pegs(self):
+        self.board.pegs = [(0, 0), (1, 0), (4, 4)]
+        self.assertEquals(beam.isolated_pegs(self.board.state, 5), 1)
+
+    def test_corners_weigh_most(self):
+        weights = beam.default_weights(5)
+        self.assertEquals(max(weights), weights[board.hole_index(4, 4)])
+        self.assertTrue(weights[board.hole_index(0, 0)] >
+                        weights[board.hole_index(4, 2)])
+
+    def test_positional_adds_weights(self):
+        weights = range(15)
+        self.board.pegs = [(0, 0), (2, 1), (4, 4)]
+        self.assertEquals(beam.positional(weights)(self.board.state, 5),
+                          0 + 4 + 14)
+
+    def test_combine(self):
+        heuristic = beam.combine((2, beam.peg_count), (3, beam.peg_count))
+        self.assertEquals(heuristic(0b111, 5), 15)
+
+
+class TestSearches(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board(7)
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+
+    def replay(self, move_list):
+        test = board.Board(7)
+        test.reset()
+        test.remove_peg(*move_list[0])
+        for move in move_list[1:]:
+            self.assertTrue(test.is_valid_move(*move))
+            test.move(*move)
+        return test
+
+    def test_beam_search_result_replays(self):
+        result = beam.beam_search(self.board, width=50)
+        test = self.replay(result.move_list)
+        self.assertEquals(test.state, result.state)
+        self.assertEquals(test.peg_count(), result.pegs)
+        self.assertTrue(result.pegs <= 2)
+
+    def test_beam_search_memory_cap(self):
+        result = beam.beam_search(self.board, width=50, max_states=100)
+        self.assertTrue(result.stored <= 150)
+        self.replay(result.move_list)
+
+    def test_best_first_search_result_replays(self):
+        result = beam.best_first_search(self.board, max_states=5000)
+        test = self.replay(result.move_list)
+        self.assertEquals(test.state, result.state)
+        self.assertTrue(result.stored <= 5000 + 30)
+
+    def test_search_leaves_board_alone(self):
+        beam.beam_search(self.board, width=10)
+        self.assertEquals(self.board.peg_count(), 27)
+
+    def test_other_layouts_are_refused(self):
+        english = board.Board(layout=topology.english())
+        english.reset()
+        english.remove_peg(3, 3)
+        self.assertRaises(ValueError, beam.beam_search, english)
+        self.assertRaises(ValueError, beam.best_first_search, english)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+'''
+Test cases for the bench module
+'''
+
+import bench
+import json
+import unittest
+
+
+class TestBench(unittest.TestCase):
+    def test_sample_states_are_repeatable(self):
+        self.assertListEqual(bench.sample_states(5), bench.sample_states(5))
+
+    def test_results_cover_every_benchmark(self):
+        results = bench.run(sizes=[4], repeat=1)['results']
+        self.assertIn('get_valid_moves/4', results)
+        self.assertIn('move_undo/4', results)
+        self.assertIn('game_over/4', results)
+        self.assertIn('__str__/4', results)
+        self.assertEquals(len([name for name in results
+                               if name.startswith('auto_play_move/4/')]), 10)
+
+    def test_results_are_json(self):
+        results = bench.run(sizes=[4], repeat=1)
+        self.assertEquals(json.loads(json.dumps(results)), results)
+
+    def test_slow_search_times_out(self):
+        self.assertEquals(bench.time_solve(7, 0, 0, timeout=0.01), None)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'results': {'a': 1.0, 'b': 1.0, 'c': 1.0, 'd': None}}
+        current = {'results': {'a': 1.05, 'b': 1.5, 'c': None, 'd': 2.0}}
+        self.assertListEqual(bench.compare(baseline, current, threshold=0.1),
+                             [('a', 1.0, 1.05, False),
+                              ('b', 1.0, 1.5, True),
+                              ('c', 1.0, None, True),
+                              ('d', None, 2.0, False)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+'''
+Test cases for the bidirectional module
+'''
+
+import bidirectional
+import board
+import pruning
+import topology
+import unittest
+
+
+class TestUnjumps(unittest.TestCase):
+    def test_unjumps_undo_jumps(self):
+        test = board.Board()
+        test.reset()
+        test.remove_peg(0, 0)
+        table = bidirectional.unjump_table(test.jumps)
+        for move in test.get_valid_moves():
+            before = test.state
+            test.move(*move)
+            self.assertTrue(before in bidirectional.unjumps(
+                set([test.state]), table))
+            test.undo()
+
+    def test_unjumps_from_a_single_peg(self):
+        test = board.Board()
+        table = bidirectional.unjump_table(test.jumps)
+        self.assertEquals(
+            bidirectional.unjumps(set([board.hole_bit(0, 0)]), table),
+            set([board.hole_bit(1, 0) | board.hole_bit(2, 0),
+                 board.hole_bit(1, 1) | board.hole_bit(2, 2)]))
+
+
+class TestPerimeter(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+
+    def test_layers_can_be_won(self):
+        perimeter = bidirectional.Perimeter(self.board, (0, 0), 100)
+        self.assertEquals(perimeter.layers[1], set([board.hole_bit(0, 0)]))
+        for peg_count, layer in sorted(perimeter.layers.items())[1:]:
+            for state in layer:
+                self.assertEquals(bin(state).count('1'), peg_count)
+                test = board.Board()
+                test.state = state
+                self.assertTrue(test.auto_play_move(target=(0, 0)))
+
+    def test_stops_at_max_states(self):
+        small = bidirectional.Perimeter(self.board, None, 100)
+        large = bidirectional.Perimeter(self.board, None, 100000)
+        self.assertTrue(small.deepest < large.deepest)
+        self.assertEquals(large.deepest, 14)
+
+    def test_pruner_for_another_layout_is_refused(self):
+        english = board.Board(layout=topology.english())
+        english.reset()
+        english.remove_peg(3, 3)
+        self.assertRaises(ValueError, bidirectional.Perimeter, english,
+                          (3, 3), 100, pruning.Pruner(english.rows))
+
+    def test_cannot_win(self):
+        perimeter = bidirectional.Perimeter(self.board, (0, 0), 100)
+        self.assertFalse(perimeter.cannot_win(board.hole_bit(0, 0)))
+        self.assertTrue(perimeter.cannot_win(board.hole_bit(4, 4)))
+        self.assertFalse(perimeter.cannot_win(self.board.state))
+
+
+class TestSolve(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+
+    def test_same_format_as_auto_play_move(self):
+        move_list = bidirectional.solve(self.board, max_states=50)
+        self.assertEquals(len(move_list), 14)
+        self.assertEquals(move_list[0], (0, 0))
+        self.assertTrue(self.board.won())
+        test = board.Board()
+        test.reset()
+        test.remove_peg(*move_list[0])
+        for move in move_list[1:]:
+            self.assertTrue(test.is_valid_move(*move))
+            test.move(*move)
+        self.assertEquals(test.move_list, move_list)
+
+    def test_target(self):
+        for max_states in 1, 100, 10000:
+            test = self.board.copy()
+            move_list = bidirectional.solve(test, (3, 0), max_states=max_states)
+            self.assertEquals(test.pegs, [(3, 0)])
+            self.assertEquals(len(move_list), 14)
+
+    def test_no_solution(self):
+        state = self.board.state
+        self.assertEquals(bidirectional.solve(self.board, (1, 0)), None)
+        self.assertEquals(self.board.state, state)
+        self.assertEquals(self.board.move_list, [(0, 0)])
+
+    def test_with_pruner(self):
+        pruner = pruning.Pruner(5)
+        bidirectional.solve(self.board, (3, 0), prune=pruner, max_states=10)
+        self.assertEquals(self.board.pegs, [(3, 0)])
+        self.assertTrue(pruner.checked > 0)
+
+    def test_english(self):
+        test = board.Board(layout=topology.english())
+        test.reset()
+        test.remove_peg(3, 3)
+        move_list = bidirectional.solve(test, (3, 3), max_states=5000)
+        self.assertEquals(len(move_list), 32)
+        self.assertEquals(test.pegs, [(3, 3)])
+
+    def test_compare(self):
+        results = bidirectional.compare(5, (0, 0), (3, 0), max_states=100)
+        self.assertEquals(len(results), 2)
+        for _, _, move_list in results:
+            self.assertEquals(move_list[0], (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
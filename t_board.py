@@ -4,7 +4,13 @@ Test cases for board.Board
 '''
 
 import board
+import checkpoint
+import stats
+import transposition
 import unittest
+from timeit import default_timer
+
+HINT_MARGIN = 0.02
 
 
 class TestBoard(unittest.TestCase):
@@ -37,6 +43,18 @@ class TestBoard(unittest.TestCase):
         self.assertTrue(self.board.game_over())
         self.assertEquals(move_list, [(4, 2, 4, 0), (4, 0, 2, 0)])
 
+    def test_iter_solutions_finds_every_solution(self):
+        self.board.pegs = [(3, 0), (4, 1), (4, 2)]
+        self.assertListEqual(list(self.board.iter_solutions()),
+                             [[(4, 2, 4, 0), (4, 0, 2, 0)]])
+
+    def test_exhausted_iter_solutions_restores_board(self):
+        self.board.pegs = [(3, 0), (4, 1), (4, 2)]
+        for _ in self.board.iter_solutions():
+            pass
+        self.assertListEqual(list(self.board.pegs), [(3, 0), (4, 1), (4, 2)])
+        self.assertListEqual(self.board.move_list, [])
+
     def test_game_won(self):
         self.board.pegs.append((0, 0))
         self.assertTrue(self.board.won())
@@ -95,6 +113,24 @@ class TestBoardAfterReset(unittest.TestCase):
     def test_no_valid_moves_on_full_board(self):
         self.assertEquals(len(self.board.get_valid_moves()), 0)
 
+    def test_hint_suggests_a_peg_to_remove(self):
+        hole, proven = self.board.hint(seconds=1.0)
+        self.assertTrue(proven)
+        self.assertIn(hole, self.board.layout.distinct_holes())
+        self.assertTrue(self.board.is_full())
+        self.board.remove_peg(*hole)
+        self.assertTrue(self.board.auto_play_move())
+
+    def test_hint_suggests_a_peg_to_remove_without_time_to_prove(self):
+        large = board.Board(20)
+        large.reset()
+        start = default_timer()
+        hole, proven = large.hint(seconds=0.05)
+        self.assertTrue(default_timer() - start < 0.05 + HINT_MARGIN)
+        self.assertIn(hole, large.layout.distinct_holes())
+        self.assertFalse(proven)
+        self.assertTrue(large.is_full())
+
 
 class TestBoardWithTopPegRemoved(unittest.TestCase):
     def setUp(self):
@@ -218,6 +254,40 @@ class TestBoardWithTopPegRemoved(unittest.TestCase):
         self.assertEquals(len(self.board.auto_play_move()), 14)
         self.assertTrue(self.board.won())
 
+    def test_can_win_full_game_in_target_hole(self):
+        self.assertEquals(len(self.board.auto_play_move(target=(4, 2))), 14)
+        self.assertListEqual(list(self.board.pegs), [(4, 2)])
+
+    def test_cannot_win_full_game_in_unreachable_hole(self):
+        self.assertEquals(self.board.auto_play_move(
+            table=transposition.TranspositionTable(), target=(2, 1)), None)
+        self.assertListEqual(self.board.move_list, [(0, 0)])
+
+    def test_hint_finds_a_winning_move(self):
+        move, proven = self.board.hint()
+        self.assertTrue(proven)
+        self.assertTrue(self.board.is_valid_move(*move))
+        self.assertListEqual(self.board.move_list, [(0, 0)])
+
+    def test_hint_keeps_to_its_time_on_a_large_board(self):
+        large = board.Board(12)
+        large.reset()
+        large.remove_peg(0, 0)
+        start = default_timer()
+        move, proven = large.hint(seconds=0.05)
+        self.assertTrue(default_timer() - start < 0.05 + HINT_MARGIN)
+        self.assertTrue(large.is_valid_move(*move))
+        self.assertFalse(proven)
+
+    def test_iter_solutions_leaves_board_won_between_solutions(self):
+        solutions = self.board.iter_solutions()
+        first = next(solutions)
+        self.assertTrue(self.board.won())
+        self.assertListEqual(self.board.move_list, first)
+        second = next(solutions)
+        self.assertEquals(len(second), 14)
+        self.assertNotEqual(first, second)
+
     def test_board_size_calculation(self):
         self.assertEquals(self.board.size(), 15)
 
@@ -226,8 +296,228 @@ class TestBoardWithTopPegRemoved(unittest.TestCase):
         self.assertEquals(len(self.board.pegs), 15)
         self.assertListEqual(self.board.move_list, [])
 
+    def test_state_has_one_bit_per_peg(self):
+        self.assertEquals(self.board.state, (1 << 15) - 2)
+
+    def test_move_and_undo_restore_state(self):
+        state = self.board.state
+        self.board.move(2, 2, 0, 0)
+        self.assertEquals(self.board.state,
+                          state ^ board.jump_mask(2, 2, 0, 0))
+        self.board.undo()
+        self.assertEquals(self.board.state, state)
+
+    def test_pegs_view_is_in_hole_order(self):
+        self.assertListEqual(list(self.board.pegs)[:3],
+                             [(1, 0), (1, 1), (2, 0)])
+
+    def test_removing_absent_peg_from_view_fails(self):
+        self.assertRaises(ValueError, self.board.pegs.remove, (0, 0))
+
+
+class TestIncrementalMoves(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board(6, validate=True)
+        self.board.reset()
+        self.board.remove_peg(2, 1)
+
+    def test_search_keeps_moves_in_step(self):
+        self.assertEquals(len(self.board.auto_play_move()), 20)
+        self.board.check_moves()
+
+    def test_undo_keeps_moves_in_step(self):
+        moves = self.board.get_valid_moves()
+        self.board.move(*moves[0])
+        self.board.undo()
+        self.assertListEqual(self.board.get_valid_moves(), moves)
+
+    def test_setting_pegs_rescans_moves(self):
+        self.board.pegs = [(3, 0), (4, 1), (4, 2)]
+        self.assertListEqual(self.board.get_valid_moves(),
+                             [(3, 0, 5, 2), (4, 1, 4, 3), (4, 2, 4, 0)])
+
+    def test_check_moves_detects_drift(self):
+        self.board._valid.clear()
+        self.assertRaises(Exception, self.board.check_moves)
+
+
+class TestHoleIndex(unittest.TestCase):
+    def test_holes_are_numbered_row_by_row(self):
+        self.assertEquals(board.hole_index(0, 0), 0)
+        self.assertEquals(board.hole_index(2, 1), 4)
+        self.assertEquals(board.hole_index(4, 4), 14)
+
+    def test_hole_position_is_inverse_of_hole_index(self):
+        for index in xrange(55):
+            self.assertEquals(board.hole_index(*board.hole_position(index)),
+                              index)
+
+
+class TestJumpTable(unittest.TestCase):
+    def test_jump_count_for_five_rows(self):
+        self.assertEquals(len(board.jump_table(5)), 36)
+
+    def test_table_is_shared_between_boards(self):
+        self.assertIs(board.Board(6).jumps, board.Board(6).jumps)
+
+    def test_table_holds_every_valid_move(self):
+        test = board.Board(6)
+        moves = [move for _, _, move in test.jumps]
+        for row in xrange(6):
+            for column in xrange(row + 1):
+                test.pegs = [(r, c) for r in xrange(6) for c in xrange(r + 1)]
+                test.pegs.remove((row, column))
+                expected = [move for move in moves
+                            if test.is_valid_move(*move)]
+                self.assertListEqual(test.get_valid_moves(), expected)
+
+
+class TestZobrist(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board(symmetric_hash=True)
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+
+    def fresh(self, state):
+        test = board.Board()
+        test.state = state
+        return test
+
+    def test_moves_keep_the_hash_up_to_date(self):
+        for move in [(2, 0, 0, 0), (4, 0, 2, 0), (3, 2, 3, 0)]:
+            self.board.move(*move)
+            self.assertEquals(self.board.zobrist,
+                              self.fresh(self.board.state).zobrist)
+        self.board.undo()
+        self.board.undo()
+        self.board.undo()
+        self.assertEquals(self.board.zobrist,
+                          self.fresh(self.board.state).zobrist)
+
+    def test_removing_a_peg_updates_the_hash(self):
+        full = board.Board()
+        full.reset()
+        self.assertNotEqual(full.zobrist, self.board.zobrist)
+        self.assertEquals(self.board.zobrist, self.fresh(0x7ffe).zobrist)
+
+    def test_hash_does_not_depend_on_move_order(self):
+        other = self.board.copy()
+        self.board.move(2, 0, 0, 0)
+        self.board.move(4, 0, 2, 0)
+        other.state = self.board.state
+        self.assertEquals(self.board.zobrist, other.zobrist)
+
+    def test_hash_is_seeded(self):
+        self.assertEquals(board.zobrist_tables(5),
+                          board.zobrist_tables(5, board.ZOBRIST_SEED))
+        self.assertNotEqual(board.zobrist_tables(5, 1)[0],
+                            board.zobrist_tables(5)[0])
+        self.assertEquals(self.fresh(0).zobrist, 0)
+
+    def test_symmetric_hash(self):
+        mirror = board.Board(symmetric_hash=True)
+        mirror.reset()
+        mirror.remove_peg(4, 4)
+        self.assertNotEqual(self.board.zobrist, mirror.zobrist)
+        self.assertEquals(self.board.symmetric_zobrist,
+                          mirror.symmetric_zobrist)
+        self.board.move(2, 0, 0, 0)
+        mirror.move(4, 2, 4, 4)
+        self.assertEquals(self.board.symmetric_zobrist,
+                          mirror.symmetric_zobrist)
+        self.assertEquals(self.board.symmetric_zobrist,
+                          self.fresh(self.board.state).symmetric_zobrist)
+
+
+class FakeOutput(object):
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TestRendering(unittest.TestCase):
+    def test_template_has_a_slot_per_hole(self):
+        self.assertEquals(board.board_template(6).count('%s'), 21)
+
+    def test_render_matches_str(self):
+        test = board.Board(10)
+        test.reset()
+        test.remove_peg(9, 4)
+        text = board.render(test.state, 10)
+        self.assertEquals(str(test), text)
+        self.assertEquals(text.count(' x '), 54)
+        self.assertTrue(text.endswith('+' + 32 * '-' + '+\n'))
+
+    def test_renderings_are_cached(self):
+        self.assertIs(board.render(0x1234, 5), board.render(0x1234, 5))
+
+    def test_cache_is_bounded(self):
+        limit = board.RENDER_CACHE_SIZE
+        board.RENDER_CACHE_SIZE = 3
+        try:
+            for state in xrange(10):
+                board.render(state, 4)
+            self.assertTrue(len(board._RENDER_CACHE) <= 3)
+        finally:
+            board.RENDER_CACHE_SIZE = limit
+
+
+class TestBoardPrinter(unittest.TestCase):
+    def setUp(self):
+        self.output = FakeOutput()
+        self.board = board.Board()
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+
+    def test_prints_like_print(self):
+        printer = board.BoardPrinter(self.output)
+        printer.show(self.board, (2, 0, 0, 0))
+        self.assertEquals(self.output.writes, [])
+        printer.flush()
+        self.assertEquals(self.output.writes,
+                          [str(self.board) + ' (2, 0, 0, 0)\n'])
+
+    def test_every(self):
+        printer = board.BoardPrinter(self.output, every=3)
+        for _ in xrange(10):
+            printer.show(self.board, None)
+        self.assertEquals((printer.shown, printer.printed), (10, 3))
+
+    def test_fps(self):
+        printer = board.BoardPrinter(self.output, fps=0.001)
+        for _ in xrange(10):
+            printer.show(self.board, None)
+        self.assertEquals(printer.printed, 1)
+
+    def test_buffer_is_written_when_full(self):
+        printer = board.BoardPrinter(self.output, buffer_size=200)
+        for _ in xrange(3):
+            printer.show(self.board, None)
+        self.assertEquals(len(self.output.writes), 1)
+
+    def test_search_flushes_at_each_solution(self):
+        printer = board.BoardPrinter(self.output)
+        self.board.auto_play_move(printer)
+        self.assertEquals(printer.shown, len(''.join(
+            self.output.writes).split('+\n')) - 1)
+        self.assertTrue(printer.shown >= 13)
+        self.assertTrue(self.output.flushes > 0)
+
 
 class TestDemo(unittest.TestCase):
+    def test_processes_refuse_options_they_would_ignore(self):
+        self.assertRaises(ValueError, board.main, False, 1, layout='english')
+        self.assertRaises(ValueError, board.main, False, 1,
+                          stats.SolverStats())
+        self.assertRaises(ValueError, board.main, False, 1,
+                          checkpoint=checkpoint.Checkpoint('unused'))
+
     @unittest.skip('''This function takes far too long for a unit test, but is
                    quite fun to watch.''')
     def test_can_win_full_game_with_any_peg_removed(self):
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+'''
+Test cases for checkpoint.Checkpoint
+'''
+
+import board
+import checkpoint
+import os
+import shutil
+import stats
+import tempfile
+import transposition
+import unittest
+
+TARGET = (2, 1)
+
+
+def crash_after(nodes):
+    ''' Returns a progress callback that stops a search after 'nodes' '''
+    def progress(search):
+        ''' Stands in for the process being killed '''
+        if search.nodes >= nodes:
+            raise stats.TimeoutException
+    return progress
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'search.ckpt')
+        self.expected, self.stats = self.solve()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def new_board(self):
+        test = board.Board(6)
+        test.reset()
+        test.remove_peg(0, 0)
+        return test
+
+    def solve(self, save=None, progress=None):
+        test = self.new_board()
+        search = stats.SolverStats(progress=progress, interval=1)
+        move_list = test.auto_play_move(
+            table=transposition.TranspositionTable(), stats=search,
+            target=TARGET, checkpoint=save)
+        return move_list, search
+
+    def crash(self, nodes, **options):
+        save = checkpoint.Checkpoint(self.path, seconds=0, check_every=100,
+                                     **options)
+        self.assertRaises(stats.TimeoutException, self.solve, save,
+                          crash_after(nodes))
+        self.assertTrue(save.saves > 0)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_uninterrupted_run_leaves_no_file(self):
+        save = checkpoint.Checkpoint(self.path, seconds=0, check_every=100)
+        move_list, _ = self.solve(save)
+        self.assertEquals(move_list, self.expected)
+        self.assertTrue(save.saves > 0)
+        self.assertFalse(save.resumed)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_gives_the_same_result(self):
+        self.crash(self.stats.nodes // 2)
+        save = checkpoint.Checkpoint(self.path)
+        move_list, search = self.solve(save)
+        self.assertTrue(save.resumed)
+        self.assertEquals(move_list, self.expected)
+        self.assertEquals(search.nodes, self.stats.nodes)
+        self.assertEquals(search.undos, self.stats.undos)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_without_table(self):
+        self.crash(self.stats.nodes // 2, save_table=False)
+        save = checkpoint.Checkpoint(self.path)
+        move_list, _ = self.solve(save)
+        self.assertTrue(save.resumed)
+        self.assertEquals(move_list, self.expected)
+
+    def test_resume_twice(self):
+        self.crash(self.stats.nodes // 3)
+        self.crash(self.stats.nodes * 2 // 3)
+        move_list, search = self.solve(checkpoint.Checkpoint(self.path))
+        self.assertEquals(move_list, self.expected)
+        self.assertEquals(search.nodes, self.stats.nodes)
+
+    def test_other_search_is_refused(self):
+        self.crash(self.stats.nodes // 2)
+        test = board.Board(6)
+        test.reset()
+        test.remove_peg(1, 0)
+        self.assertRaises(ValueError, test.auto_play_move, target=TARGET,
+                          checkpoint=checkpoint.Checkpoint(self.path))
+        test = self.new_board()
+        self.assertRaises(ValueError, test.auto_play_move, target=(3, 0),
+                          checkpoint=checkpoint.Checkpoint(self.path))
+
+    def test_saves_are_spaced_out(self):
+        save = checkpoint.Checkpoint(self.path, seconds=3600, check_every=1)
+        self.solve(save)
+        self.assertEquals(save.saves, 0)
+        save = checkpoint.Checkpoint(self.path, seconds=0, check_every=1,
+                                     overhead=1e-9)
+        self.solve(save)
+        self.assertEquals(save.saves, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
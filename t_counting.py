@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+'''
+Test cases for counting.SolutionCounter
+'''
+
+import board
+import counting
+import unittest
+
+
+class TestSolutionCounter(unittest.TestCase):
+    def setUp(self):
+        self.counter = counting.SolutionCounter()
+
+    def test_single_peg_has_one_way(self):
+        self.assertEquals(self.counter.count(1 << 7), 1)
+
+    def test_stuck_position_has_no_ways(self):
+        test = board.Board()
+        test.pegs = [(0, 0), (4, 4)]
+        self.assertEquals(self.counter.count_board(test), 0)
+
+    def test_counts_agree_with_iter_solutions(self):
+        test = board.Board()
+        test.pegs = [(3, 0), (4, 1), (4, 2), (4, 4)]
+        self.assertEquals(self.counter.count_board(test),
+                          len(list(test.iter_solutions())))
+
+    def test_five_row_openings(self):
+        counts = dict(self.counter.count_openings())
+        self.assertEquals(counts[(0, 0)], 29760)
+        self.assertEquals(counts[(1, 0)], 14880)
+        self.assertEquals(counts[(2, 0)], 85258)
+        self.assertEquals(counts[(2, 1)], 1550)
+        self.assertEquals(counts[(4, 4)], 29760)
+
+    def test_states_are_counted_once(self):
+        self.counter.count_openings()
+        self.assertEquals(self.counter.states(), 2379)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,10 @@ Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA
 '''
 
 import game
+import os
+import shutil
+import tablebase
+import tempfile
 import unittest
 
 
@@ -104,6 +108,12 @@ class TestGame(unittest.TestCase):
         self.fake_std_in.add('quit')
         self.game.make_move()
 
+    def test_hint_before_first_peg_is_removed_suggests_one(self):
+        self.fake_std_in.prime(('hint', 'quit'))
+        self.game.make_move()
+        self.assertIn('Try removing the peg at', self.fake_std_out.buffer)
+        self.assertTrue(self.game.board.is_full())
+
     def test_invalid_input_rejected_and_move_made(self):
         self.fake_std_in.prime((
             '8, 8',
@@ -227,5 +237,44 @@ class TestGammWithFirstHopMade(unittest.TestCase):
         self.fake_std_in.add('quit')
         self.game.make_move()
 
+    def test_hint_command_suggests_a_winning_move(self):
+        self.fake_std_in.prime(('hint', 'quit'))
+        self.game.make_move()
+        self.assertIn('Try moving', self.fake_std_out.buffer)
+        self.assertIn('(this wins)', self.fake_std_out.buffer)
+
+    def test_hint_does_not_change_the_board(self):
+        pegs = list(self.game.board.pegs)
+        self.fake_std_in.prime(('hint', 'quit'))
+        self.game.make_move()
+        self.assertListEqual(list(self.game.board.pegs), pegs)
+        self.assertTupleEqual(self.game.board.move_list[-1], (2, 2, 0, 0))
+
+
+class TestGameWithTablebase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'five.tb')
+        tablebase.build(5, path)
+        self.tablebase = tablebase.Tablebase(path)
+        self.fake_std_out = FakeStdOut()
+        self.fake_std_in = FakeStdIn()
+        self.game = game.Game(stdin=self.fake_std_in, stdout=self.fake_std_out,
+                              hint_seconds=0, tablebase=self.tablebase)
+        self.fake_std_in.add('0, 0')
+        self.game.make_move()
+        self.fake_std_in.prime(('2, 0', '0, 0'))
+        self.game.make_move()
+        self.fake_std_out.reset()
+
+    def tearDown(self):
+        self.tablebase.close()
+        shutil.rmtree(self.directory)
+
+    def test_hint_comes_from_the_tablebase(self):
+        self.fake_std_in.prime(('hint', 'quit'))
+        self.game.make_move()
+        self.assertIn('(this wins)', self.fake_std_out.buffer)
+
 if __name__ == '__main__':
     unittest.main()
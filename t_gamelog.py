@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+'''
+Test cases for the gamelog module
+'''
+
+import board
+import gamelog
+import os
+import shutil
+import tempfile
+import topology
+import unittest
+
+WINNING_GAME = [(0, 0), (2, 0, 0, 0), (2, 2, 2, 0), (3, 0, 1, 0),
+                (4, 1, 2, 1), (4, 4, 2, 2), (4, 3, 4, 1), (4, 0, 4, 2),
+                (0, 0, 2, 0), (1, 1, 3, 3), (4, 2, 2, 2), (3, 3, 1, 1),
+                (2, 0, 2, 2), (1, 1, 3, 3)]
+
+
+class TestEncoding(unittest.TestCase):
+    def round_trip(self, move_list, number_of_rows=5):
+        data = gamelog.encode(move_list, number_of_rows)
+        rows, decoded, end = gamelog.decode(data, 0)
+        self.assertEquals((rows, decoded, end),
+                          (number_of_rows, move_list, len(data)))
+        return data
+
+    def test_winning_game_round_trips(self):
+        data = self.round_trip(WINNING_GAME)
+        self.assertEquals(len(data), 3 + (13 * 6 + 7) // 8)
+
+    def test_short_games_round_trip(self):
+        self.round_trip([])
+        self.round_trip([(4, 4)])
+        self.round_trip([(2, 1), (4, 1, 2, 1)])
+
+    def test_large_boards_round_trip(self):
+        test = board.Board(12)
+        test.reset()
+        test.remove_peg(5, 3)
+        for _ in xrange(20):
+            test.move(*test.get_valid_moves()[-1])
+        self.round_trip(test.move_list, 12)
+
+    def test_illegal_moves_are_kept(self):
+        self.round_trip([(0, 0), (0, 0, 2, 0)])
+
+    def test_non_jumps_are_refused(self):
+        self.assertRaises(ValueError, gamelog.encode, [(0, 0), (0, 0, 1, 0)])
+        self.assertRaises(ValueError, gamelog.encode, [(5, 0)])
+
+
+class TestGameLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'games.log')
+        self.games = [WINNING_GAME, WINNING_GAME[:5],
+                      [(0, 0), (2, 0, 0, 0), (2, 0, 0, 0)], []]
+        with gamelog.GameLogWriter(self.path) as writer:
+            for move_list in self.games:
+                writer.write(move_list)
+            test = board.Board(6)
+            test.reset()
+            test.remove_peg(0, 0)
+            test.auto_play_move()
+            writer.write_board(test)
+        self.six = test.move_list
+        self.log = gamelog.GameLog(self.path)
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.directory)
+
+    def test_games_read_back(self):
+        self.assertEquals(list(self.log),
+                          [(5, move_list) for move_list in self.games] +
+                          [(6, self.six)])
+
+    def test_replay(self):
+        replays = list(self.log.replay())
+        self.assertEquals([(replay.pegs, replay.won, replay.over,
+                            replay.illegal) for replay in replays],
+                          [(1, True, True, None), (10, False, False, None),
+                           (13, False, False, 1), (15, False, False, None),
+                           (1, True, True, None)])
+
+    def test_validate(self):
+        summary = self.log.validate()
+        self.assertEquals((summary['games'], summary['won'], summary['lost'],
+                           summary['unfinished'], summary['illegal']),
+                          (5, 2, 0, 2, 1))
+        self.assertEquals(summary['pegs'], {1: 2, 10: 1, 15: 1})
+        self.assertEquals(len(summary['illegal_offsets']), 1)
+
+    def test_truncated_log_is_reported(self):
+        with open(self.path, 'rb') as source:
+            data = source.read()
+        with open(self.path, 'wb') as output:
+            output.write(data[:-1])
+        log = gamelog.GameLog(self.path)
+        try:
+            self.assertRaises(Exception, list, log.replay())
+        finally:
+            log.close()
+
+    def test_other_files_are_refused(self):
+        with open(self.path, 'wb') as output:
+            output.write('PEGTB\x01\x05\x00')
+        self.assertRaises(Exception, gamelog.GameLog, self.path)
+
+    def test_other_layouts_are_refused(self):
+        english = board.Board(layout=topology.english())
+        english.reset()
+        english.remove_peg(3, 3)
+        path = os.path.join(self.directory, 'english.log')
+        with gamelog.GameLogWriter(path) as writer:
+            self.assertRaises(ValueError, writer.write_board, english)
+            self.assertEquals(writer.games, 0)
+
+    def test_random_games_are_legal(self):
+        with gamelog.GameLogWriter(self.path) as writer:
+            for move_list in gamelog.random_games(100):
+                writer.write(move_list)
+        log = gamelog.GameLog(self.path)
+        try:
+            summary = log.validate()
+        finally:
+            log.close()
+        self.assertEquals((summary['games'], summary['illegal'],
+                           summary['unfinished']), (100, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+'''
+Test cases for the layers module
+'''
+
+import board
+import layers
+import os
+import shutil
+import tablebase
+import tempfile
+import topology
+import unittest
+
+
+class TestLayerFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'layer.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, path, states):
+        with layers.LayerWriter(path, 5, 7) as writer:
+            writer.write_all(states)
+        return writer.states
+
+    def test_round_trip(self):
+        states = range(0, 3 * layers.BLOCK_STATES, 3) + [1 << 63]
+        self.assertEquals(self.write(self.path, states), len(states))
+        self.assertEquals(list(layers.read_states(self.path)), states)
+        self.assertEquals(layers.read_header(self.path), (5, 7))
+        self.assertTrue(os.path.getsize(self.path) < len(states))
+
+    def test_empty(self):
+        self.assertEquals(self.write(self.path, []), 0)
+        self.assertEquals(list(layers.read_states(self.path)), [])
+
+    def test_truncated(self):
+        self.write(self.path, range(1000))
+        with open(self.path, 'r+b') as output:
+            output.truncate(os.path.getsize(self.path) - 1)
+        self.assertRaises(Exception, list, layers.read_states(self.path))
+
+    def test_not_a_layer_file(self):
+        with open(self.path, 'wb') as output:
+            output.write('PEGLG\x01\x00\x00')
+        self.assertRaises(Exception, layers.read_header, self.path)
+
+    def test_merge_drops_duplicates(self):
+        paths = [os.path.join(self.directory, name) for name in 'abc']
+        self.write(paths[0], [1, 4, 9])
+        self.write(paths[1], [2, 4, 8, 9])
+        self.write(paths[2], [])
+        self.assertEquals(layers.merge(paths, self.path, 5, 7), 5)
+        self.assertEquals(list(layers.read_states(self.path)),
+                          [1, 2, 4, 8, 9])
+
+
+class TestSuccessors(unittest.TestCase):
+    def test_matches_board(self):
+        successors = layers.Successors(topology.triangle(5))
+        test = board.Board()
+        full = [(row, column) for row in xrange(5) for column in xrange(row + 1)]
+        for pegs in ([(0, 0), (1, 0), (1, 1), (2, 1), (3, 2), (4, 4)],
+                     [hole for hole in full if hole != (2, 1)],
+                     [(2, 0), (2, 1)]):
+            test.pegs = pegs
+            expected = []
+            for move in test.get_valid_moves():
+                test.move(*move)
+                expected.append(test.state)
+                test.undo()
+            self.assertEquals(sorted(successors(test.state)), sorted(expected))
+
+
+class TestEnumerateLayers(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.expected = tablebase.reachable_layers(5)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check(self, reports):
+        self.assertEquals([report.peg_count for report in reports],
+                          range(14, 0, -1))
+        for report in reports:
+            self.assertEquals(
+                list(layers.read_states(layers.layer_path(
+                    self.directory, report.peg_count))),
+                sorted(self.expected[report.peg_count]))
+            self.assertEquals(report.states,
+                              len(self.expected[report.peg_count]))
+
+    def test_in_memory(self):
+        found = []
+        reports = layers.enumerate_layers(5, self.directory,
+                                          report=found.append)
+        self.assertEquals(found, reports)
+        self.assertEquals(sum(report.runs for report in reports), 0)
+        self.check(reports)
+
+    def test_spilled_to_runs(self):
+        reports = layers.enumerate_layers(5, self.directory, max_states=20,
+                                          fan_in=3)
+        self.assertTrue(max(report.runs for report in reports) > 9)
+        self.check(reports)
+        self.assertEquals(
+            [name for name in os.listdir(self.directory)
+             if name.endswith('.tmp')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
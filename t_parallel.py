@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+'''
+Test cases for the parallel module
+'''
+
+import board
+import parallel
+import unittest
+
+
+class TestWorkUnits(unittest.TestCase):
+    def test_no_depth_gives_one_unit_per_hole(self):
+        self.assertListEqual(parallel.work_units(5, depth=0),
+                             [[(0, 0)], [(1, 0)], [(2, 0)], [(2, 1)]])
+
+    def test_units_start_with_opening_moves(self):
+        self.assertListEqual(parallel.work_units(5, holes=[(0, 0)], depth=1),
+                             [[(0, 0), (2, 0, 0, 0)], [(0, 0), (2, 2, 0, 0)]])
+
+
+class TestParallelSolve(unittest.TestCase):
+    def test_solution_replays_to_a_win(self):
+        move_list = parallel.solve(5, processes=2)
+        test = board.Board()
+        test.reset()
+        test.remove_peg(*move_list[0])
+        for move in move_list[1:]:
+            self.assertTrue(test.is_valid_move(*move))
+            test.move(*move)
+        self.assertTrue(test.won())
+
+    def test_count_merges_units(self):
+        self.assertEquals(parallel.count(5, processes=2),
+                          {(0, 0): 29760, (1, 0): 14880,
+                           (2, 0): 85258, (2, 1): 1550})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+'''
+Test cases for position.Position
+'''
+
+import board
+import pickle
+import position
+import topology
+import unittest
+
+
+class TestPosition(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+        self.position = position.Position.from_board(self.board)
+
+    def test_round_trip(self):
+        other = self.position.to_board()
+        self.assertEquals(other.state, self.board.state)
+        self.assertEquals(other.rows, 5)
+        self.assertEquals(other.get_valid_moves(),
+                          self.board.get_valid_moves())
+
+    def test_other_layouts_are_refused(self):
+        english = board.Board(layout=topology.english())
+        english.reset()
+        self.assertRaises(ValueError, position.Position.from_board, english)
+
+    def test_is_immutable(self):
+        self.assertRaises(AttributeError, setattr, self.position, 'state', 0)
+        self.assertRaises(AttributeError, setattr, self.position, 'other', 0)
+        self.assertRaises(AttributeError, delattr, self.position, 'rows')
+
+    def test_equal_positions_share_a_dict_entry(self):
+        other = position.Position(self.board.state)
+        self.assertEquals(self.position, other)
+        self.assertFalse(self.position != other)
+        self.assertEquals(len(set([self.position, other])), 1)
+        self.assertNotEqual(self.position,
+                            position.Position(self.board.state, 6))
+        self.assertNotEqual(self.position, self.board.state)
+
+    def test_apply_matches_board_move(self):
+        moved = self.position.apply((2, 0, 0, 0))
+        self.board.move(2, 0, 0, 0)
+        self.assertEquals(moved, position.Position.from_board(self.board))
+        self.assertEquals(self.position.peg_count(), 14)
+        self.assertEquals(moved.peg_count(), 13)
+
+    def test_apply_rejects_bad_moves(self):
+        self.assertRaises(ValueError, self.position.apply, (0, 0, 2, 0))
+        self.assertRaises(ValueError, self.position.apply, (0, 0, 1, 0))
+
+    def test_moves(self):
+        self.assertEquals(sorted(self.position.moves()),
+                          sorted(self.board.get_valid_moves()))
+
+    def test_canonical(self):
+        corner = position.Position(board.hole_bit(4, 4))
+        self.assertEquals(corner.canonical(),
+                          position.Position(board.hole_bit(0, 0)))
+
+    def test_pickles(self):
+        for protocol in xrange(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEquals(pickle.loads(pickle.dumps(self.position,
+                                                        protocol)),
+                              self.position)
+
+    def test_has_no_dict(self):
+        self.assertFalse(hasattr(self.position, '__dict__'))
+
+    def test_repr(self):
+        self.assertEquals(repr(position.Position(5, 3)), 'Position(0x5, 3)')
+
+if __name__ == '__main__':
+    unittest.main()
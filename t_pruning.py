@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+'''
+Test cases for the pruning module
+'''
+
+import board
+import pruning
+import stats
+import topology
+import transposition
+import unittest
+
+
+class TestInvariants(unittest.TestCase):
+    def test_colour_classes_partition_the_board(self):
+        classes = pruning.colour_classes(5)
+        self.assertEquals(classes[0] | classes[1] | classes[2], (1 << 15) - 1)
+        self.assertEquals(classes[0] & classes[1], 0)
+        self.assertEquals(classes[1] & classes[2], 0)
+
+    def test_finishes_follow_parity(self):
+        test = board.Board()
+        test.reset()
+        test.remove_peg(1, 0)
+        goals = pruning.finishes(test.state, 5)
+        self.assertEquals(goals, pruning.colour_classes(5)[1])
+        self.assertFalse(goals & board.hole_bit(2, 1))
+
+    def test_every_win_finishes_where_allowed(self):
+        test = board.Board()
+        test.pegs = [(2, 0), (3, 0), (3, 1), (4, 1), (4, 2)]
+        goals = pruning.finishes(test.state, 5)
+        solutions = 0
+        for _ in test.iter_solutions():
+            self.assertTrue(test.state & goals)
+            solutions += 1
+        self.assertTrue(solutions > 0)
+
+    def test_closed_sets_are_closed(self):
+        jumps = board.jump_table(6)
+        for mask in pruning.closed_sets(6):
+            for pegs, jump_mask, _ in jumps:
+                if (jump_mask & ~pegs) & mask:
+                    self.assertTrue(pegs & mask)
+
+    def test_resource_counts_are_closed_sets(self):
+        mask = sum(board.hole_bit(row, column)
+                   for row in xrange(0, 5, 2) for column in xrange(0, row + 1, 2))
+        self.assertIn(mask, pruning.closed_sets(5))
+
+    def test_pagodas_never_gain_weight(self):
+        for rows in xrange(4, 8):
+            jumps = pruning.jump_holes(rows)
+            for weights in pruning.pagodas(rows):
+                self.assertTrue(pruning.is_pagoda(weights, jumps))
+                self.assertTrue(len(set(weights) - set([0])) > 1)
+
+    def test_fibonacci_by_distance_is_a_pagoda(self):
+        cap = [pruning.FIBONACCI[6 - pruning.distance((row, column), (2, 1))]
+               for row in xrange(5) for column in xrange(row + 1)]
+        self.assertTrue(pruning.is_pagoda(cap, pruning.jump_holes(5)))
+
+    def test_heaviest_pagoda_stays_under_cap(self):
+        jumps = pruning.jump_holes(5)
+        cap = [1] * 15
+        cap[board.hole_index(2, 1)] = 3
+        self.assertFalse(pruning.is_pagoda(cap, jumps))
+        weights = pruning.heaviest_pagoda(cap, jumps)
+        self.assertTrue(pruning.is_pagoda(weights, jumps))
+        self.assertEquals(weights[board.hole_index(2, 1)], 2)
+        self.assertTrue(all(weight <= most
+                            for weight, most in zip(weights, cap)))
+        self.assertEquals(pruning.heaviest_pagoda(weights, jumps), weights)
+
+
+class TestPruner(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+        self.board.reset()
+        self.pruner = pruning.Pruner(5)
+
+    def test_impossible_target_is_pruned_at_once(self):
+        self.board.remove_peg(1, 0)
+        self.assertEquals(self.board.auto_play_move(target=(2, 1),
+                                                    prune=self.pruner), None)
+        self.assertEquals((self.pruner.checked, self.pruner.pruned), (1, 1))
+        self.assertEquals(self.board.peg_count(), 14)
+
+    def test_pruning_keeps_every_solution(self):
+        self.board.pegs = [(0, 0), (1, 0), (1, 1), (2, 1), (3, 2), (4, 2),
+                           (4, 3)]
+        plain = list(self.board.iter_solutions(target=(0, 0)))
+        pruned = list(self.board.iter_solutions(target=(0, 0),
+                                                prune=self.pruner))
+        self.assertEquals(len(plain), 8)
+        self.assertEquals(plain, pruned)
+        self.assertTrue(self.pruner.pruned > 0)
+
+    def test_pruned_search_proves_no_win(self):
+        self.board.remove_peg(0, 0)
+        self.assertEquals(self.board.auto_play_move(
+            table=transposition.TranspositionTable(), target=(2, 1),
+            prune=self.pruner), None)
+        self.assertTrue(self.pruner.pruned > 0)
+        self.assertIn('%d positions pruned' % self.pruner.pruned,
+                      str(self.pruner))
+
+    def test_compare_counts_nodes_saved(self):
+        (plain, none, _), (pruned, pruner, _) = pruning.compare(5, (1, 0),
+                                                                (2, 1))
+        self.assertIs(none, None)
+        self.assertEquals(pruner.pruned, 1)
+        self.assertTrue(pruned.nodes < plain.nodes)
+
+    def test_other_layouts_are_refused(self):
+        english = board.Board(layout=topology.english())
+        english.reset()
+        english.remove_peg(3, 3)
+        self.assertRaises(ValueError, english.auto_play_move,
+                          prune=pruning.Pruner(english.rows))
+        self.assertRaises(ValueError, self.board.auto_play_move,
+                          prune=pruning.Pruner(6))
+        self.assertEquals(self.pruner.checked, 0)
+
+    def test_weighted_pagodas_prune_more(self):
+        searches = []
+        for weighted in False, True:
+            test = board.Board(6)
+            test.reset()
+            test.remove_peg(2, 1)
+            pruner = pruning.Pruner(6, weighted)
+            search = stats.SolverStats()
+            self.assertTrue(test.auto_play_move(
+                table=transposition.TranspositionTable(), stats=search,
+                target=(2, 1), prune=pruner))
+            searches.append((search.nodes, pruner.weighed))
+        (closed, none), (weighted, weighed) = searches
+        self.assertEquals(none, 0)
+        self.assertTrue(weighed > 0)
+        self.assertTrue(weighted < closed)
+
+if __name__ == '__main__':
+    unittest.main()
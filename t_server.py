@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+'''
+Test cases for the server and loadtest modules
+'''
+
+import loadtest
+import os
+import server
+import shutil
+import socket
+import tablebase
+import tempfile
+import threading
+import time
+import unittest
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.session = server.Session()
+        self.welcome = self.session.start()
+
+    def test_welcome_asks_for_a_peg_to_remove(self):
+        self.assertIn('Welcome to Peg Jump.', self.welcome)
+        self.assertTrue(self.welcome.endswith(
+            'Please select a peg to remove(row, column): '))
+
+    def test_winning_game(self):
+        for line in loadtest.WINNING_GAME:
+            self.assertFalse(self.session.finished)
+            response = self.session.feed(line + '\n')
+        self.assertIn('You have won!', response)
+        self.assertTrue(self.session.finished)
+
+    def test_source_then_target(self):
+        self.session.feed('0, 0\n')
+        self.assertTrue(self.session.feed('2, 0\n').endswith(
+            'Please select a hole to move to (row, column): '))
+        response = self.session.feed('0, 0\n')
+        self.assertIn(' / x \\', response)
+        self.assertTrue(response.endswith(
+            'Please select a peg to move (row, column): '))
+
+    def test_bad_input_is_reported(self):
+        response = self.session.feed('nonsense\n')
+        self.assertIn('Sorry, I do not understand "nonsense".', response)
+        self.assertIn('Please try again...', response)
+        self.assertFalse(self.session.finished)
+
+    def test_wrong_hole_does_not_end_the_session(self):
+        self.session.feed('0, 0\n')
+        response = self.session.feed('0, 0\n')
+        self.assertIn('Sorry, there is no peg at "0, 0".', response)
+        self.assertTrue(response.endswith(
+            'Please select a peg to move (row, column): '))
+
+    def test_hint(self):
+        self.session.feed('0, 0\n')
+        self.assertIn('Try moving', self.session.feed('hint\n'))
+
+    def test_hint_from_a_tablebase(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'five.tb')
+        tablebase.build(5, path)
+        five = tablebase.Tablebase(path)
+        try:
+            session = server.Session(0.0, five)
+            session.start()
+            session.feed('0, 0\n')
+            self.assertIn('(this wins)', session.feed('hint\n'))
+        finally:
+            five.close()
+            shutil.rmtree(directory)
+
+    def test_quit(self):
+        self.assertIn('Goodbye.', self.session.feed('quit\n'))
+        self.assertTrue(self.session.finished)
+
+
+class TestGameServer(unittest.TestCase):
+    def start(self, **kwargs):
+        self.server = server.GameServer(port=0, **kwargs)
+        self.thread = threading.Thread(target=self.server.serve,
+                                       kwargs={'poll_seconds': 0.05})
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.thread.join()
+
+    def connect(self):
+        player = socket.create_connection(self.server.address)
+        player.settimeout(5)
+        return player
+
+    def read_until(self, player, text):
+        received = ''
+        while text not in received:
+            data = player.recv(4096)
+            if not data:
+                break
+            received += data
+        return received
+
+    def test_many_players_win_at_once(self):
+        self.start()
+        results = loadtest.run(self.server.address, players=50)
+        self.assertEquals(sum(result.won for result in results), 50)
+        self.assertEquals(self.server.served, 50)
+        self.assertIn('50 won', loadtest.report(results, 1.0))
+
+    def test_players_asking_for_hints_win_at_once(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'five.tb')
+        tablebase.build(5, path)
+        five = tablebase.Tablebase(path)
+        try:
+            self.start(tablebase=five)
+            results = loadtest.run(self.server.address, players=20,
+                                   lines=loadtest.HINTED_GAME)
+            self.assertEquals(sum(result.won for result in results), 20)
+            self.assertEquals(len(results[0].latencies),
+                              len(loadtest.HINTED_GAME) - 1)
+        finally:
+            five.close()
+            shutil.rmtree(directory)
+
+    def test_full_server_turns_players_away(self):
+        self.start(max_sessions=1)
+        first = self.connect()
+        self.read_until(first, 'remove')
+        second = self.connect()
+        self.assertIn('server is full', self.read_until(second, 'full'))
+        first.close()
+        second.close()
+        self.assertEquals(self.server.refused, 1)
+
+    def test_idle_sessions_time_out(self):
+        self.start(idle_seconds=0.2)
+        player = self.connect()
+        self.assertIn('Timed out.', self.read_until(player, 'Timed out.'))
+        player.close()
+        time.sleep(0.1)
+        self.assertEquals((self.server.expired, len(self.server.sessions)),
+                          (1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
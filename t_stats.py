@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+'''
+Test cases for stats.SolverStats
+'''
+
+import board
+import stats
+import unittest
+
+
+class TestSolverStats(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+        self.calls = []
+        self.stats = stats.SolverStats(progress=self.calls.append,
+                                       interval=10)
+
+    def test_fresh_stats_are_empty(self):
+        fresh = stats.SolverStats()
+        self.assertEquals((fresh.nodes, fresh.branching_factor(),
+                           fresh.elapsed()), (0, 0, 0.0))
+
+    def test_search_is_recorded(self):
+        self.board.auto_play_move(stats=self.stats)
+        self.assertTrue(self.stats.nodes > 0)
+        self.assertTrue(self.stats.moves >= self.stats.nodes)
+        self.assertEquals(self.stats.max_depth, 12)
+        self.assertTrue(self.stats.finished is not None)
+        self.assertEquals(sorted(self.stats.seconds), range(2, 15))
+
+    def test_every_move_is_undone_by_an_exhausted_search(self):
+        self.board.pegs = [(3, 0), (4, 1), (4, 2), (4, 4)]
+        for _ in self.board.iter_solutions(stats=self.stats):
+            pass
+        self.assertEquals(self.stats.undos, self.stats.moves)
+
+    def test_progress_is_reported(self):
+        self.board.auto_play_move(stats=self.stats)
+        self.assertEquals(len(self.calls), self.stats.nodes // 10)
+        self.assertIs(self.calls[0], self.stats)
+
+    def test_report_mentions_nodes(self):
+        self.board.auto_play_move(stats=self.stats)
+        self.assertIn('%d nodes' % self.stats.nodes, str(self.stats))
+
+if __name__ == '__main__':
+    unittest.main()
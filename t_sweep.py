@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+'''
+Test cases for the sweep module
+'''
+
+import json
+import sweep
+import unittest
+from StringIO import StringIO
+
+
+class TestSweep(unittest.TestCase):
+    def test_jobs_cover_distinct_openings(self):
+        self.assertListEqual(sweep.jobs(4, 5),
+                             [(4, (0, 0), None), (4, (1, 0), None),
+                              (4, (2, 1), None), (5, (0, 0), None),
+                              (5, (1, 0), None), (5, (2, 0), None),
+                              (5, (2, 1), None)])
+
+    def test_jobs_with_finishes(self):
+        self.assertEquals(len(sweep.jobs(5, 5, finishes=True)), 4 * 15)
+
+    def test_solve_job(self):
+        result = sweep.solve_job((5, (0, 0), None, None))
+        self.assertTrue(result['solvable'])
+        self.assertEquals(len(result['solution']), 14)
+        self.assertTrue(result['nodes'] > 0)
+        self.assertFalse(result['timed_out'])
+
+    def test_solve_job_for_finish_hole(self):
+        result = sweep.solve_job((5, (0, 0), (2, 1), None))
+        self.assertFalse(result['solvable'])
+        self.assertEquals(result['solution'], None)
+
+    def test_solve_job_times_out(self):
+        result = sweep.solve_job((7, (0, 0), None, 0.01))
+        self.assertTrue(result['timed_out'])
+        self.assertEquals(result['solvable'], None)
+
+    def test_sweep_writes_json_lines(self):
+        output = StringIO()
+        sweep.sweep(sweep.jobs(4, 4), processes=2, output=output)
+        lines = output.getvalue().splitlines()
+        self.assertEquals(len(lines), 3)
+        self.assertEquals(sweep.finished_jobs(lines),
+                          set(sweep.jobs(4, 4)))
+
+    def test_finished_jobs_skip_bad_lines(self):
+        line = json.dumps({'rows': 5, 'start': [0, 0], 'finish': [4, 2]})
+        self.assertEquals(sweep.finished_jobs([line, '{"truncated']),
+                          set([(5, (0, 0), (4, 2))]))
+
+    def test_timed_out_jobs_are_not_finished(self):
+        line = json.dumps({'rows': 7, 'start': [0, 0], 'finish': None,
+                           'timed_out': True})
+        self.assertEquals(sweep.finished_jobs([line]), set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+'''
+Test cases for the symmetry module
+'''
+
+import board
+import symmetry
+import transposition
+import unittest
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_six_symmetries(self):
+        self.assertEquals(len(set(symmetry.symmetries(5))), 6)
+
+    def test_identity_comes_first(self):
+        self.assertEquals(symmetry.symmetries(4)[0], tuple(xrange(10)))
+
+    def test_corners_map_to_corners(self):
+        corners = set([0, 10, 14])
+        for mapping in symmetry.symmetries(5):
+            self.assertEquals(set(mapping[i] for i in corners), corners)
+
+    def test_images_agree_with_transform(self):
+        state = 0b101100111010001
+        self.assertListEqual(
+            symmetry.images(state, 5),
+            [symmetry.transform(state, mapping)
+             for mapping in symmetry.symmetries(5)])
+
+    def test_canonical_is_shared_by_all_images(self):
+        state = 0b110000000101101010111001101
+        expected = symmetry.canonical(state, 7)
+        for image in symmetry.images(state, 7):
+            self.assertEquals(symmetry.canonical(image, 7), expected)
+
+    def test_corners_are_the_same_opening(self):
+        top = board.Board()
+        top.reset()
+        top.remove_peg(0, 0)
+        bottom = board.Board()
+        bottom.reset()
+        bottom.remove_peg(4, 4)
+        self.assertEquals(top.canonical_state(), bottom.canonical_state())
+
+    def test_distinct_holes(self):
+        self.assertListEqual(symmetry.distinct_holes(5),
+                             [(0, 0), (1, 0), (2, 0), (2, 1)])
+        self.assertEquals(len(symmetry.distinct_holes(6)), 5)
+
+    def test_can_win_from_every_distinct_hole(self):
+        test = board.Board()
+        table = transposition.TranspositionTable()
+        for row, column in symmetry.distinct_holes(5):
+            test.reset()
+            test.remove_peg(row, column)
+            self.assertEquals(len(test.auto_play_move(table=table)), 14)
+            self.assertTrue(test.won())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+'''
+Test cases for tablebase.Tablebase
+'''
+
+import board
+import os
+import shutil
+import tablebase
+import tempfile
+import topology
+import unittest
+
+
+class TestTablebase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'five.tb')
+        tablebase.build(5, self.path)
+        self.tablebase = tablebase.Tablebase(self.path)
+        self.board = board.Board()
+        self.board.reset()
+
+    def tearDown(self):
+        self.tablebase.close()
+        shutil.rmtree(self.directory)
+
+    def test_file_holds_only_reachable_states(self):
+        states = sum(len(layer) for layer
+                     in tablebase.reachable_layers(5).values())
+        self.assertEquals(len(self.tablebase), states)
+        self.assertEquals(os.path.getsize(self.path),
+                          tablebase.HEADER_SIZE + 16 * tablebase.COUNT.size +
+                          states * (tablebase.state_width(5) + 1))
+
+    def test_values_match_classify(self):
+        for state, value in tablebase.classify(5).iteritems():
+            self.assertEquals(self.tablebase.value(state), value)
+        self.board.remove_peg(0, 0)
+        self.board.move(2, 0, 0, 0)
+        mirrored = board.Board()
+        mirrored.reset()
+        mirrored.remove_peg(0, 0)
+        mirrored.move(2, 2, 0, 0)
+        self.assertEquals(self.tablebase.value(self.board.state),
+                          self.tablebase.value(mirrored.state))
+
+    def test_covers(self):
+        self.assertFalse(self.tablebase.covers(self.board))
+        self.board.remove_peg(0, 0)
+        self.assertTrue(self.tablebase.covers(self.board))
+        self.assertFalse(self.tablebase.covers(board.Board(6)))
+
+    def test_layer_files_are_kept_in_a_given_directory(self):
+        layers = os.path.join(self.directory, 'layers')
+        os.mkdir(layers)
+        path = os.path.join(self.directory, 'again.tb')
+        tablebase.build(5, path, layers)
+        self.assertTrue(os.listdir(layers))
+        with open(path, 'rb') as again, open(self.path, 'rb') as first:
+            self.assertEquals(again.read(), first.read())
+
+    def test_every_opening_is_winnable(self):
+        for row in xrange(5):
+            for column in xrange(row + 1):
+                self.board.reset()
+                self.board.remove_peg(row, column)
+                self.assertTrue(self.tablebase.is_winnable(self.board))
+
+    def test_best_moves_win_the_game(self):
+        self.board.remove_peg(2, 1)
+        move = self.tablebase.best_move(self.board)
+        while move:
+            self.board.move(*move)
+            move = self.tablebase.best_move(self.board)
+        self.assertTrue(self.board.won())
+
+    def test_losing_position_is_not_winnable(self):
+        self.board.remove_peg(0, 0)
+        self.board.move(2, 0, 0, 0)
+        self.board.move(4, 0, 2, 0)
+        self.board.move(4, 2, 4, 0)
+        self.assertFalse(self.tablebase.is_winnable(self.board))
+        self.assertTrue(self.tablebase.fewest_pegs(self.board) > 1)
+
+    def test_board_hint_looks_up_the_best_move(self):
+        self.board.remove_peg(2, 1)
+        move, proven = self.board.hint(tablebase=self.tablebase)
+        while move:
+            self.assertTrue(proven)
+            self.board.move(*move)
+            move, proven = self.board.hint(tablebase=self.tablebase)
+        self.assertTrue(self.board.won())
+        self.assertFalse(proven)
+
+    def test_board_hint_looks_up_the_opening(self):
+        hole, proven = self.board.hint(seconds=0, tablebase=self.tablebase)
+        self.assertEquals(hole, (0, 0))
+        self.assertTrue(proven)
+
+    def test_board_hint_searches_positions_not_covered(self):
+        large = board.Board(6)
+        large.reset()
+        large.remove_peg(0, 0)
+        move, proven = large.hint(tablebase=self.tablebase)
+        self.assertTrue(large.is_valid_move(*move))
+        self.assertTrue(proven)
+
+    def test_unreachable_position_is_rejected(self):
+        self.assertRaises(Exception, self.tablebase.fewest_pegs, self.board)
+
+    def test_other_layouts_are_refused(self):
+        english = board.Board(layout=topology.english())
+        english.reset()
+        english.remove_peg(3, 3)
+        self.assertRaises(ValueError, self.tablebase.fewest_pegs, english)
+
+    def test_file_can_be_mapped_twice(self):
+        other = tablebase.Tablebase(self.path)
+        self.board.remove_peg(0, 0)
+        self.assertEquals(other.fewest_pegs(self.board), 1)
+        other.close()
+
+    def test_other_files_are_rejected(self):
+        path = os.path.join(self.directory, 'other')
+        with open(path, 'wb') as other:
+            other.write('not a tablebase')
+        self.assertRaises(Exception, tablebase.Tablebase, path)
+
+    def test_truncated_files_are_rejected(self):
+        path = os.path.join(self.directory, 'truncated.tb')
+        with open(self.path, 'rb') as source, open(path, 'wb') as truncated:
+            truncated.write(source.read()[:-1])
+        self.assertRaises(Exception, tablebase.Tablebase, path)
+
+if __name__ == '__main__':
+    unittest.main()
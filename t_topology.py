@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+'''
+Test cases for topology.Topology and Boards on other layouts
+'''
+
+import board
+import symmetry
+import topology
+import transposition
+import unittest
+
+
+class TestTopology(unittest.TestCase):
+    def test_sizes(self):
+        self.assertEquals(topology.triangle(5).size, 15)
+        self.assertEquals(len(topology.triangle(5).jumps), 36)
+        self.assertEquals(topology.english().size, 33)
+        self.assertEquals(len(topology.english().jumps), 76)
+        self.assertEquals(topology.european().size, 37)
+        self.assertEquals(len(topology.european().jumps), 92)
+
+    def test_layouts_are_shared(self):
+        self.assertIs(topology.triangle(6), topology.triangle(6))
+        self.assertIs(topology.english(), topology.english())
+
+    def test_triangle_matches_hole_numbering(self):
+        layout = topology.triangle(6)
+        for index, hole in enumerate(layout.holes):
+            self.assertEquals(board.hole_index(*hole), index)
+            self.assertEquals(layout.bit(*hole), board.hole_bit(*hole))
+
+    def test_jumps_move_over_a_neighbour(self):
+        for layout in topology.triangle(5), topology.english():
+            for pegs, mask, move in layout.jumps:
+                source, target = move[:2], move[2:]
+                middle = board.middle_peg(*move)
+                self.assertEquals(
+                    pegs, layout.bit(*source) | layout.bit(*middle))
+                self.assertEquals(mask, pegs | layout.bit(*target))
+
+    def test_symmetries_keep_jumps(self):
+        for layout in topology.triangle(5), topology.english():
+            masks = set(mask for _, mask, _ in layout.jumps)
+            for image in layout.images(0):
+                self.assertEquals(image, 0)
+            for mask in masks:
+                for image in layout.images(mask):
+                    self.assertTrue(image in masks)
+
+    def test_canonical_is_the_same_for_every_image(self):
+        layout = topology.english()
+        state = layout.bit(0, 2) | layout.bit(2, 5) | layout.bit(3, 3)
+        images = layout.images(state)
+        self.assertEquals(len(set(images)), 8)
+        for image in images:
+            self.assertEquals(layout.canonical(image), min(images))
+
+    def test_distinct_holes(self):
+        for rows in xrange(3, 8):
+            self.assertEquals(topology.triangle(rows).distinct_holes(),
+                              symmetry.distinct_holes(rows))
+        self.assertEquals(topology.english().distinct_holes(),
+                          [(0, 2), (0, 3), (1, 2), (1, 3), (2, 2), (2, 3),
+                           (3, 3)])
+
+    def test_fixes(self):
+        self.assertTrue(topology.triangle(4).fixes(2, 1))
+        self.assertFalse(topology.triangle(5).fixes(2, 1))
+        self.assertTrue(topology.english().fixes(3, 3))
+        self.assertFalse(topology.english().fixes(2, 3))
+
+    def test_zobrist_tables_are_per_seed(self):
+        layout = topology.english()
+        self.assertIs(layout.zobrist_tables(), layout.zobrist_tables())
+        self.assertNotEqual(layout.zobrist_tables(1)[0],
+                            layout.zobrist_tables(2)[0])
+
+
+class TestEnglishBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board(layout=topology.english())
+        self.board.reset()
+        self.board.remove_peg(3, 3)
+
+    def test_opening(self):
+        self.assertEquals(self.board.size(), 33)
+        self.assertEquals(self.board.peg_count(), 32)
+        self.assertEquals(self.board.get_valid_moves(),
+                          [(1, 3, 3, 3), (3, 1, 3, 3),
+                           (3, 5, 3, 3), (5, 3, 3, 3)])
+        self.assertFalse(self.board.is_within_bounds(0, 0))
+        self.assertRaises(ValueError, self.board.pegs.append, (0, 0))
+
+    def test_move_and_undo(self):
+        zobrist = self.board.zobrist
+        self.board.move(1, 3, 3, 3)
+        self.assertTrue(self.board.has_peg(3, 3))
+        self.assertTrue(self.board.is_vacant(1, 3))
+        self.assertTrue(self.board.is_vacant(2, 3))
+        self.board.undo()
+        self.assertEquals(self.board.zobrist, zobrist)
+        self.assertTrue(self.board.is_vacant(3, 3))
+
+    def test_triangle_rows(self):
+        self.assertRaises(ValueError, board.triangle_rows, self.board)
+        self.assertEquals(board.triangle_rows(board.Board(6)), 6)
+
+    def test_copy_keeps_layout(self):
+        other = self.board.copy()
+        self.assertIs(other.layout, self.board.layout)
+        self.assertEquals(other.state, self.board.state)
+
+    def test_str(self):
+        text = str(self.board)
+        self.assertEquals(text.count(' x '), 32)
+        self.assertEquals(text.count(' . '), 1)
+
+    def test_symmetric_zobrist(self):
+        self.board.move(1, 3, 3, 3)
+        other = board.Board(layout=topology.english())
+        other.reset()
+        other.remove_peg(3, 3)
+        other.move(5, 3, 3, 3)
+        self.assertNotEqual(other.zobrist, self.board.zobrist)
+        self.assertEquals(other.symmetric_zobrist,
+                          self.board.symmetric_zobrist)
+
+    def test_solve_to_centre(self):
+        table = transposition.TranspositionTable()
+        move_list = self.board.auto_play_move(table=table, target=(3, 3))
+        self.assertEquals(len(move_list), 32)
+        self.assertEquals(self.board.pegs, [(3, 3)])
+        canonical = self.board.layout.canonical
+        self.assertTrue(table.entries)
+        self.assertTrue(all(canonical(state) == state
+                            for state in table.entries))
+
+
+if __name__ == '__main__':
+    unittest.main()
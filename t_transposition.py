@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+'''
+Test cases for transposition.TranspositionTable
+'''
+
+import board
+import transposition
+import unittest
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = transposition.TranspositionTable(max_entries=2)
+
+    def test_lookups_are_counted(self):
+        self.table.add(1)
+        self.assertTrue(1 in self.table)
+        self.assertFalse(2 in self.table)
+        self.assertEquals((self.table.hits, self.table.misses), (1, 1))
+
+    def test_least_recently_used_state_is_evicted(self):
+        self.table.add(1)
+        self.table.add(2)
+        self.assertTrue(1 in self.table)
+        self.table.add(3)
+        self.assertEquals(len(self.table), 2)
+        self.assertEquals(self.table.evictions, 1)
+        self.assertFalse(2 in self.table)
+        self.assertTrue(1 in self.table)
+
+    def test_clear_resets_counters(self):
+        self.table.add(1)
+        self.assertTrue(1 in self.table)
+        self.table.clear()
+        self.assertEquals((len(self.table), self.table.hits), (0, 0))
+
+
+class TestSolvingWithTable(unittest.TestCase):
+    def setUp(self):
+        self.board = board.Board()
+        self.board.reset()
+        self.board.remove_peg(0, 0)
+        self.table = transposition.TranspositionTable()
+
+    def test_can_win_full_game(self):
+        self.assertEquals(len(self.board.auto_play_move(table=self.table)),
+                          14)
+        self.assertTrue(self.board.won())
+        self.assertTrue(self.table.hits > 0)
+
+    def test_tiny_table_still_wins(self):
+        self.table.max_entries = 1
+        self.assertEquals(len(self.board.auto_play_move(table=self.table)),
+                          14)
+
+    def test_unwinnable_start_is_recorded(self):
+        self.board.pegs = [(0, 0), (4, 4)]
+        self.assertEquals(self.board.auto_play_move(table=self.table), None)
+        self.assertTrue(self.board.canonical_state() in self.table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+'''
+Contains the Tablebase class and the builder for its files.
+
+A tablebase file holds, for every canonical state (see symmetry.canonical)
+that can be reached from an opening of a board of a given size, the fewest
+pegs that can be left by playing on from that state. Unreachable states
+take no room, so the file grows with the number of reachable positions
+rather than with every arrangement of the holes.
+
+The header is followed by the number of states with each peg count, from
+none to a full board, as 64-bit integers. Then come the layers, fewest pegs
+first: each is its states in ascending order, as 32-bit integers (64-bit
+for boards of more than 32 holes), followed by a byte per state giving its
+value. A lookup finds a state by binary search in its layer.
+
+build() is the way to make a tablebase. reachable_layers() and classify()
+work out the same states and values in memory, with no limit on how much
+they use; they are kept only as simple reference versions to check
+build() and layers.enumerate_layers() against on small boards.
+'''
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+
+import board
+import layers
+import symmetry
+import topology
+
+MAGIC = 'PEGTB'
+VERSION = 2
+HEADER = struct.Struct('<5sBBB')
+HEADER_SIZE = HEADER.size
+COUNT = struct.Struct('<Q')
+
+
+def reachable_layers(number_of_rows):
+    '''
+    Returns a dictionary mapping each peg count to the set of canonical
+    states with that many pegs that can be reached from an opening.
+
+    This is a reference version for testing only: it holds every state in
+    memory at once. layers.enumerate_layers finds the same layers within
+    a memory limit.
+    '''
+    jumps = board.jump_table(number_of_rows)
+    size = number_of_rows * (number_of_rows + 1) // 2
+    full = (1 << size) - 1
+    layer = set(symmetry.canonical(full & ~(1 << index), number_of_rows)
+                for index in xrange(size))
+    result = {size - 1: layer}
+    for peg_count in xrange(size - 2, 0, -1):
+        layer = set(symmetry.canonical(state ^ mask, number_of_rows)
+                    for state in layer
+                    for pegs, mask, _ in jumps if state & mask == pegs)
+        if not layer:
+            break
+        result[peg_count] = layer
+    return result
+
+
+def classify(number_of_rows):
+    '''
+    Works back from the positions with fewest pegs to the openings, giving
+    each reachable canonical state the fewest pegs that can be left from it.
+    Returns a dictionary of canonical state to value.
+
+    This is a reference version for testing only: it holds every state and
+    value in memory at once. build() works them out two layers at a time.
+    '''
+    jumps = board.jump_table(number_of_rows)
+    values = {}
+    for peg_count, layer in sorted(reachable_layers(number_of_rows).items()):
+        for state in layer:
+            best = peg_count
+            for pegs, mask, _ in jumps:
+                if state & mask == pegs:
+                    best = min(best, values[symmetry.canonical(
+                        state ^ mask, number_of_rows)])
+            values[state] = best
+    return values
+
+
+def state_width(number_of_rows):
+    '''
+    Returns the number of bytes each state takes in the tablebase of a
+    board of 'number_of_rows' rows.
+    '''
+    return 4 if number_of_rows * (number_of_rows + 1) // 2 <= 32 else 8
+
+
+def _states(width):
+    for code in 'IL':
+        if array(code).itemsize == width:
+            return array(code)
+    raise Exception('No array type holds %d-byte states' % width)
+
+
+def build(number_of_rows, path, directory=None, max_states=layers.MAX_STATES):
+    '''
+    Classifies every reachable state of a board of 'number_of_rows' rows
+    and writes the tablebase to 'path'. The file is written under a
+    temporary name and renamed into place, so readers never see half a file.
+
+    The reachable states are first written out layer by layer with
+    layers.enumerate_layers, holding at most 'max_states' new states in
+    memory, into 'directory' (a temporary directory, removed afterwards, if
+    none is given). They are then classified from the fewest pegs up, so
+    only two layers are ever held at once.
+    '''
+    layout = topology.triangle(number_of_rows)
+    width = state_width(number_of_rows)
+    scratch = directory or tempfile.mkdtemp()
+    try:
+        counts = [0] * (layout.size + 1)
+        for report in layers.enumerate_layers(number_of_rows, scratch,
+                                              max_states):
+            counts[report.peg_count] = report.states
+        successors = layers.Successors(layout)
+        canonical = layout.canonical
+        previous_states, previous_values = _states(width), bytearray()
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, VERSION, number_of_rows, width))
+            for count in counts:
+                output.write(COUNT.pack(count))
+            for peg_count, count in enumerate(counts):
+                if not count:
+                    continue
+                states, values = _states(width), bytearray()
+                for state in layers.read_states(
+                        layers.layer_path(scratch, peg_count)):
+                    best = peg_count
+                    for successor in successors(state):
+                        position = bisect_left(previous_states,
+                                               canonical(successor))
+                        best = min(best, previous_values[position])
+                    states.append(state)
+                    values.append(best)
+                if sys.byteorder != 'little':
+                    states.byteswap()
+                output.write(states.tostring())
+                if sys.byteorder != 'little':
+                    states.byteswap()
+                output.write(values)
+                previous_states, previous_values = states, values
+        os.rename(temporary, path)
+    finally:
+        if directory is None:
+            shutil.rmtree(scratch)
+
+
+class _Layer(object):
+    '''
+    The sorted states of one layer of a mapped tablebase, as a sequence
+    that bisect can search without reading the rest.
+    '''
+
+    def __init__(self, data, offset, count, width):
+        self.data = data
+        self.offset = offset
+        self.count = count
+        self.width = width
+        self.unpack_from = struct.Struct('<I' if width == 4 else '<Q'
+                                         ).unpack_from
+        self.values = offset + count * width
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        return self.unpack_from(self.data,
+                                self.offset + position * self.width)[0]
+
+    def value(self, state):
+        '''
+        Returns the value of 'state', or 0 if it is not in the layer.
+        '''
+        position = bisect_left(self, state)
+        if position < self.count and self[position] == state:
+            return ord(self.data[self.values + position])
+        return 0
+
+
+class Tablebase(object):
+    '''
+    A read-only, memory-mapped view of a tablebase file. A lookup reads a
+    few dozen bytes of the layer it searches, and the file is never loaded
+    into the heap; any number of processes can map the same file and share
+    its pages.
+    '''
+
+    def __init__(self, path):
+        with open(path, 'rb') as source:
+            self.data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER_SIZE:
+            self.close()
+            raise Exception('%s is not a tablebase' % path)
+        magic, version, self.rows, width = HEADER.unpack(
+            self.data[:HEADER_SIZE])
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise Exception('%s is not a tablebase' % path)
+        size = self.rows * (self.rows + 1) // 2
+        offset = HEADER_SIZE + (size + 1) * COUNT.size
+        self.layers = []
+        for peg_count in xrange(size + 1):
+            count, = COUNT.unpack_from(self.data,
+                                       HEADER_SIZE + peg_count * COUNT.size)
+            self.layers.append(_Layer(self.data, offset, count, width))
+            offset += count * (width + 1)
+        if offset != len(self.data):
+            self.close()
+            raise Exception('%s is truncated' % path)
+
+    def close(self):
+        '''
+        Unmaps the file.
+        '''
+        self.data.close()
+
+    def __len__(self):
+        return sum(len(layer) for layer in self.layers)
+
+    def value(self, state):
+        '''
+        Returns the fewest pegs that can be left from 'state', or 0 if the
+        state cannot be reached from an opening.
+        '''
+        return self.layers[bin(state).count('1')].value(
+            symmetry.canonical(state, self.rows))
+
+    def covers(self, game_board):
+        '''
+        Returns True if the position on a Board is in the tablebase.
+        '''
+        layout = topology.triangle(self.rows)
+        return (game_board.layout.name == layout.name and
+                self.value(game_board.state) > 0)
+
+    def fewest_pegs(self, game_board):
+        '''
+        Returns the fewest pegs that can be left from the position on a
+        Board. Raises an Exception for a position no opening reaches, and
+        ValueError for a board that is not triangular.
+        '''
+        if board.triangle_rows(game_board) != self.rows:
+            raise Exception('The tablebase is for %d rows' % self.rows)
+        value = self.value(game_board.state)
+        if not value:
+            raise Exception('The position is not in the tablebase')
+        return value
+
+    def is_winnable(self, game_board):
+        '''
+        Returns True if and only if the game on a Board can still be won.
+        '''
+        return self.fewest_pegs(game_board) == 1
+
+    def best_move(self, game_board):
+        '''
+        Returns a move that keeps the fewest pegs that can be left within
+        reach, or None if there are no moves.
+        '''
+        best = self.fewest_pegs(game_board)
+        state = game_board.state
+        for pegs, mask, move in game_board.jumps:
+            if state & mask == pegs and self.value(state ^ mask) == best:
+                return move
+
+
+def main(number_of_rows=5, path=None, directory=None):
+    '''
+    Builds the tablebase for a board of 'number_of_rows' rows, keeping the
+    layer files in 'directory' if one is given.
+    '''
+    number_of_rows = int(number_of_rows)
+    build(number_of_rows, path or 'peg_jump_%d.tb' % number_of_rows,
+          directory)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+'''
+Board layouts.
+
+A Topology lists the holes of a layout, as (row, column) positions, and
+works out once every jump that can be made between them. Board takes its
+move generation, hashing, symmetries and drawing from the tables here, so
+every layout shares the same code.
+
+triangle(number_of_rows), english() and european() return shared instances
+of the built-in layouts.
+'''
+
+import random
+
+import symmetry
+
+TRIANGLE_JUMPS = ((-2, -2), (-2, 0), (0, -2), (0, +2), (+2, 0), (+2, +2))
+SQUARE_JUMPS = ((-2, 0), (0, -2), (0, +2), (+2, 0))
+ZOBRIST_SEED = 0x9e3779b97f4a7c15
+
+_LAYOUTS = {}
+
+
+class Topology(object):
+    '''
+    A layout of holes. Holes are numbered in the order of 'holes', a tuple
+    of (row, column) positions, and 'index' maps each position back to its
+    number. A jump moves a peg by one of 'directions' (each a (row,
+    column) step of two holes) over a peg in the hole half way. Layouts are
+    meant to be shared: build each one once.
+
+    'jumps' is the jump table: a (pegs, mask, move) triple for each jump,
+    as described in board.jump_table. 'jump_indices' maps each move to its
+    position in the table and 'neighbours' gives, for each jump, the
+    positions of every jump that shares a hole with it.
+
+    'symmetries' gives, for each rotation and reflection of the layout
+    (identity first), the number of the hole each hole is mapped to.
+    'template' is the ASCII art of the layout with a %s for each hole.
+    '''
+
+    def __init__(self, name, holes, directions, symmetries, template):
+        self.name = name
+        self.holes = tuple(holes)
+        self.index = dict((hole, number)
+                          for number, hole in enumerate(self.holes))
+        self.size = len(self.holes)
+        self.rows = max(row for row, _ in self.holes) + 1
+        self.directions = directions
+        self.symmetries = tuple(symmetries)
+        self.template = template
+        self.jumps = tuple(self._jumps())
+        self.jump_indices = dict((move, number) for number, (_, _, move)
+                                 in enumerate(self.jumps))
+        self.neighbours = tuple(
+            tuple(other for other, (_, other_mask, _) in enumerate(self.jumps)
+                  if mask & other_mask)
+            for _, mask, _ in self.jumps)
+        self._byte_tables = symmetry.byte_tables(self.symmetries)
+        self._zobrist = {}
+        self._distinct_holes = None
+
+    def _jumps(self):
+        index = self.index
+        for row, column in self.holes:
+            for r, c in self.directions:
+                target = row + r, column + c
+                middle = row + r // 2, column + c // 2
+                if target in index and middle in index:
+                    pegs = 1 << index[(row, column)] | 1 << index[middle]
+                    yield (pegs, pegs | 1 << index[target],
+                           (row, column) + target)
+
+    def bit(self, row, column):
+        '''
+        Returns the mask with only the hole at (row, column) set.
+        '''
+        return 1 << self.index[(row, column)]
+
+    def images(self, state):
+        '''
+        Returns the images of 'state' under each of the symmetries.
+        '''
+        return symmetry.lookup_images(state, self._byte_tables)
+
+    def distinct_holes(self):
+        '''
+        Returns one hole from each set of holes that the symmetries map onto
+        each other, as (row, column) tuples in hole order, as
+        symmetry.distinct_holes does for the triangle.
+        '''
+        if self._distinct_holes is None:
+            seen = set()
+            result = []
+            for number, hole in enumerate(self.holes):
+                if number not in seen:
+                    result.append(hole)
+                    seen.update(mapping[number]
+                                for mapping in self.symmetries)
+            self._distinct_holes = tuple(result)
+        return list(self._distinct_holes)
+
+    def fixes(self, row, column):
+        '''
+        Returns True if every rotation and reflection leaves the hole at
+        (row, column) where it is, as for the centre of the English board.
+        '''
+        number = self.index[(row, column)]
+        return all(mapping[number] == number for mapping in self.symmetries)
+
+    def canonical(self, state):
+        '''
+        Returns the smallest image of 'state': the same for every rotation
+        and reflection of a position.
+        '''
+        return min(symmetry.lookup_images(state, self._byte_tables))
+
+    def zobrist_tables(self, seed=ZOBRIST_SEED):
+        '''
+        Returns two tables of 64-bit Zobrist keys. The first gives, for each
+        symmetry, the key of each hole: the random key of the hole it is
+        mapped to. The second gives, for each jump, the exclusive-or of the
+        keys of its three holes under each symmetry.
+
+        The keys come from a random.Random seeded with 'seed', so every
+        process builds the same tables and hashes can be shared and stored.
+        '''
+        try:
+            return self._zobrist[seed]
+        except KeyError:
+            pass
+        chooser = random.Random(seed)
+        keys = [chooser.getrandbits(64) for _ in xrange(self.size)]
+        hole_keys = tuple(tuple(keys[image] for image in mapping)
+                          for mapping in self.symmetries)
+        jump_keys = []
+        for _, mask, _ in self.jumps:
+            holes = [number for number in xrange(self.size)
+                     if mask >> number & 1]
+            jump_keys.append(tuple(
+                image_keys[holes[0]] ^ image_keys[holes[1]] ^
+                image_keys[holes[2]] for image_keys in hole_keys))
+        self._zobrist[seed] = hole_keys, tuple(jump_keys)
+        return self._zobrist[seed]
+
+    def __repr__(self):
+        return '<Topology %s: %d holes, %d jumps>' % (
+            self.name, self.size, len(self.jumps))
+
+
+def triangle(number_of_rows=5):
+    '''
+    Returns the triangular layout of 'number_of_rows' rows. Hole (row,
+    column) has number row * (row + 1) / 2 + column.
+    '''
+    key = 'triangle', number_of_rows
+    try:
+        return _LAYOUTS[key]
+    except KeyError:
+        pass
+    holes = [(row, column)
+             for row in xrange(number_of_rows) for column in xrange(row + 1)]
+    lines = ['', (number_of_rows + 1) * ' ' + '/\\']
+    for row in xrange(number_of_rows):
+        lines.append((number_of_rows - row) * ' ' + '/' +
+                     (row + 1) * '%s' + '\\')
+    lines.append('+' + (number_of_rows * 3 + 2) * '-' + '+\n')
+    _LAYOUTS[key] = Topology('triangle %d' % number_of_rows, holes,
+                             TRIANGLE_JUMPS,
+                             symmetry.symmetries(number_of_rows),
+                             '\n'.join(lines))
+    return _LAYOUTS[key]
+
+
+def _square_symmetries(holes, extent):
+    index = dict((hole, number) for number, hole in enumerate(holes))
+    last = extent - 1
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    return [tuple(index[transform(row, column)] for row, column in holes)
+            for transform in transforms]
+
+
+def _cross(name, keep):
+    '''
+    Builds a layout on a 7 by 7 grid, keeping the holes for which
+    keep(rows from the nearest edge, columns from the nearest edge) is true.
+    '''
+    try:
+        return _LAYOUTS[name]
+    except KeyError:
+        pass
+    holes = [(row, column) for row in xrange(7) for column in xrange(7)
+             if keep(min(row, 6 - row), min(column, 6 - column))]
+    lines = ['']
+    for row in xrange(7):
+        lines.append(''.join('%s' if (row, column) in holes else '   '
+                             for column in xrange(7)).rstrip())
+    _LAYOUTS[name] = Topology(name, holes, SQUARE_JUMPS,
+                              _square_symmetries(holes, 7),
+                              '\n'.join(lines) + '\n')
+    return _LAYOUTS[name]
+
+
+def english():
+    '''
+    Returns the 33-hole English cross.
+    '''
+    return _cross('english', lambda rows, columns: max(rows, columns) >= 2)
+
+
+def european():
+    '''
+    Returns the 37-hole European board.
+    '''
+    return _cross('european', lambda rows, columns: rows + columns >= 2)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+'''
+Contains the TranspositionTable class
+'''
+
+from collections import OrderedDict
+
+
+class TranspositionTable(object):
+    '''
+    Remembers board states from which the game cannot be won, so that a
+    search reaching the same position by another order of moves can skip it.
+
+    At most 'max_entries' states are held. When the table is full the least
+    recently used state is evicted. 'hits' and 'misses' count lookups, which
+    helps when sizing the table for a board.
+    '''
+
+    def __init__(self, max_entries=1000000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, state):
+        '''
+        Looks up a state, counting a hit or a miss. A hit makes the state the
+        most recently used.
+        '''
+        if state in self.entries:
+            self.hits += 1
+            del self.entries[state]
+            self.entries[state] = True
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, state):
+        '''
+        Records that 'state' cannot be won, evicting the least recently used
+        state if the table is full.
+        '''
+        if state in self.entries:
+            del self.entries[state]
+        elif len(self.entries) >= self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[state] = True
+
+    def clear(self):
+        '''
+        Forgets every state and resets the counters.
+        '''
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __str__(self):
+        return '%d states, %d hits, %d misses, %d evictions' % (
+            len(self), self.hits, self.misses, self.evictions)